@@ -1,10 +1,58 @@
 from __future__ import annotations
 
-import typer
+from typing import TYPE_CHECKING, Any
 
 from imgsh.core.errors import ImgshError
 
+if TYPE_CHECKING:
+    from imgsh.core.processor import ProcessResult
+
+OCR_CACHE_OPTIONS = ("OcrCacheOption", "OcrCacheDirOption", "OcrCacheSizeOption")
+
+
+def __getattr__(name: str) -> Any:
+    # Option types need Typer, which importing imgsh.cli.main must not load.
+    if name not in OCR_CACHE_OPTIONS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from pathlib import Path
+    from typing import Annotated
+
+    import typer
+
+    options = {
+        "OcrCacheOption": Annotated[
+            bool | None,
+            typer.Option(
+                "--ocr-cache/--no-ocr-cache",
+                help="Reuse OCR text for previously seen image content (off by default).",
+            ),
+        ],
+        "OcrCacheDirOption": Annotated[
+            Path | None,
+            typer.Option(
+                "--ocr-cache-dir",
+                help="OCR cache directory (default: ~/.cache/imgsh/ocr). Implies --ocr-cache.",
+            ),
+        ],
+        "OcrCacheSizeOption": Annotated[
+            int,
+            typer.Option("--ocr-cache-size", help="OCR cache size limit in MB (LRU eviction)."),
+        ],
+    }
+    globals().update(options)
+    return options[name]
+
 
 def exit_with_error(error: ImgshError) -> None:
+    import typer
+
     typer.secho(f"Error: {error}", fg=typer.colors.RED, err=True)
     raise typer.Exit(code=1)
+
+
+def describe_output(result: ProcessResult) -> str:
+    """The output path, plus the quality and size picked by --max-bytes/--max-kb."""
+    if result.quality is None:
+        return str(result.output_path)
+    size = result.output_path.stat().st_size
+    return f"{result.output_path} (quality {result.quality}, {size} bytes)"
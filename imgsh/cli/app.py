@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+from importlib import import_module
+
+import typer
+from typer.core import TyperCommand, TyperGroup
+
+# Command name -> (module whose register(app) defines it, help listed by `imgsh --help`).
+COMMANDS: dict[str, tuple[str, str]] = {
+    "resize": ("imgsh.cli.resize", ""),
+    "crop": ("imgsh.cli.crop", ""),
+    "batch-resize": ("imgsh.cli.batch", ""),
+    "convert": ("imgsh.cli.convert", ""),
+    "pipeline": ("imgsh.cli.pipeline", "Run a recipe of steps on each image, decoding it once."),
+    "watch": ("imgsh.cli.watch", "Process new and changed images in a folder as they arrive."),
+    "serve": ("imgsh.cli.serve", "Serve POST /render over HTTP from warm worker processes."),
+    "extract-text": ("imgsh.cli.extract_text", ""),
+    "gui": ("imgsh.cli.gui_cmd", ""),
+    "bench": ("imgsh.cli.bench", ""),
+    "daemon": (
+        "imgsh.cli.daemon",
+        "Keep a warm imgsh process on a Unix socket; resize, crop, convert and "
+        "extract-text run in it while it is up.",
+    ),
+}
+
+
+class LazyGroup(TyperGroup):
+    """
+    Root group that imports a command's module only when that command is resolved,
+    so running one command (or printing help) does not load every other one.
+    """
+
+    _listing = False
+
+    def list_commands(self, ctx: typer.Context) -> list[str]:
+        return list(COMMANDS)
+
+    def get_command(self, ctx: typer.Context, cmd_name: str) -> TyperCommand | None:
+        if cmd_name not in COMMANDS:
+            return None
+        module_name, help_text = COMMANDS[cmd_name]
+        if self._listing:
+            return TyperCommand(name=cmd_name, help=help_text)
+        if cmd_name not in self.commands:
+            module_app = typer.Typer()
+            import_module(module_name).register(module_app)
+            self.commands[cmd_name] = typer.main.get_group(module_app).commands[cmd_name]
+        return self.commands[cmd_name]
+
+    def format_help(self, ctx: typer.Context, formatter: typer.core._click.HelpFormatter) -> None:
+        self._listing = True
+        try:
+            super().format_help(ctx, formatter)
+        finally:
+            self._listing = False
+
+
+app = typer.Typer(
+    cls=LazyGroup,
+    help="Imgsh: privacy-first local image processing.",
+    no_args_is_help=True,
+    add_completion=False,
+    context_settings={"help_option_names": ["-h", "--help"]},
+)
+
+
+@app.callback()
+def root() -> None:
+    # Typer only builds a group around a callback or registered commands; LazyGroup
+    # supplies the commands.
+    pass
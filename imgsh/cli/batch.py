@@ -1,20 +1,53 @@
 from __future__ import annotations
 
+import sys
+import threading
 from pathlib import Path
-from typing import Annotated
+from typing import Annotated, Iterator
 
 import typer
 
-from imgsh.cli import exit_with_error
-from imgsh.config import DEFAULT_FIT, DEFAULT_OCR_ENGINE, DEFAULT_OCR_FORMAT, DEFAULT_QUALITY
+from imgsh.cli import OcrCacheDirOption, OcrCacheOption, OcrCacheSizeOption, exit_with_error
+from imgsh.config import (
+    DEFAULT_BATCH_EXECUTOR,
+    DEFAULT_EXTENSION_FOR_FORMAT,
+    DEFAULT_FIT,
+    DEFAULT_OCR_ENGINE,
+    DEFAULT_OCR_CACHE_SIZE_MB,
+    DEFAULT_OCR_FORMAT,
+    DEFAULT_QUALITY,
+    DEFAULT_RESAMPLE,
+    SUPPORTED_EXTENSIONS,
+)
 from imgsh.core.errors import ImgshError
 from imgsh.core.format_engine import resolve_output_format
-from imgsh.core.processor import ImageProcessor
-from imgsh.utils.file_utils import ensure_input_dir, iter_image_files
-from imgsh.utils.validation import validate_ocr_options, validate_quality, validate_resize_dimensions
+from imgsh.core.manifest import MANIFEST_FILENAME, BatchManifest, options_fingerprint
+from imgsh.core.ocr_cache import open_ocr_cache
+from imgsh.core.timing import StageTimer
+from imgsh.utils.file_utils import (
+    ensure_input_dir,
+    ensure_input_file,
+    iter_image_files,
+    iter_listed_files,
+    sniff_image_format,
+)
+from imgsh.utils.validation import (
+    parse_formats,
+    parse_memory_budget,
+    parse_output_size_limit,
+    parse_sizes,
+    validate_batch_executor,
+    validate_ocr_options,
+    validate_positive,
+    validate_quality,
+    validate_rendition_options,
+    validate_resample,
+    validate_resize_dimensions,
+    validate_target_ssim,
+)
 
 
-def _render_name_pattern(
+def render_name_pattern(
     pattern: str,
     stem: str,
     extension: str,
@@ -40,7 +73,12 @@ def _render_name_pattern(
 def register(app: typer.Typer) -> None:
     @app.command("batch-resize")
     def batch_resize_command(
-        input_dir: Annotated[Path, typer.Argument(help="Input directory containing images.")],
+        input_dir: Annotated[
+            Path | None,
+            typer.Argument(
+                help="Input directory containing images (optional with --from-file)."
+            ),
+        ] = None,
         width: Annotated[int | None, typer.Option("--width", help="Target width in pixels.")] = None,
         height: Annotated[
             int | None, typer.Option("--height", help="Target height in pixels.")
@@ -65,8 +103,12 @@ def register(app: typer.Typer) -> None:
             ),
         ] = "{stem}_imgsh",
         quality: Annotated[
-            int, typer.Option("--quality", help="JPEG/WebP quality (1-100).")
-        ] = DEFAULT_QUALITY,
+            int | None,
+            typer.Option(
+                "--quality",
+                help=f"JPEG/WebP quality (1-100, default {DEFAULT_QUALITY}). Forces a re-encode.",
+            ),
+        ] = None,
         output_format: Annotated[
             str | None, typer.Option("--format", help="Output format: jpg, png, webp.")
         ] = None,
@@ -80,78 +122,472 @@ def register(app: typer.Typer) -> None:
             bool,
             typer.Option("--overwrite/--no-overwrite", help="Allow replacing existing output files."),
         ] = False,
+        hardlink: Annotated[
+            bool,
+            typer.Option(
+                "--hardlink",
+                help="Hardlink outputs identical to their input (or, with --dedupe, to an earlier output).",
+            ),
+        ] = False,
+        dedupe: Annotated[
+            bool,
+            typer.Option(
+                "--dedupe",
+                help="Process each distinct input content once; exact duplicates get copies of its outputs.",
+            ),
+        ] = False,
         ocr: Annotated[
-            bool, typer.Option("--ocr", help="Run OCR and write sidecar output.")
+            bool,
+            typer.Option(
+                "--ocr",
+                help=(
+                    "Run OCR and write sidecar output. Reads the encoded output file "
+                    "unless --executor thread, which OCRs the rendered pixels."
+                ),
+            ),
         ] = False,
         ocr_engine: Annotated[
-            str, typer.Option("--engine", help="OCR engine. Only 'textract' is supported in v1.")
+            str, typer.Option("--engine", help="OCR engine: textract or tesserocr (in-process).")
         ] = DEFAULT_OCR_ENGINE,
         ocr_format: Annotated[
             str, typer.Option("--ocr-format", help="OCR output format: txt or json.")
         ] = DEFAULT_OCR_FORMAT,
         lang: Annotated[str, typer.Option("--lang", help="OCR language hint (default: en).")] = "en",
+        ocr_cache_enabled: OcrCacheOption = None,
+        ocr_cache_dir: OcrCacheDirOption = None,
+        ocr_cache_size: OcrCacheSizeOption = DEFAULT_OCR_CACHE_SIZE_MB,
+        timings: Annotated[
+            bool,
+            typer.Option("--timings", help="Print per-stage wall/CPU time and pixel/byte counts."),
+        ] = False,
+        low_memory: Annotated[
+            bool,
+            typer.Option(
+                "--low-memory",
+                help="Resample in strips and orient only the output, for very large images.",
+            ),
+        ] = False,
+        max_megapixels: Annotated[
+            float | None,
+            typer.Option(
+                "--max-megapixels",
+                help="Fail images that would decode to more megapixels (replaces Pillow's limit).",
+            ),
+        ] = None,
+        max_memory_mb: Annotated[
+            int | None,
+            typer.Option(
+                "--max-memory-mb",
+                help="Fail images estimated to need more memory than this per image.",
+            ),
+        ] = None,
+        max_output_bytes_value: Annotated[
+            int | None,
+            typer.Option(
+                "--max-bytes",
+                help="Largest output size in bytes: JPEG/WebP quality is lowered until it fits.",
+            ),
+        ] = None,
+        max_output_kb: Annotated[
+            int | None, typer.Option("--max-kb", help="Largest output size in KiB (1024 bytes).")
+        ] = None,
+        target_ssim: Annotated[
+            float | None,
+            typer.Option(
+                "--target-ssim",
+                help="Pick the lowest JPEG/WebP quality reaching this SSIM (0-1, needs NumPy).",
+            ),
+        ] = None,
+        report_path: Annotated[
+            Path | None,
+            typer.Option(
+                "--report",
+                help="Write a JSON-lines report: one record per file plus a final summary.",
+            ),
+        ] = None,
+        ocr_jobs: Annotated[
+            int | None,
+            typer.Option(
+                "--ocr-jobs",
+                help="Concurrent OCR jobs, run alongside image workers (default: CPU count).",
+            ),
+        ] = None,
+        jobs: Annotated[
+            int | None,
+            typer.Option("--jobs", "-j", help="Parallel workers (default: CPU count)."),
+        ] = None,
+        executor: Annotated[
+            str,
+            typer.Option(
+                "--executor",
+                help="Parallelism: process (worker pool) or thread (streaming stage pipeline).",
+            ),
+        ] = DEFAULT_BATCH_EXECUTOR,
+        max_tasks_per_child: Annotated[
+            int | None,
+            typer.Option(
+                "--max-tasks-per-child",
+                help="Recycle each worker process after this many images.",
+            ),
+        ] = None,
+        incremental: Annotated[
+            bool,
+            typer.Option(
+                "--incremental",
+                help="Skip inputs unchanged since the last run (tracked in a manifest in the output directory).",
+            ),
+        ] = False,
+        content_hash: Annotated[
+            bool,
+            typer.Option(
+                "--content-hash",
+                help="With --incremental, also record SHA-256 so touched-but-unchanged files are skipped.",
+            ),
+        ] = False,
+        sizes_value: Annotated[
+            str | None,
+            typer.Option(
+                "--sizes",
+                help="Comma-separated widths to render from one decode, e.g. 320,640,1280.",
+            ),
+        ] = None,
+        formats_value: Annotated[
+            str | None,
+            typer.Option("--formats", help="Comma-separated formats for --sizes, e.g. webp,jpg."),
+        ] = None,
+        from_file: Annotated[
+            str | None,
+            typer.Option(
+                "--from-file",
+                help="Read input paths from a file list instead of scanning ('-' for stdin).",
+            ),
+        ] = None,
+        null_separated: Annotated[
+            bool,
+            typer.Option("--null", "-0", help="--from-file entries are NUL-separated (find -print0)."),
+        ] = False,
+        sort: Annotated[
+            bool,
+            typer.Option(
+                "--sort/--no-sort",
+                help="Process in sorted path order; --no-sort streams in filesystem order.",
+            ),
+        ] = True,
+        sniff: Annotated[
+            bool,
+            typer.Option(
+                "--sniff",
+                help="Detect images by magic bytes instead of file extension.",
+            ),
+        ] = False,
+        draft: Annotated[
+            bool,
+            typer.Option(
+                "--draft/--no-draft",
+                help="Decode JPEGs at 1/2, 1/4 or 1/8 scale when the output is much smaller.",
+            ),
+        ] = True,
+        resample: Annotated[
+            str,
+            typer.Option(
+                "--resample",
+                help="Resampling filter: auto, nearest, box, bilinear, bicubic, lanczos.",
+            ),
+        ] = DEFAULT_RESAMPLE,
+        reducing_gap: Annotated[
+            float | None,
+            typer.Option(
+                "--reducing-gap",
+                help="Pre-reduce by an integer factor first; >= 2.0 is fast and near-lossless.",
+            ),
+        ] = None,
     ) -> None:
+        from imgsh.core.batch_engine import (
+            BatchItem,
+            Deduplicator,
+            default_jobs,
+            run_batch,
+            run_batch_threaded,
+            run_ocr_pool,
+        )
+        from imgsh.core.processor import rendition_targets
+        from imgsh.core.report import BatchReport
+
         try:
-            ensure_input_dir(input_dir)
+            if input_dir is None and from_file is None:
+                raise ImgshError("Provide an input directory or --from-file.")
+            if input_dir is not None:
+                ensure_input_dir(input_dir)
+            if incremental and out is None and input_dir is None:
+                raise ImgshError("--incremental with --from-file requires --out or an input directory.")
             validate_resize_dimensions(width=width, height=height, fit=fit)
             validate_quality(quality)
+            validate_resample(resample, reducing_gap)
+            validate_positive("--jobs", jobs)
+            validate_positive("--max-tasks-per-child", max_tasks_per_child)
+            validate_positive("--ocr-jobs", ocr_jobs)
+            validate_batch_executor(executor)
+            if low_memory and executor == "thread":
+                raise ImgshError("--low-memory requires --executor process.")
+            sizes = parse_sizes(sizes_value)
+            formats = parse_formats(formats_value)
+            validate_rendition_options(
+                sizes=sizes, formats=formats, width=width, height=height, fit=fit
+            )
+            validate_positive("--ocr-cache-size", ocr_cache_size)
+            max_pixels, max_bytes = parse_memory_budget(max_megapixels, max_memory_mb)
+            max_output_bytes = parse_output_size_limit(
+                max_output_bytes_value,
+                max_output_kb,
+                [output_format] if output_format else formats,
+            )
+            validate_target_ssim(target_ssim, [output_format] if output_format else formats)
             if ocr:
                 validate_ocr_options(engine=ocr_engine, output_format=ocr_format)
+            ocr_cache = (
+                open_ocr_cache(ocr_cache_enabled, ocr_cache_dir, ocr_cache_size) if ocr else None
+            )
 
-            input_files = list(iter_image_files(input_dir=input_dir, recursive=recursive))
-            if not input_files:
-                raise ImgshError("No supported images found in the input directory.")
+            if sizes:
+                formats = formats or ([output_format] if output_format else None)
+                options = {"sizes": sizes, "formats": formats}
+            else:
+                options = {
+                    "width": width,
+                    "height": height,
+                    "keep_aspect": keep_aspect,
+                    "fit": fit,
+                    "output_format": output_format,
+                }
+            options |= {
+                "quality": quality,
+                "preserve_exif": preserve_exif,
+                "overwrite": overwrite,
+                "ocr": ocr,
+                "ocr_engine": ocr_engine,
+                "ocr_out": None,
+                "ocr_format": ocr_format,
+                "lang": lang,
+                "draft": draft,
+                "resample": resample,
+                "reducing_gap": reducing_gap,
+                "timings": timings,
+                "low_memory": low_memory,
+                "max_pixels": max_pixels,
+                "max_bytes": max_bytes,
+                "hardlink": hardlink,
+            }
+            # Added only when set, so existing --incremental manifests stay current.
+            if max_output_bytes is not None:
+                options["max_output_bytes"] = max_output_bytes
+            if target_ssim is not None:
+                options["target_ssim"] = target_ssim
+            manifest: BatchManifest | None = None
+            fingerprint = ""
+            if incremental:
+                manifest = BatchManifest(
+                    path=(out or input_dir) / MANIFEST_FILENAME,
+                    use_hash=content_hash,
+                )
+                fingerprint = options_fingerprint(options)
 
-            processor = ImageProcessor()
             processed = 0
             failed = 0
+            planning_failed = 0
+            skipped = 0
+            # plan_items runs on the executor's feeder (or --dedupe hashing) thread.
+            planning_lock = threading.Lock()
+            stage_totals = StageTimer()
+            report = BatchReport(report_path) if report_path is not None else None
+            claimed_outputs: set[str] = set()
+            duplicates: list[tuple[Path, Path]] = []
 
-            for index, input_path in enumerate(input_files, start=1):
-                try:
-                    _, extension = resolve_output_format(output_format, None, input_path)
-                    output_stem = _render_name_pattern(
-                        pattern=name_pattern,
-                        stem=input_path.stem,
-                        extension=extension,
-                        width=width,
-                        height=height,
-                        index=index,
+            def discover() -> Iterator[Path]:
+                if from_file is None:
+                    yield from iter_image_files(
+                        input_dir=input_dir, recursive=recursive, sort=sort, sniff=sniff
                     )
+                elif from_file == "-":
+                    yield from iter_listed_files(sys.stdin.buffer, null_separated=null_separated)
+                else:
+                    with open(from_file, "rb") as listing:
+                        yield from iter_listed_files(listing, null_separated=null_separated)
+
+            def plan_items() -> Iterator[BatchItem]:
+                # Runs lazily as the executor asks for work, so the first image starts
+                # processing before discovery has finished.
+                nonlocal planning_failed, skipped
+                for index, input_path in enumerate(discover(), start=1):
+                    try:
+                        if from_file is not None:
+                            ensure_input_file(input_path)
+                        requested_format = output_format
+                        if requested_format is None and (
+                            input_path.suffix.lower() not in SUPPORTED_EXTENSIONS
+                        ):
+                            # Extension-less or unknown suffix: name the output after its content.
+                            sniffed = sniff_image_format(input_path)
+                            if sniffed is None:
+                                raise ImgshError("Not a supported image (jpg, png, webp).")
+                            requested_format = DEFAULT_EXTENSION_FOR_FORMAT[sniffed]
+                        _, extension = resolve_output_format(requested_format, None, input_path)
+                        output_stem = render_name_pattern(
+                            pattern=name_pattern,
+                            stem=input_path.stem,
+                            extension=extension,
+                            width=width,
+                            height=height,
+                            index=index,
+                        )
 
-                    if out:
-                        if recursive:
-                            relative_parent = input_path.relative_to(input_dir).parent
-                            target_dir = out / relative_parent
+                        if out:
+                            if recursive and input_dir is not None and input_path.is_relative_to(
+                                input_dir
+                            ):
+                                relative_parent = input_path.relative_to(input_dir).parent
+                                target_dir = out / relative_parent
+                            else:
+                                target_dir = out
                         else:
-                            target_dir = out
-                    else:
-                        target_dir = input_path.parent
-
-                    output_path = target_dir / f"{output_stem}{extension}"
-                    result = processor.resize(
-                        input_path=input_path,
-                        out=output_path,
-                        width=width,
-                        height=height,
-                        keep_aspect=keep_aspect,
-                        fit=fit,
-                        quality=quality,
-                        output_format=output_format,
-                        preserve_exif=preserve_exif,
-                        overwrite=overwrite,
-                        ocr=ocr,
-                        ocr_engine=ocr_engine,
-                        ocr_out=None,
-                        ocr_format=ocr_format,
-                        lang=lang,
+                            target_dir = input_path.parent
+
+                        if sizes:
+                            output_path = target_dir / output_stem
+                            output_paths = [
+                                path
+                                for _, _, path in rendition_targets(
+                                    input_path=input_path,
+                                    out=target_dir,
+                                    sizes=sizes,
+                                    formats=formats,
+                                    overwrite=True,
+                                    stem=output_stem,
+                                )
+                            ]
+                        else:
+                            output_path = target_dir / f"{output_stem}{extension}"
+                            output_paths = [output_path]
+                        # Workers run concurrently, so catch two inputs mapping to one output up front.
+                        for path in output_paths:
+                            if str(path) in claimed_outputs and not overwrite:
+                                raise ImgshError(
+                                    f"Output already exists: {path}. "
+                                    "Use --overwrite to replace existing files."
+                                )
+                        claimed_outputs.update(str(path) for path in output_paths)
+
+                        item_overwrite = False
+                        if manifest is not None:
+                            if manifest.is_current(input_path, output_paths, fingerprint):
+                                with planning_lock:
+                                    skipped += 1
+                                if report is not None:
+                                    report.record(input_path, "skipped")
+                                continue
+                            item_overwrite = manifest.owns(input_path, output_paths)
+                        yield BatchItem(
+                            index=index,
+                            input_path=input_path,
+                            output_path=output_path,
+                            overwrite=item_overwrite,
+                        )
+                    except ImgshError as error:
+                        with planning_lock:
+                            planning_failed += 1
+                        if report is not None:
+                            report.record(input_path, "failed", error=str(error))
+                        typer.secho(
+                            f"[fail] {input_path}: {error}", fg=typer.colors.YELLOW, err=True
+                        )
+
+            try:
+                # OCR runs on its own pool, so image workers never wait on it. Thread
+                # workers hand back the rendered pixels so OCR need not re-decode the
+                # output; process workers would have to pickle them, so OCR reads the file.
+                image_options = {**options, "ocr": False, "keep_image": ocr and executor == "thread"}
+                items = plan_items()
+                deduplicator = Deduplicator(image_options) if dedupe else None
+                if deduplicator is not None:
+                    items = deduplicator.unique(items)
+                if executor == "thread":
+                    outcomes = run_batch_threaded(
+                        items=items,
+                        options=image_options,
+                        jobs=jobs or default_jobs(),
+                    )
+                else:
+                    outcomes = run_batch(
+                        items=items,
+                        options=image_options,
+                        jobs=jobs or default_jobs(),
+                        max_tasks_per_child=max_tasks_per_child,
+                    )
+                if deduplicator is not None:
+                    outcomes = deduplicator.complete(outcomes)
+                if ocr:
+                    outcomes = run_ocr_pool(
+                        outcomes,
+                        ocr_options=options,
+                        jobs=ocr_jobs or default_jobs(),
+                        cache=ocr_cache,
                     )
-                    processed += 1
-                    typer.echo(f"[ok] {input_path} -> {result.output_path}")
-                except ImgshError as error:
-                    failed += 1
-                    typer.secho(f"[fail] {input_path}: {error}", fg=typer.colors.YELLOW, err=True)
+                for outcome in outcomes:
+                    if report is not None:
+                        report.record(
+                            outcome.item.input_path,
+                            "ok" if outcome.error is None else "failed",
+                            results=outcome.results,
+                            error=outcome.error,
+                            elapsed=outcome.elapsed,
+                            duplicate_of=outcome.duplicate_of,
+                        )
+                    if outcome.error is None:
+                        processed += 1
+                        output_paths = [result.output_path for result in outcome.results]
+                        if manifest is not None:
+                            manifest.record(outcome.item.input_path, output_paths, fingerprint)
+                        rendered_paths = ", ".join(str(path) for path in output_paths)
+                        if outcome.duplicate_of is not None:
+                            duplicates.append((outcome.item.input_path, outcome.duplicate_of))
+                            typer.echo(
+                                f"[dup] {outcome.item.input_path} -> {rendered_paths} "
+                                f"(same content as {outcome.duplicate_of})"
+                            )
+                        else:
+                            typer.echo(f"[ok] {outcome.item.input_path} -> {rendered_paths}")
+                        item_timings = outcome.results[0].timings
+                        if item_timings is not None:
+                            typer.echo(f"     timings: {item_timings.format()}")
+                            stage_totals.merge(item_timings)
+                    else:
+                        failed += 1
+                        typer.secho(
+                            f"[fail] {outcome.item.input_path}: {outcome.error}",
+                            fg=typer.colors.YELLOW,
+                            err=True,
+                        )
+            finally:
+                if manifest is not None:
+                    manifest.close()
+                if report is not None:
+                    report.close()
 
-            typer.echo(f"Batch complete. Processed: {processed}, Failed: {failed}")
+            with planning_lock:
+                failed += planning_failed
+            if processed + failed + skipped == 0:
+                raise ImgshError("No supported images found in the input directory.")
+            summary = f"Batch complete. Processed: {processed}, Failed: {failed}"
+            if incremental:
+                summary += f", Skipped: {skipped}"
+            if dedupe:
+                summary += f", Duplicates: {len(duplicates)}"
+            typer.echo(summary)
+            for input_path, first_path in duplicates:
+                typer.echo(f"  duplicate: {input_path} = {first_path}")
+            if timings and stage_totals.stages:
+                typer.echo(f"Stage totals: {stage_totals.format()}")
+            if ocr_cache is not None:
+                typer.echo(ocr_cache.summary())
             if failed:
                 raise typer.Exit(code=1)
         except ImgshError as error:
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import json
+import tempfile
+from pathlib import Path
+from typing import TYPE_CHECKING, Annotated
+
+import typer
+
+from imgsh.cli import exit_with_error
+from imgsh.config import BENCH_FORMATS, BENCH_RESOLUTIONS, BENCH_SCENARIOS, BENCH_SEED
+from imgsh.core.errors import ImgshError
+from imgsh.utils.validation import parse_formats, parse_resolutions, validate_positive
+
+if TYPE_CHECKING:
+    from imgsh.core.bench_engine import BenchResult
+
+
+def _format_ms(value: float | None) -> str:
+    return "-" if value is None else f"{value:.1f}"
+
+
+def _render_table(results: list[BenchResult]) -> str:
+    header = ["scenario", "images", "images/s", "MB/s", "p50 ms", "p95 ms"]
+    rows = [
+        [
+            result.scenario,
+            str(result.images),
+            f"{result.images_per_second:.2f}",
+            f"{result.mb_per_second:.2f}",
+            _format_ms(result.p50_ms),
+            _format_ms(result.p95_ms),
+        ]
+        for result in results
+    ]
+    widths = [max(len(row[column]) for row in [header, *rows]) for column in range(len(header))]
+    lines = []
+    for row in [header, *rows]:
+        cells = [row[0].ljust(widths[0])]
+        cells += [cell.rjust(width) for cell, width in zip(row[1:], widths[1:])]
+        lines.append("  ".join(cells))
+    return "\n".join(lines)
+
+
+def register(app: typer.Typer) -> None:
+    @app.command("bench")
+    def bench_command(
+        corpus_dir: Annotated[
+            Path | None,
+            typer.Option(
+                "--corpus",
+                help="Directory for the synthetic corpus; reused across runs (default: temporary).",
+            ),
+        ] = None,
+        resolutions_value: Annotated[
+            str,
+            typer.Option("--resolutions", help="Comma-separated WIDTHxHEIGHT corpus sizes."),
+        ] = ",".join(f"{width}x{height}" for width, height in BENCH_RESOLUTIONS),
+        formats_value: Annotated[
+            str, typer.Option("--formats", help="Comma-separated corpus formats.")
+        ] = ",".join(BENCH_FORMATS),
+        scenarios_value: Annotated[
+            str,
+            typer.Option("--scenarios", help="Comma-separated scenarios to time."),
+        ] = ",".join(BENCH_SCENARIOS),
+        repeat: Annotated[
+            int, typer.Option("--repeat", help="Passes over the corpus per scenario.")
+        ] = 1,
+        jobs: Annotated[
+            int | None,
+            typer.Option("--jobs", "-j", help="Worker processes for batch-resize (default: CPUs)."),
+        ] = None,
+        seed: Annotated[int, typer.Option("--seed", help="Corpus generator seed.")] = BENCH_SEED,
+        as_json: Annotated[
+            bool, typer.Option("--json", help="Print results as JSON instead of a table.")
+        ] = False,
+    ) -> None:
+        from imgsh.core.batch_engine import default_jobs
+        from imgsh.core.bench_engine import environment_info, generate_corpus, run_benchmarks
+
+        try:
+            validate_positive("--repeat", repeat)
+            validate_positive("--jobs", jobs)
+            resolutions = parse_resolutions(resolutions_value)
+            formats = parse_formats(formats_value)
+            scenarios = [part.strip() for part in scenarios_value.split(",") if part.strip()]
+            unknown = [scenario for scenario in scenarios if scenario not in BENCH_SCENARIOS]
+            if unknown or not scenarios:
+                raise ImgshError(
+                    f"Invalid --scenarios '{scenarios_value}'. "
+                    f"Supported values: {', '.join(BENCH_SCENARIOS)}"
+                )
+
+            with tempfile.TemporaryDirectory(prefix="imgsh-corpus-") as tmpdir:
+                corpus = generate_corpus(
+                    directory=corpus_dir or Path(tmpdir),
+                    resolutions=resolutions,
+                    formats=formats,
+                    seed=seed,
+                )
+                results = run_benchmarks(
+                    corpus=corpus,
+                    scenarios=scenarios,
+                    repeat=repeat,
+                    jobs=jobs or default_jobs(),
+                )
+
+            if as_json:
+                payload = {
+                    "environment": environment_info(),
+                    "corpus": {
+                        "images": len(corpus),
+                        "resolutions": [f"{width}x{height}" for width, height in resolutions],
+                        "formats": formats,
+                        "seed": seed,
+                    },
+                    "repeat": repeat,
+                    "results": [result.to_dict() for result in results],
+                }
+                typer.echo(json.dumps(payload, indent=2))
+            else:
+                typer.echo(f"Corpus: {len(corpus)} images, repeat: {repeat}")
+                typer.echo(_render_table(results))
+        except ImgshError as error:
+            exit_with_error(error)
@@ -5,12 +5,30 @@ from typing import Annotated
 
 import typer
 
-from imgsh.cli import exit_with_error
-from imgsh.config import DEFAULT_OCR_ENGINE, DEFAULT_OCR_FORMAT, DEFAULT_QUALITY
+from imgsh.cli import (
+    OcrCacheDirOption,
+    OcrCacheOption,
+    OcrCacheSizeOption,
+    describe_output,
+    exit_with_error,
+)
+from imgsh.config import (
+    DEFAULT_OCR_CACHE_SIZE_MB,
+    DEFAULT_OCR_ENGINE,
+    DEFAULT_OCR_FORMAT,
+    DEFAULT_QUALITY,
+)
 from imgsh.core.errors import ImgshError
-from imgsh.core.processor import ImageProcessor
+from imgsh.core.ocr_cache import open_ocr_cache
 from imgsh.utils.file_utils import ensure_input_file
-from imgsh.utils.validation import validate_ocr_options, validate_quality
+from imgsh.utils.validation import (
+    parse_memory_budget,
+    parse_output_size_limit,
+    validate_ocr_options,
+    validate_positive,
+    validate_quality,
+    validate_target_ssim,
+)
 
 
 def register(app: typer.Typer) -> None:
@@ -24,8 +42,12 @@ def register(app: typer.Typer) -> None:
             Path | None, typer.Option("--out", help="Output file path (or output directory).")
         ] = None,
         quality: Annotated[
-            int, typer.Option("--quality", help="JPEG/WebP quality (1-100).")
-        ] = DEFAULT_QUALITY,
+            int | None,
+            typer.Option(
+                "--quality",
+                help=f"JPEG/WebP quality (1-100, default {DEFAULT_QUALITY}). Forces a re-encode.",
+            ),
+        ] = None,
         preserve_exif: Annotated[
             bool,
             typer.Option(
@@ -36,11 +58,18 @@ def register(app: typer.Typer) -> None:
             bool,
             typer.Option("--overwrite/--no-overwrite", help="Allow replacing existing output files."),
         ] = False,
+        hardlink: Annotated[
+            bool,
+            typer.Option(
+                "--hardlink",
+                help="Hardlink outputs identical to their input instead of copying them.",
+            ),
+        ] = False,
         ocr: Annotated[
             bool, typer.Option("--ocr", help="Run OCR and write sidecar output.")
         ] = False,
         ocr_engine: Annotated[
-            str, typer.Option("--engine", help="OCR engine. Only 'textract' is supported in v1.")
+            str, typer.Option("--engine", help="OCR engine: textract or tesserocr (in-process).")
         ] = DEFAULT_OCR_ENGINE,
         ocr_out: Annotated[
             Path | None, typer.Option("--ocr-out", help="OCR output path.")
@@ -49,12 +78,69 @@ def register(app: typer.Typer) -> None:
             str, typer.Option("--ocr-format", help="OCR output format: txt or json.")
         ] = DEFAULT_OCR_FORMAT,
         lang: Annotated[str, typer.Option("--lang", help="OCR language hint (default: en).")] = "en",
+        ocr_cache_enabled: OcrCacheOption = None,
+        ocr_cache_dir: OcrCacheDirOption = None,
+        ocr_cache_size: OcrCacheSizeOption = DEFAULT_OCR_CACHE_SIZE_MB,
+        timings: Annotated[
+            bool,
+            typer.Option("--timings", help="Print per-stage wall/CPU time and pixel/byte counts."),
+        ] = False,
+        max_megapixels: Annotated[
+            float | None,
+            typer.Option(
+                "--max-megapixels",
+                help="Fail images that would decode to more megapixels (replaces Pillow's limit).",
+            ),
+        ] = None,
+        max_memory_mb: Annotated[
+            int | None,
+            typer.Option(
+                "--max-memory-mb",
+                help="Fail images estimated to need more memory than this per image.",
+            ),
+        ] = None,
+        max_output_bytes_value: Annotated[
+            int | None,
+            typer.Option(
+                "--max-bytes",
+                help="Largest output size in bytes: JPEG/WebP quality is lowered until it fits.",
+            ),
+        ] = None,
+        max_output_kb: Annotated[
+            int | None, typer.Option("--max-kb", help="Largest output size in KiB (1024 bytes).")
+        ] = None,
+        target_ssim: Annotated[
+            float | None,
+            typer.Option(
+                "--target-ssim",
+                help="Pick the lowest JPEG/WebP quality reaching this SSIM (0-1, needs NumPy).",
+            ),
+        ] = None,
+        search_jobs: Annotated[
+            int,
+            typer.Option(
+                "--search-jobs",
+                help="Candidate qualities encoded at once for --max-bytes/--max-kb/--target-ssim.",
+            ),
+        ] = 1,
     ) -> None:
+        from imgsh.core.processor import ImageProcessor
+
         try:
             ensure_input_file(input_path)
             validate_quality(quality)
+            validate_positive("--ocr-cache-size", ocr_cache_size)
+            max_pixels, max_bytes = parse_memory_budget(max_megapixels, max_memory_mb)
+            max_output_bytes = parse_output_size_limit(
+                max_output_bytes_value, max_output_kb, [output_format]
+            )
+            validate_target_ssim(target_ssim, [output_format])
+            validate_positive("--search-jobs", search_jobs)
             if ocr:
                 validate_ocr_options(engine=ocr_engine, output_format=ocr_format)
+            ocr_cache = (
+                open_ocr_cache(ocr_cache_enabled, ocr_cache_dir, ocr_cache_size) if ocr else None
+            )
 
             processor = ImageProcessor()
             result = processor.convert(
@@ -69,9 +155,21 @@ def register(app: typer.Typer) -> None:
                 ocr_out=ocr_out,
                 ocr_format=ocr_format,
                 lang=lang,
+                ocr_cache=ocr_cache,
+                timings=timings,
+                max_pixels=max_pixels,
+                max_bytes=max_bytes,
+                hardlink=hardlink,
+                max_output_bytes=max_output_bytes,
+                target_ssim=target_ssim,
+                search_jobs=search_jobs,
             )
-            typer.echo(f"Saved image: {result.output_path}")
+            typer.echo(f"Saved image: {describe_output(result)}")
             if result.ocr_path:
                 typer.echo(f"Saved OCR: {result.ocr_path}")
+                if ocr_cache is not None:
+                    typer.echo(ocr_cache.summary())
+            if result.timings is not None:
+                typer.echo(f"Timings: {result.timings.format()}")
         except ImgshError as error:
             exit_with_error(error)
@@ -5,12 +5,23 @@ from typing import Annotated
 
 import typer
 
-from imgsh.cli import exit_with_error
-from imgsh.config import DEFAULT_OCR_ENGINE, DEFAULT_OCR_FORMAT, DEFAULT_QUALITY
+from imgsh.cli import OcrCacheDirOption, OcrCacheOption, OcrCacheSizeOption, exit_with_error
+from imgsh.config import (
+    DEFAULT_OCR_CACHE_SIZE_MB,
+    DEFAULT_OCR_ENGINE,
+    DEFAULT_OCR_FORMAT,
+    DEFAULT_QUALITY,
+)
 from imgsh.core.errors import ImgshError
-from imgsh.core.processor import ImageProcessor
+from imgsh.core.ocr_cache import open_ocr_cache
 from imgsh.utils.file_utils import ensure_input_file
-from imgsh.utils.validation import validate_crop_box, validate_ocr_options, validate_quality
+from imgsh.utils.validation import (
+    parse_memory_budget,
+    validate_crop_box,
+    validate_ocr_options,
+    validate_positive,
+    validate_quality,
+)
 
 
 def register(app: typer.Typer) -> None:
@@ -50,7 +61,7 @@ def register(app: typer.Typer) -> None:
             bool, typer.Option("--ocr", help="Run OCR and write sidecar output.")
         ] = False,
         ocr_engine: Annotated[
-            str, typer.Option("--engine", help="OCR engine. Only 'textract' is supported in v1.")
+            str, typer.Option("--engine", help="OCR engine: textract or tesserocr (in-process).")
         ] = DEFAULT_OCR_ENGINE,
         ocr_out: Annotated[
             Path | None, typer.Option("--ocr-out", help="OCR output path.")
@@ -59,13 +70,48 @@ def register(app: typer.Typer) -> None:
             str, typer.Option("--ocr-format", help="OCR output format: txt or json.")
         ] = DEFAULT_OCR_FORMAT,
         lang: Annotated[str, typer.Option("--lang", help="OCR language hint (default: en).")] = "en",
+        ocr_cache_enabled: OcrCacheOption = None,
+        ocr_cache_dir: OcrCacheDirOption = None,
+        ocr_cache_size: OcrCacheSizeOption = DEFAULT_OCR_CACHE_SIZE_MB,
+        timings: Annotated[
+            bool,
+            typer.Option("--timings", help="Print per-stage wall/CPU time and pixel/byte counts."),
+        ] = False,
+        low_memory: Annotated[
+            bool,
+            typer.Option(
+                "--low-memory",
+                help="Resample in strips and orient only the output, for very large images.",
+            ),
+        ] = False,
+        max_megapixels: Annotated[
+            float | None,
+            typer.Option(
+                "--max-megapixels",
+                help="Fail images that would decode to more megapixels (replaces Pillow's limit).",
+            ),
+        ] = None,
+        max_memory_mb: Annotated[
+            int | None,
+            typer.Option(
+                "--max-memory-mb",
+                help="Fail images estimated to need more memory than this per image.",
+            ),
+        ] = None,
     ) -> None:
+        from imgsh.core.processor import ImageProcessor
+
         try:
             ensure_input_file(input_path)
             validate_crop_box(x=x, y=y, width=width, height=height)
             validate_quality(quality)
+            validate_positive("--ocr-cache-size", ocr_cache_size)
+            max_pixels, max_bytes = parse_memory_budget(max_megapixels, max_memory_mb)
             if ocr:
                 validate_ocr_options(engine=ocr_engine, output_format=ocr_format)
+            ocr_cache = (
+                open_ocr_cache(ocr_cache_enabled, ocr_cache_dir, ocr_cache_size) if ocr else None
+            )
 
             processor = ImageProcessor()
             result = processor.crop(
@@ -84,9 +130,18 @@ def register(app: typer.Typer) -> None:
                 ocr_out=ocr_out,
                 ocr_format=ocr_format,
                 lang=lang,
+                ocr_cache=ocr_cache,
+                timings=timings,
+                low_memory=low_memory,
+                max_pixels=max_pixels,
+                max_bytes=max_bytes,
             )
             typer.echo(f"Saved image: {result.output_path}")
             if result.ocr_path:
                 typer.echo(f"Saved OCR: {result.ocr_path}")
+                if ocr_cache is not None:
+                    typer.echo(ocr_cache.summary())
+            if result.timings is not None:
+                typer.echo(f"Timings: {result.timings.format()}")
         except ImgshError as error:
             exit_with_error(error)
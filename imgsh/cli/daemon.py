@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Annotated
+
+import typer
+
+from imgsh.cli import exit_with_error
+from imgsh.core.daemon_engine import (
+    UNSUPPORTED_MESSAGE,
+    daemon_request,
+    daemon_supported,
+    run_daemon,
+    socket_path,
+    start_daemon,
+    stop_daemon,
+)
+from imgsh.core.errors import ImgshError
+
+SocketOption = Annotated[
+    Path | None,
+    typer.Option(
+        "--socket",
+        help="Unix socket path (default: $IMGSH_DAEMON_SOCKET, else a per-user runtime dir).",
+    ),
+]
+
+
+def _resolve_socket(socket: Path | None) -> Path:
+    if not daemon_supported():
+        exit_with_error(ImgshError(UNSUPPORTED_MESSAGE))
+    return socket or socket_path()
+
+
+def register(app: typer.Typer) -> None:
+    daemon_app = typer.Typer(
+        help=(
+            "Keep a warm imgsh process on a Unix socket; resize, crop, convert and "
+            "extract-text run in it while it is up."
+        ),
+        no_args_is_help=True,
+    )
+    app.add_typer(daemon_app, name="daemon")
+
+    @daemon_app.command("start")
+    def start_command(
+        socket: SocketOption = None,
+        foreground: Annotated[
+            bool, typer.Option("--foreground", help="Run in this process instead of detaching.")
+        ] = False,
+    ) -> None:
+        """Start the daemon."""
+        path = _resolve_socket(socket)
+        try:
+            if foreground:
+                typer.echo(f"Daemon listening on {path}. Press Ctrl-C to stop.")
+                run_daemon(path)
+                typer.echo("Daemon stopped.")
+            else:
+                pid = start_daemon(path)
+                typer.echo(f"Daemon started (pid {pid}) on {path}.")
+        except ImgshError as error:
+            exit_with_error(error)
+
+    @daemon_app.command("stop")
+    def stop_command(socket: SocketOption = None) -> None:
+        """Stop the daemon."""
+        try:
+            stopped = stop_daemon(_resolve_socket(socket))
+        except ImgshError as error:
+            exit_with_error(error)
+        typer.echo("Daemon stopped." if stopped else "Daemon is not running.")
+
+    @daemon_app.command("status")
+    def status_command(socket: SocketOption = None) -> None:
+        """Report whether the daemon is running; exits 1 when it is not."""
+        status = daemon_request(_resolve_socket(socket), "status")
+        if status is None or "pid" not in status:
+            typer.echo("Daemon is not running.")
+            raise typer.Exit(code=1)
+        typer.echo(
+            f"Daemon running (pid {status['pid']}) on {status['socket']}: "
+            f"up {status['uptime']:.0f}s, {status['served']} commands served."
+        )
@@ -5,12 +5,13 @@ from typing import Annotated
 
 import typer
 
-from imgsh.cli import exit_with_error
-from imgsh.config import DEFAULT_OCR_ENGINE, DEFAULT_OCR_FORMAT
+from imgsh.cli import OcrCacheDirOption, OcrCacheOption, OcrCacheSizeOption, exit_with_error
+from imgsh.config import DEFAULT_OCR_CACHE_SIZE_MB, DEFAULT_OCR_ENGINE, DEFAULT_OCR_FORMAT
 from imgsh.core.errors import ImgshError
-from imgsh.core.processor import ImageProcessor
+from imgsh.core.ocr_cache import open_ocr_cache
+from imgsh.core.timing import make_timer
 from imgsh.utils.file_utils import ensure_input_file
-from imgsh.utils.validation import validate_ocr_options
+from imgsh.utils.validation import validate_ocr_options, validate_positive
 
 
 def register(app: typer.Typer) -> None:
@@ -18,7 +19,7 @@ def register(app: typer.Typer) -> None:
     def extract_text_command(
         input_path: Annotated[Path, typer.Argument(help="Input image path.")],
         ocr_engine: Annotated[
-            str, typer.Option("--engine", help="OCR engine. Only 'textract' is supported in v1.")
+            str, typer.Option("--engine", help="OCR engine: textract or tesserocr (in-process).")
         ] = DEFAULT_OCR_ENGINE,
         out: Annotated[
             Path | None, typer.Option("--ocr-out", help="OCR output path.")
@@ -27,14 +28,26 @@ def register(app: typer.Typer) -> None:
             str, typer.Option("--ocr-format", help="OCR output format: txt or json.")
         ] = DEFAULT_OCR_FORMAT,
         lang: Annotated[str, typer.Option("--lang", help="OCR language hint (default: en).")] = "en",
+        ocr_cache_enabled: OcrCacheOption = None,
+        ocr_cache_dir: OcrCacheDirOption = None,
+        ocr_cache_size: OcrCacheSizeOption = DEFAULT_OCR_CACHE_SIZE_MB,
+        timings: Annotated[
+            bool,
+            typer.Option("--timings", help="Print per-stage wall/CPU time and pixel/byte counts."),
+        ] = False,
         overwrite: Annotated[
             bool,
             typer.Option("--overwrite/--no-overwrite", help="Allow replacing existing output files."),
         ] = False,
     ) -> None:
+        from imgsh.core.processor import ImageProcessor
+
         try:
             ensure_input_file(input_path)
             validate_ocr_options(engine=ocr_engine, output_format=ocr_format)
+            validate_positive("--ocr-cache-size", ocr_cache_size)
+            ocr_cache = open_ocr_cache(ocr_cache_enabled, ocr_cache_dir, ocr_cache_size)
+            timer = make_timer(timings)
             processor = ImageProcessor()
             output_path = processor.extract_text(
                 input_path=input_path,
@@ -43,7 +56,13 @@ def register(app: typer.Typer) -> None:
                 output_format=ocr_format,
                 lang=lang,
                 overwrite=overwrite,
+                cache=ocr_cache,
+                timer=timer,
             )
             typer.echo(f"Saved OCR: {output_path}")
+            if ocr_cache is not None:
+                typer.echo(ocr_cache.summary())
+            if timer.enabled:
+                typer.echo(f"Timings: {timer.format()}")
         except ImgshError as error:
             exit_with_error(error)
@@ -1,30 +1,29 @@
 from __future__ import annotations
 
-import typer
-
-from imgsh.cli.batch import register as register_batch_command
-from imgsh.cli.convert import register as register_convert_command
-from imgsh.cli.crop import register as register_crop_command
-from imgsh.cli.extract_text import register as register_extract_text_command
-from imgsh.cli.gui_cmd import register as register_gui_command
-from imgsh.cli.resize import register as register_resize_command
-
-app = typer.Typer(
-    help="Imgsh: privacy-first local image processing.",
-    no_args_is_help=True,
-    add_completion=False,
-    context_settings={"help_option_names": ["-h", "--help"]},
-)
-
-register_resize_command(app)
-register_crop_command(app)
-register_batch_command(app)
-register_convert_command(app)
-register_extract_text_command(app)
-register_gui_command(app)
+import sys
+from typing import TYPE_CHECKING
+
+from imgsh.core.daemon_engine import forward
+
+if TYPE_CHECKING:
+    from typing import Any
+
+
+def __getattr__(name: str) -> Any:
+    # The Typer app is built on first use: a command forwarded to the daemon never needs it.
+    if name == "app":
+        from imgsh.cli.app import app
+
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def run() -> None:
+    code = forward(sys.argv[1:])
+    if code is not None:
+        sys.exit(code)
+    from imgsh.cli.app import app
+
     app()
 
 
@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import TYPE_CHECKING, Annotated, Callable, Iterator
+
+import typer
+
+from imgsh.cli import exit_with_error
+from imgsh.core.errors import ImgshError
+from imgsh.core.timing import StageTimer
+from imgsh.utils.file_utils import ensure_input_file, iter_image_files
+from imgsh.utils.validation import parse_memory_budget, validate_positive
+
+if TYPE_CHECKING:
+    from imgsh.core.batch_engine import BatchItem
+    from imgsh.core.recipe_engine import Recipe
+
+
+def _plan_items(
+    recipe: Recipe,
+    input_dir: Path,
+    out: Path | None,
+    recursive: bool,
+    overwrite: bool,
+    on_error: Callable[[Path, ImgshError], None],
+) -> Iterator[BatchItem]:
+    from imgsh.core.batch_engine import BatchItem
+    from imgsh.core.recipe_engine import output_targets
+
+    claimed_outputs: set[Path] = set()
+    for index, input_path in enumerate(iter_image_files(input_dir, recursive=recursive), start=1):
+        if out is None:
+            target_dir = input_path.parent
+        else:
+            target_dir = out / input_path.relative_to(input_dir).parent
+        try:
+            output_paths = [
+                path
+                for _, _, path in output_targets(
+                    recipe, input_path, target_dir, input_path.stem, index, overwrite=True
+                )
+            ]
+            # Workers run concurrently, so catch two inputs mapping to one output up front.
+            for path in output_paths:
+                if path in claimed_outputs and not overwrite:
+                    raise ImgshError(
+                        f"Output already exists: {path}. Use --overwrite to replace existing files."
+                    )
+        except ImgshError as error:
+            on_error(input_path, error)
+            continue
+        claimed_outputs.update(output_paths)
+        yield BatchItem(index=index, input_path=input_path, output_path=target_dir / input_path.stem)
+
+
+def register(app: typer.Typer) -> None:
+    @app.command("pipeline")
+    def pipeline_command(
+        recipe_path: Annotated[
+            Path, typer.Argument(help="Recipe file (.json or .toml) listing the steps.")
+        ],
+        input_path: Annotated[Path, typer.Argument(help="Input image or directory.")],
+        out: Annotated[
+            Path | None,
+            typer.Option("--out", help="Output directory (default: next to each input)."),
+        ] = None,
+        recursive: Annotated[
+            bool, typer.Option("--recursive/--no-recursive", help="Traverse subdirectories.")
+        ] = False,
+        jobs: Annotated[
+            int | None,
+            typer.Option("--jobs", "-j", help="Parallel workers (default: CPU count)."),
+        ] = None,
+        overwrite: Annotated[
+            bool,
+            typer.Option("--overwrite/--no-overwrite", help="Allow replacing existing output files."),
+        ] = False,
+        timings: Annotated[
+            bool,
+            typer.Option("--timings", help="Print per-stage wall/CPU time and pixel/byte counts."),
+        ] = False,
+        max_megapixels: Annotated[
+            float | None,
+            typer.Option(
+                "--max-megapixels",
+                help="Fail images that would decode to more megapixels (replaces Pillow's limit).",
+            ),
+        ] = None,
+        max_memory_mb: Annotated[
+            int | None,
+            typer.Option(
+                "--max-memory-mb",
+                help="Fail images estimated to need more memory than this per image.",
+            ),
+        ] = None,
+    ) -> None:
+        """Run a recipe of steps on each image, decoding it once."""
+        from imgsh.core.batch_engine import default_jobs, run_batch
+        from imgsh.core.recipe_engine import load_recipe, process_recipe_item, run_recipe
+
+        try:
+            validate_positive("--jobs", jobs)
+            max_pixels, max_bytes = parse_memory_budget(max_megapixels, max_memory_mb)
+            if out is not None and out.is_file():
+                raise ImgshError(f"--out must be a directory, got: {out}")
+            recipe = load_recipe(recipe_path)
+
+            if not input_path.is_dir():
+                ensure_input_file(input_path)
+                results = run_recipe(
+                    recipe,
+                    input_path=input_path,
+                    out_dir=out or input_path.parent,
+                    overwrite=overwrite,
+                    timings=timings,
+                    max_pixels=max_pixels,
+                    max_bytes=max_bytes,
+                )
+                for result in results:
+                    typer.echo(f"Saved image: {result.output_path}")
+                    if result.ocr_path:
+                        typer.echo(f"Saved OCR: {result.ocr_path}")
+                if results[0].timings is not None:
+                    typer.echo(f"Timings: {results[0].timings.format()}")
+                return
+
+            options = {
+                "recipe": recipe,
+                "overwrite": overwrite,
+                "timings": timings,
+                "max_pixels": max_pixels,
+                "max_bytes": max_bytes,
+            }
+            processed = 0
+            failed = 0
+            stage_totals = StageTimer()
+
+            def report_failure(failed_path: Path, error: ImgshError | str) -> None:
+                nonlocal failed
+                failed += 1
+                typer.secho(f"[fail] {failed_path}: {error}", fg=typer.colors.YELLOW, err=True)
+
+            for outcome in run_batch(
+                _plan_items(recipe, input_path, out, recursive, overwrite, on_error=report_failure),
+                options,
+                jobs=jobs or default_jobs(),
+                worker=process_recipe_item,
+            ):
+                if outcome.error is None:
+                    processed += 1
+                    rendered_paths = ", ".join(str(result.output_path) for result in outcome.results)
+                    typer.echo(f"[ok] {outcome.item.input_path} -> {rendered_paths}")
+                    item_timings = outcome.results[0].timings
+                    if item_timings is not None:
+                        typer.echo(f"     timings: {item_timings.format()}")
+                        stage_totals.merge(item_timings)
+                else:
+                    report_failure(outcome.item.input_path, outcome.error)
+
+            if processed + failed == 0:
+                raise ImgshError("No supported images found in the input directory.")
+            typer.echo(f"Pipeline complete. Processed: {processed}, Failed: {failed}")
+            if timings and stage_totals.stages:
+                typer.echo(f"Stage totals: {stage_totals.format()}")
+            if failed:
+                raise typer.Exit(code=1)
+        except ImgshError as error:
+            exit_with_error(error)
@@ -5,12 +5,37 @@ from typing import Annotated
 
 import typer
 
-from imgsh.cli import exit_with_error
-from imgsh.config import DEFAULT_FIT, DEFAULT_OCR_ENGINE, DEFAULT_OCR_FORMAT, DEFAULT_QUALITY
+from imgsh.cli import (
+    OcrCacheDirOption,
+    OcrCacheOption,
+    OcrCacheSizeOption,
+    describe_output,
+    exit_with_error,
+)
+from imgsh.config import (
+    DEFAULT_FIT,
+    DEFAULT_OCR_ENGINE,
+    DEFAULT_OCR_CACHE_SIZE_MB,
+    DEFAULT_OCR_FORMAT,
+    DEFAULT_QUALITY,
+    DEFAULT_RESAMPLE,
+)
 from imgsh.core.errors import ImgshError
-from imgsh.core.processor import ImageProcessor
+from imgsh.core.ocr_cache import open_ocr_cache
 from imgsh.utils.file_utils import ensure_input_file
-from imgsh.utils.validation import validate_ocr_options, validate_quality, validate_resize_dimensions
+from imgsh.utils.validation import (
+    parse_formats,
+    parse_memory_budget,
+    parse_output_size_limit,
+    parse_sizes,
+    validate_ocr_options,
+    validate_positive,
+    validate_quality,
+    validate_rendition_options,
+    validate_resample,
+    validate_resize_dimensions,
+    validate_target_ssim,
+)
 
 
 def register(app: typer.Typer) -> None:
@@ -31,8 +56,12 @@ def register(app: typer.Typer) -> None:
             Path | None, typer.Option("--out", help="Output file path (or output directory).")
         ] = None,
         quality: Annotated[
-            int, typer.Option("--quality", help="JPEG/WebP quality (1-100).")
-        ] = DEFAULT_QUALITY,
+            int | None,
+            typer.Option(
+                "--quality",
+                help=f"JPEG/WebP quality (1-100, default {DEFAULT_QUALITY}). Forces a re-encode.",
+            ),
+        ] = None,
         output_format: Annotated[
             str | None, typer.Option("--format", help="Output format: jpg, png, webp.")
         ] = None,
@@ -46,11 +75,18 @@ def register(app: typer.Typer) -> None:
             bool,
             typer.Option("--overwrite/--no-overwrite", help="Allow replacing existing output files."),
         ] = False,
+        hardlink: Annotated[
+            bool,
+            typer.Option(
+                "--hardlink",
+                help="Hardlink outputs identical to their input instead of copying them.",
+            ),
+        ] = False,
         ocr: Annotated[
             bool, typer.Option("--ocr", help="Run OCR and write sidecar output.")
         ] = False,
         ocr_engine: Annotated[
-            str, typer.Option("--engine", help="OCR engine. Only 'textract' is supported in v1.")
+            str, typer.Option("--engine", help="OCR engine: textract or tesserocr (in-process).")
         ] = DEFAULT_OCR_ENGINE,
         ocr_out: Annotated[
             Path | None, typer.Option("--ocr-out", help="OCR output path.")
@@ -59,15 +95,155 @@ def register(app: typer.Typer) -> None:
             str, typer.Option("--ocr-format", help="OCR output format: txt or json.")
         ] = DEFAULT_OCR_FORMAT,
         lang: Annotated[str, typer.Option("--lang", help="OCR language hint (default: en).")] = "en",
+        ocr_cache_enabled: OcrCacheOption = None,
+        ocr_cache_dir: OcrCacheDirOption = None,
+        ocr_cache_size: OcrCacheSizeOption = DEFAULT_OCR_CACHE_SIZE_MB,
+        timings: Annotated[
+            bool,
+            typer.Option("--timings", help="Print per-stage wall/CPU time and pixel/byte counts."),
+        ] = False,
+        low_memory: Annotated[
+            bool,
+            typer.Option(
+                "--low-memory",
+                help="Resample in strips and orient only the output, for very large images.",
+            ),
+        ] = False,
+        max_megapixels: Annotated[
+            float | None,
+            typer.Option(
+                "--max-megapixels",
+                help="Fail images that would decode to more megapixels (replaces Pillow's limit).",
+            ),
+        ] = None,
+        max_memory_mb: Annotated[
+            int | None,
+            typer.Option(
+                "--max-memory-mb",
+                help="Fail images estimated to need more memory than this per image.",
+            ),
+        ] = None,
+        sizes_value: Annotated[
+            str | None,
+            typer.Option(
+                "--sizes",
+                help="Comma-separated widths to render from one decode, e.g. 320,640,1280.",
+            ),
+        ] = None,
+        formats_value: Annotated[
+            str | None,
+            typer.Option("--formats", help="Comma-separated formats for --sizes, e.g. webp,jpg."),
+        ] = None,
+        draft: Annotated[
+            bool,
+            typer.Option(
+                "--draft/--no-draft",
+                help="Decode JPEGs at 1/2, 1/4 or 1/8 scale when the output is much smaller.",
+            ),
+        ] = True,
+        resample: Annotated[
+            str,
+            typer.Option(
+                "--resample",
+                help="Resampling filter: auto, nearest, box, bilinear, bicubic, lanczos.",
+            ),
+        ] = DEFAULT_RESAMPLE,
+        reducing_gap: Annotated[
+            float | None,
+            typer.Option(
+                "--reducing-gap",
+                help="Pre-reduce by an integer factor first; >= 2.0 is fast and near-lossless.",
+            ),
+        ] = None,
+        max_output_bytes_value: Annotated[
+            int | None,
+            typer.Option(
+                "--max-bytes",
+                help="Largest output size in bytes: JPEG/WebP quality is lowered until it fits.",
+            ),
+        ] = None,
+        max_output_kb: Annotated[
+            int | None, typer.Option("--max-kb", help="Largest output size in KiB (1024 bytes).")
+        ] = None,
+        target_ssim: Annotated[
+            float | None,
+            typer.Option(
+                "--target-ssim",
+                help="Pick the lowest JPEG/WebP quality reaching this SSIM (0-1, needs NumPy).",
+            ),
+        ] = None,
+        search_jobs: Annotated[
+            int,
+            typer.Option(
+                "--search-jobs",
+                help="Candidate qualities encoded at once for --max-bytes/--max-kb/--target-ssim.",
+            ),
+        ] = 1,
     ) -> None:
+        from imgsh.core.processor import ImageProcessor
+
         try:
             ensure_input_file(input_path)
             validate_resize_dimensions(width=width, height=height, fit=fit)
             validate_quality(quality)
+            validate_resample(resample, reducing_gap)
+            sizes = parse_sizes(sizes_value)
+            formats = parse_formats(formats_value)
+            validate_rendition_options(
+                sizes=sizes, formats=formats, width=width, height=height, fit=fit
+            )
+            validate_positive("--ocr-cache-size", ocr_cache_size)
+            max_pixels, max_bytes = parse_memory_budget(max_megapixels, max_memory_mb)
+            max_output_bytes = parse_output_size_limit(
+                max_output_bytes_value,
+                max_output_kb,
+                [output_format] if output_format else formats,
+            )
+            validate_target_ssim(target_ssim, [output_format] if output_format else formats)
+            validate_positive("--search-jobs", search_jobs)
             if ocr:
                 validate_ocr_options(engine=ocr_engine, output_format=ocr_format)
+            ocr_cache = (
+                open_ocr_cache(ocr_cache_enabled, ocr_cache_dir, ocr_cache_size) if ocr else None
+            )
 
             processor = ImageProcessor()
+            if sizes:
+                results = processor.renditions(
+                    input_path=input_path,
+                    out=out,
+                    sizes=sizes,
+                    formats=formats or ([output_format] if output_format else None),
+                    quality=quality,
+                    preserve_exif=preserve_exif,
+                    overwrite=overwrite,
+                    ocr=ocr,
+                    ocr_engine=ocr_engine,
+                    ocr_out=ocr_out,
+                    ocr_format=ocr_format,
+                    lang=lang,
+                    ocr_cache=ocr_cache,
+                    draft=draft,
+                    resample=resample,
+                    reducing_gap=reducing_gap,
+                    timings=timings,
+                    low_memory=low_memory,
+                    max_pixels=max_pixels,
+                    max_bytes=max_bytes,
+                    max_output_bytes=max_output_bytes,
+                    target_ssim=target_ssim,
+                    search_jobs=search_jobs,
+                )
+                for rendition in results:
+                    typer.echo(f"Saved image: {describe_output(rendition)}")
+                    if rendition.ocr_path:
+                        typer.echo(f"Saved OCR: {rendition.ocr_path}")
+                if results[0].timings is not None:
+                    typer.echo(f"Timings: {results[0].timings.format()}")
+                if ocr_cache is not None:
+                    typer.echo(ocr_cache.summary())
+                return
+
             result = processor.resize(
                 input_path=input_path,
                 out=out,
@@ -84,9 +260,25 @@ def register(app: typer.Typer) -> None:
                 ocr_out=ocr_out,
                 ocr_format=ocr_format,
                 lang=lang,
+                ocr_cache=ocr_cache,
+                draft=draft,
+                resample=resample,
+                reducing_gap=reducing_gap,
+                timings=timings,
+                low_memory=low_memory,
+                max_pixels=max_pixels,
+                max_bytes=max_bytes,
+                hardlink=hardlink,
+                max_output_bytes=max_output_bytes,
+                target_ssim=target_ssim,
+                search_jobs=search_jobs,
             )
-            typer.echo(f"Saved image: {result.output_path}")
+            typer.echo(f"Saved image: {describe_output(result)}")
             if result.ocr_path:
                 typer.echo(f"Saved OCR: {result.ocr_path}")
+                if ocr_cache is not None:
+                    typer.echo(ocr_cache.summary())
+            if result.timings is not None:
+                typer.echo(f"Timings: {result.timings.format()}")
         except ImgshError as error:
             exit_with_error(error)
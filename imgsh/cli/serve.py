@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import signal
+import threading
+from typing import Annotated
+
+import typer
+
+from imgsh.cli import exit_with_error
+from imgsh.config import (
+    DEFAULT_SERVE_CACHE_MB,
+    DEFAULT_SERVE_HOST,
+    DEFAULT_SERVE_MAX_UPLOAD_MB,
+    DEFAULT_SERVE_PORT,
+)
+from imgsh.core.errors import ImgshError
+from imgsh.utils.validation import (
+    parse_memory_budget,
+    validate_non_negative,
+    validate_positive,
+)
+
+
+def register(app: typer.Typer) -> None:
+    @app.command("serve")
+    def serve_command(
+        host: Annotated[
+            str, typer.Option("--host", help="Address to listen on (default: localhost only).")
+        ] = DEFAULT_SERVE_HOST,
+        port: Annotated[int, typer.Option("--port", help="TCP port to listen on.")] = DEFAULT_SERVE_PORT,
+        jobs: Annotated[
+            int | None,
+            typer.Option("--jobs", "-j", help="Worker processes (default: CPU count)."),
+        ] = None,
+        max_pending: Annotated[
+            int | None,
+            typer.Option(
+                "--max-pending",
+                help="Requests admitted at once; more get HTTP 503 (default: 4 per worker).",
+            ),
+        ] = None,
+        cache_mb: Annotated[
+            int,
+            typer.Option("--cache-mb", help="LRU cache for rendered outputs, in MB (0 disables)."),
+        ] = DEFAULT_SERVE_CACHE_MB,
+        source_cache_mb: Annotated[
+            int,
+            typer.Option(
+                "--source-cache-mb",
+                help="LRU cache for uploaded sources, reusable with source=<digest> (0 disables).",
+            ),
+        ] = DEFAULT_SERVE_CACHE_MB,
+        max_upload_mb: Annotated[
+            int,
+            typer.Option("--max-upload-mb", help="Largest accepted upload in MB (HTTP 413 above)."),
+        ] = DEFAULT_SERVE_MAX_UPLOAD_MB,
+        max_megapixels: Annotated[
+            float | None,
+            typer.Option(
+                "--max-megapixels",
+                help="Fail images that would decode to more megapixels (replaces Pillow's limit).",
+            ),
+        ] = None,
+        max_memory_mb: Annotated[
+            int | None,
+            typer.Option(
+                "--max-memory-mb",
+                help="Fail images estimated to need more memory than this per image.",
+            ),
+        ] = None,
+        verbose: Annotated[
+            bool, typer.Option("--verbose", help="Log every request to stderr.")
+        ] = False,
+    ) -> None:
+        """Serve POST /render over HTTP from warm worker processes."""
+        from imgsh.core.batch_engine import default_jobs
+        from imgsh.core.memory import BYTES_PER_MB
+        from imgsh.core.serve_engine import ResizeService, ServiceServer
+
+        try:
+            validate_positive("--jobs", jobs)
+            validate_positive("--max-pending", max_pending)
+            validate_non_negative("--cache-mb", cache_mb)
+            validate_non_negative("--source-cache-mb", source_cache_mb)
+            validate_positive("--max-upload-mb", max_upload_mb)
+            max_pixels, max_bytes = parse_memory_budget(max_megapixels, max_memory_mb)
+
+            service = ResizeService(
+                jobs=jobs or default_jobs(),
+                max_pending=max_pending,
+                source_cache_bytes=source_cache_mb * BYTES_PER_MB,
+                output_cache_bytes=cache_mb * BYTES_PER_MB,
+                max_pixels=max_pixels,
+                max_bytes=max_bytes,
+            )
+            try:
+                try:
+                    server = ServiceServer(
+                        (host, port),
+                        service,
+                        max_upload_bytes=max_upload_mb * BYTES_PER_MB,
+                        verbose=verbose,
+                    )
+                except OSError as exc:
+                    raise ImgshError(f"Could not listen on {host}:{port}: {exc}") from exc
+                bound_host, bound_port = server.server_address[:2]
+                typer.echo(
+                    f"Serving on http://{bound_host}:{bound_port} "
+                    f"({service.jobs} workers). Press Ctrl-C to stop."
+                )
+                # shutdown() blocks until serve_forever returns, so call it off the main thread.
+                previous_handler = signal.signal(
+                    signal.SIGTERM,
+                    lambda *_: threading.Thread(target=server.shutdown).start(),
+                )
+                try:
+                    server.serve_forever()
+                except KeyboardInterrupt:
+                    pass
+                finally:
+                    signal.signal(signal.SIGTERM, previous_handler)
+                    server.server_close()
+            finally:
+                service.close()
+            typer.echo("Server stopped.")
+        except ImgshError as error:
+            exit_with_error(error)
@@ -0,0 +1,243 @@
+from __future__ import annotations
+
+import signal
+import threading
+from pathlib import Path
+from typing import Annotated
+
+import typer
+
+from imgsh.cli import exit_with_error
+from imgsh.cli.batch import render_name_pattern
+from imgsh.config import (
+    DEFAULT_FIT,
+    DEFAULT_OCR_ENGINE,
+    DEFAULT_OCR_FORMAT,
+    DEFAULT_QUALITY,
+    DEFAULT_RESAMPLE,
+    DEFAULT_WATCH_POLL_INTERVAL,
+    DEFAULT_WATCH_SETTLE_SECONDS,
+)
+from imgsh.core.errors import ImgshError
+from imgsh.core.format_engine import resolve_output_format
+from imgsh.core.manifest import MANIFEST_FILENAME, BatchManifest, options_fingerprint
+from imgsh.utils.file_utils import ensure_input_dir
+from imgsh.utils.validation import (
+    validate_positive,
+    validate_quality,
+    validate_resample,
+    validate_resize_dimensions,
+)
+
+
+def register(app: typer.Typer) -> None:
+    @app.command("watch")
+    def watch_command(
+        input_dir: Annotated[Path, typer.Argument(help="Hot folder to watch for images.")],
+        out: Annotated[Path, typer.Option("--out", help="Output directory (required).")],
+        width: Annotated[int | None, typer.Option("--width", help="Target width in pixels.")] = None,
+        height: Annotated[
+            int | None, typer.Option("--height", help="Target height in pixels.")
+        ] = None,
+        keep_aspect: Annotated[
+            bool, typer.Option("--keep-aspect/--no-keep-aspect", help="Maintain aspect ratio.")
+        ] = True,
+        fit: Annotated[
+            str, typer.Option("--fit", help="Resize mode: contain, cover, exact.")
+        ] = DEFAULT_FIT,
+        recursive: Annotated[
+            bool, typer.Option("--recursive/--no-recursive", help="Watch subdirectories.")
+        ] = False,
+        name_pattern: Annotated[
+            str,
+            typer.Option(
+                "--name-pattern",
+                help="Filename pattern (without extension). Supports {stem},{ext},{width},{height}.",
+            ),
+        ] = "{stem}_imgsh",
+        quality: Annotated[
+            int | None,
+            typer.Option(
+                "--quality",
+                help=f"JPEG/WebP quality (1-100, default {DEFAULT_QUALITY}). Forces a re-encode.",
+            ),
+        ] = None,
+        output_format: Annotated[
+            str | None, typer.Option("--format", help="Output format: jpg, png, webp.")
+        ] = None,
+        preserve_exif: Annotated[
+            bool,
+            typer.Option(
+                "--preserve-exif/--strip-exif", help="Preserve source metadata (EXIF)."
+            ),
+        ] = True,
+        overwrite: Annotated[
+            bool,
+            typer.Option("--overwrite/--no-overwrite", help="Allow replacing existing output files."),
+        ] = False,
+        hardlink: Annotated[
+            bool,
+            typer.Option(
+                "--hardlink",
+                help="Hardlink outputs identical to their input instead of copying them.",
+            ),
+        ] = False,
+        jobs: Annotated[
+            int | None,
+            typer.Option("--jobs", "-j", help="Parallel workers (default: CPU count)."),
+        ] = None,
+        settle: Annotated[
+            float,
+            typer.Option(
+                "--settle",
+                help="Seconds a file must stay unchanged before it is processed.",
+            ),
+        ] = DEFAULT_WATCH_SETTLE_SECONDS,
+        poll_interval: Annotated[
+            float,
+            typer.Option(
+                "--poll-interval",
+                help="Seconds between directory scans when inotify is not available.",
+            ),
+        ] = DEFAULT_WATCH_POLL_INTERVAL,
+        polling: Annotated[
+            bool,
+            typer.Option(
+                "--polling",
+                help="Scan for changes instead of using inotify (e.g. for network filesystems).",
+            ),
+        ] = False,
+        content_hash: Annotated[
+            bool,
+            typer.Option(
+                "--hash",
+                help="Also compare content hashes, so touched but unchanged files are skipped.",
+            ),
+        ] = False,
+        draft: Annotated[
+            bool,
+            typer.Option(
+                "--draft/--no-draft",
+                help="Decode JPEGs at 1/2, 1/4 or 1/8 scale when the output is much smaller.",
+            ),
+        ] = True,
+        resample: Annotated[
+            str,
+            typer.Option(
+                "--resample",
+                help="Resampling filter: auto, nearest, box, bilinear, bicubic, lanczos.",
+            ),
+        ] = DEFAULT_RESAMPLE,
+        reducing_gap: Annotated[
+            float | None,
+            typer.Option(
+                "--reducing-gap",
+                help="Pre-reduce by an integer factor first; >= 2.0 is fast and near-lossless.",
+            ),
+        ] = None,
+    ) -> None:
+        """Process new and changed images in a folder as they arrive."""
+        from imgsh.core.batch_engine import BatchOutcome, default_jobs
+        from imgsh.core.watch_engine import watch_folder
+
+        try:
+            ensure_input_dir(input_dir)
+            validate_resize_dimensions(width=width, height=height, fit=fit)
+            validate_quality(quality)
+            validate_resample(resample, reducing_gap)
+            validate_positive("--jobs", jobs)
+            if settle < 0 or poll_interval <= 0:
+                raise ImgshError("--settle must be >= 0 and --poll-interval > 0.")
+            if "{index}" in name_pattern:
+                raise ImgshError("--name-pattern cannot use {index} in watch mode.")
+            if output_format is not None:
+                resolve_output_format(output_format, None, input_dir)
+            render_name_pattern(name_pattern, "stem", ".jpg", width, height, index=0)
+
+            # Same keys and defaults as batch-resize, so `batch-resize --incremental` and
+            # `watch` with matching settings share the manifest in --out.
+            options = {
+                "width": width,
+                "height": height,
+                "keep_aspect": keep_aspect,
+                "fit": fit,
+                "output_format": output_format,
+                "quality": quality,
+                "preserve_exif": preserve_exif,
+                "overwrite": overwrite,
+                "ocr": False,
+                "ocr_engine": DEFAULT_OCR_ENGINE,
+                "ocr_out": None,
+                "ocr_format": DEFAULT_OCR_FORMAT,
+                "lang": "en",
+                "draft": draft,
+                "resample": resample,
+                "reducing_gap": reducing_gap,
+                "timings": False,
+                "low_memory": False,
+                "max_pixels": None,
+                "max_bytes": None,
+                "hardlink": hardlink,
+            }
+
+            def output_paths(input_path: Path) -> tuple[Path, list[Path]]:
+                _, extension = resolve_output_format(output_format, None, input_path)
+                stem = render_name_pattern(
+                    name_pattern, input_path.stem, extension, width, height, index=0
+                )
+                target_dir = out / input_path.relative_to(input_dir).parent
+                output_path = target_dir / f"{stem}{extension}"
+                return output_path, [output_path]
+
+            counts = {"processed": 0, "failed": 0, "skipped": 0}
+
+            def on_outcome(outcome: BatchOutcome) -> None:
+                if outcome.error is None:
+                    counts["processed"] += 1
+                    rendered_paths = ", ".join(str(result.output_path) for result in outcome.results)
+                    typer.echo(f"[ok] {outcome.item.input_path} -> {rendered_paths}")
+                else:
+                    counts["failed"] += 1
+                    typer.secho(
+                        f"[fail] {outcome.item.input_path}: {outcome.error}",
+                        fg=typer.colors.YELLOW,
+                        err=True,
+                    )
+
+            def on_skip(input_path: Path) -> None:
+                counts["skipped"] += 1
+
+            manifest = BatchManifest(path=out / MANIFEST_FILENAME, use_hash=content_hash)
+            stop = threading.Event()
+            previous_handlers = {
+                signum: signal.signal(signum, lambda *_: stop.set())
+                for signum in (signal.SIGINT, signal.SIGTERM)
+            }
+            typer.echo(f"Watching {input_dir} -> {out}. Press Ctrl-C to stop.")
+            try:
+                watch_folder(
+                    input_dir,
+                    output_paths=output_paths,
+                    on_outcome=on_outcome,
+                    options=options,
+                    stop=stop,
+                    recursive=recursive,
+                    jobs=jobs or default_jobs(),
+                    settle=settle,
+                    poll_interval=poll_interval,
+                    polling=polling,
+                    manifest=manifest,
+                    fingerprint=options_fingerprint(options),
+                    exclude=[out],
+                    on_skip=on_skip,
+                )
+            finally:
+                for signum, handler in previous_handlers.items():
+                    signal.signal(signum, handler)
+                manifest.close()
+            typer.echo(
+                f"Watch stopped. Processed: {counts['processed']}, Failed: {counts['failed']}, "
+                f"Skipped: {counts['skipped']}"
+            )
+        except ImgshError as error:
+            exit_with_error(error)
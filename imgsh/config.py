@@ -2,8 +2,17 @@ from __future__ import annotations
 
 DEFAULT_QUALITY = 90
 DEFAULT_FIT = "contain"
+DEFAULT_RESAMPLE = "lanczos"
 DEFAULT_OCR_ENGINE = "textract"
 DEFAULT_OCR_FORMAT = "txt"
+DEFAULT_OCR_CACHE_SIZE_MB = 256
+DEFAULT_BATCH_EXECUTOR = "process"
+DEFAULT_WATCH_SETTLE_SECONDS = 2.0
+DEFAULT_WATCH_POLL_INTERVAL = 1.0
+DEFAULT_SERVE_HOST = "127.0.0.1"
+DEFAULT_SERVE_PORT = 8765
+DEFAULT_SERVE_CACHE_MB = 128
+DEFAULT_SERVE_MAX_UPLOAD_MB = 50
 
 SUPPORTED_FORMATS = {
     "jpg": "JPEG",
@@ -25,6 +34,27 @@ SUPPORTED_EXTENSIONS = {
     ".webp",
 }
 
+LOSSY_FORMATS = {"JPEG", "WEBP"}
 FIT_MODES = {"contain", "cover", "exact"}
-OCR_ENGINES = {"textract"}
+RESAMPLE_MODES = {"auto", "nearest", "box", "bilinear", "bicubic", "lanczos"}
 OCR_FORMATS = {"txt", "json"}
+BATCH_EXECUTORS = {"process", "thread"}
+
+# --target-ssim scores candidates on luma downsampled to at most SSIM_MAX_SIDE pixels per
+# side, over SSIM_WINDOW x SSIM_WINDOW windows; a candidate within SSIM_TOLERANCE above
+# the target ends the search.
+SSIM_MAX_SIDE = 512
+SSIM_WINDOW = 8
+SSIM_TOLERANCE = 0.002
+
+BENCH_SEED = 1234
+BENCH_RESOLUTIONS = [(640, 480), (1920, 1080), (4032, 3024)]
+BENCH_FORMATS = ["jpg", "png", "webp"]
+BENCH_SCENARIOS = [
+    "resize-contain",
+    "resize-cover",
+    "resize-exact",
+    "crop",
+    "convert",
+    "batch-resize",
+]
@@ -0,0 +1,669 @@
+from __future__ import annotations
+
+import io
+import os
+import queue
+import signal
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field, replace
+from multiprocessing import Pool
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator
+
+from PIL import Image
+
+from imgsh.config import DEFAULT_RESAMPLE
+from imgsh.core.encode_engine import save_output
+from imgsh.core.errors import ImgshError
+from imgsh.core.manifest import file_sha256
+from imgsh.core.memory import check_budget, open_image
+from imgsh.core.metadata import auto_orient, get_exif_bytes, oriented_size
+from imgsh.core.ocr_cache import OcrCache
+from imgsh.core.processor import (
+    ImageProcessor,
+    ProcessResult,
+    is_identity_resize,
+    is_passthrough,
+    prepare_output,
+    rendition_targets,
+)
+from imgsh.core.resize_engine import apply_draft, target_size
+from imgsh.core.timing import NULL_TIMER, Timer, make_timer
+from imgsh.utils.file_utils import clone_file
+
+# Submitted-but-unfinished tasks allowed per worker; keeps memory flat on huge batches.
+PENDING_TASKS_PER_JOB = 4
+# Inputs the --dedupe hashing thread may run ahead of the workers.
+HASH_AHEAD_ITEMS = 64
+
+
+@dataclass
+class BatchItem:
+    index: int
+    input_path: Path
+    # Output file; with --sizes, the directory plus name stem the renditions share.
+    output_path: Path
+    # Replace an existing output even without --overwrite (e.g. stale incremental output).
+    overwrite: bool = False
+
+
+@dataclass
+class BatchOutcome:
+    item: BatchItem
+    results: list[ProcessResult] = field(default_factory=list)
+    error: str | None = None
+    # Wall-clock seconds spent on this item, including OCR when it ran.
+    elapsed: float = 0.0
+    # Set when the outputs were cloned from this earlier input with the same content.
+    duplicate_of: Path | None = None
+
+
+@dataclass
+class _PipelineJob:
+    item: BatchItem
+    # (rendition key, pillow format, output path); key 0 for a plain resize.
+    targets: list[tuple[int, str, Path]] = field(default_factory=list)
+    data: bytes | None = None
+    image: Image.Image | None = None
+    crop_box: tuple[int, int, int, int] | None = None
+    rendered: dict[int, Image.Image] = field(default_factory=dict)
+    exif_bytes: bytes | None = None
+    results: list[ProcessResult] = field(default_factory=list)
+    error: str | None = None
+    fatal: BaseException | None = None
+    source_size: tuple[int, int] | None = None
+    started: float = 0.0
+    timer: Timer = NULL_TIMER
+    # The output is a byte copy of the input; transform and encode have nothing to do.
+    copied: bool = False
+
+
+_STOP = object()
+
+
+def default_jobs() -> int:
+    return os.cpu_count() or 1
+
+
+def init_worker_signals() -> None:
+    """
+    Pool initializer for long-running commands: Ctrl-C is handled by the parent, which
+    lets in-flight work finish, and SIGTERM drops any handler inherited from it.
+    """
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+
+
+def process_item(item: BatchItem, options: dict[str, Any]) -> BatchOutcome:
+    if item.overwrite:
+        options = {**options, "overwrite": True}
+    processor = ImageProcessor()
+    started = time.perf_counter()
+    try:
+        if options.get("sizes"):
+            # Batch options always carry hardlink, but renditions re-encode and never copy the source.
+            rendition_options = {key: value for key, value in options.items() if key != "hardlink"}
+            results = processor.renditions(
+                input_path=item.input_path,
+                out=item.output_path.parent,
+                stem=item.output_path.name,
+                **rendition_options,
+            )
+        else:
+            results = [processor.resize(input_path=item.input_path, out=item.output_path, **options)]
+    except ImgshError as error:
+        return BatchOutcome(item=item, error=str(error), elapsed=time.perf_counter() - started)
+    return BatchOutcome(item=item, results=results, elapsed=time.perf_counter() - started)
+
+
+def item_targets(
+    item: BatchItem, options: dict[str, Any], overwrite: bool
+) -> list[tuple[int, str, Path]]:
+    """(rendition width or 0, pillow format, output path) for every file item produces."""
+    if options.get("sizes"):
+        return rendition_targets(
+            input_path=item.input_path,
+            out=item.output_path.parent,
+            sizes=options["sizes"],
+            formats=options.get("formats"),
+            overwrite=overwrite,
+            stem=item.output_path.name,
+        )
+    pillow_format, output_path = prepare_output(
+        input_path=item.input_path,
+        out=item.output_path,
+        output_format=options.get("output_format"),
+        overwrite=overwrite,
+        default_suffix="_imgsh",
+    )
+    return [(0, pillow_format, output_path)]
+
+
+def _next_outcome(completed: queue.SimpleQueue) -> BatchOutcome:
+    value = completed.get()
+    if isinstance(value, BaseException):
+        raise value
+    return value
+
+
+def run_batch(
+    items: Iterable[BatchItem],
+    options: dict[str, Any],
+    jobs: int = 1,
+    max_tasks_per_child: int | None = None,
+    worker: Callable[[BatchItem, dict[str, Any]], BatchOutcome] = process_item,
+) -> Iterator[BatchOutcome]:
+    """
+    Run worker (by default a resize with ImageProcessor.resize) on every item and
+    yield outcomes as they complete. worker must be a picklable module-level function.
+    With jobs > 1, items are fanned out to a process pool and may finish out of order;
+    output paths are fixed on the item beforehand so naming stays deterministic.
+    """
+    if jobs <= 1:
+        for item in items:
+            yield worker(item, options)
+        return
+
+    # multiprocessing.Pool rather than ProcessPoolExecutor: the executor's
+    # max_tasks_per_child can deadlock on Python 3.11 when workers are replaced.
+    pool = Pool(processes=jobs, maxtasksperchild=max_tasks_per_child)
+    completed: queue.SimpleQueue = queue.SimpleQueue()
+    max_pending = jobs * PENDING_TASKS_PER_JOB
+    pending = 0
+    try:
+        for item in items:
+            if pending >= max_pending:
+                yield _next_outcome(completed)
+                pending -= 1
+            pool.apply_async(
+                worker,
+                (item, options),
+                callback=completed.put,
+                error_callback=completed.put,
+            )
+            pending += 1
+
+        while pending:
+            yield _next_outcome(completed)
+            pending -= 1
+        pool.close()
+        pool.join()
+    finally:
+        pool.terminate()
+
+
+class _ThreadedPipeline:
+    """
+    Streaming batch engine: read -> decode -> transform -> encode, one stage per
+    thread group, linked by bounded queues. Pillow releases the GIL while decoding,
+    resampling and encoding, so stages overlap disk I/O with CPU work, and the
+    queue bounds cap how many images are held in memory at once.
+    """
+
+    def __init__(self, options: dict[str, Any], jobs: int) -> None:
+        self.options = options
+        self.jobs = jobs
+        self.processor = ImageProcessor()
+        self.cancelled = threading.Event()
+        self.feed_error: BaseException | None = None
+
+    def _overwrite(self, job: _PipelineJob) -> bool:
+        return job.item.overwrite or self.options.get("overwrite", False)
+
+    def read(self, job: _PipelineJob) -> None:
+        job.started = time.perf_counter()
+        job.timer = make_timer(self.options.get("timings", False))
+        with job.timer.stage("read"):
+            job.data = job.item.input_path.read_bytes()
+
+    def decode(self, job: _PipelineJob) -> None:
+        item = job.item
+        job.targets = item_targets(item, self.options, overwrite=self._overwrite(job))
+        options = self.options
+        job.crop_box = options.get("crop_box")
+        timer = job.timer
+        sizes = options.get("sizes")
+        width = max(sizes) if sizes else options.get("width")
+        height = None if sizes else options.get("height")
+        keep_aspect = True if sizes else options.get("keep_aspect", True)
+        fit = "contain" if sizes else options["fit"]
+        max_pixels = options.get("max_pixels")
+        max_bytes = options.get("max_bytes")
+        budgeted = max_pixels is not None or max_bytes is not None
+        with timer.stage("open"):
+            source_image = open_image(
+                io.BytesIO(job.data), budgeted=budgeted, name=item.input_path
+            )
+        with source_image:
+            timer.record_input(item.input_path, source_image.size)
+            job.source_size = oriented_size(source_image)
+            _, pillow_format, output_path = job.targets[0]
+            if (
+                not sizes
+                and is_identity_resize(source_image, width, height, keep_aspect, fit, job.crop_box)
+                and is_passthrough(
+                    source_image,
+                    pillow_format,
+                    options.get("quality"),
+                    options.get("preserve_exif", True),
+                    options.get("max_output_bytes"),
+                    source_bytes=len(job.data),
+                    target_ssim=options.get("target_ssim"),
+                )
+            ):
+                with timer.stage("copy"):
+                    clone_file(
+                        item.input_path, output_path, hardlink=options.get("hardlink", False)
+                    )
+                timer.record_output(output_path, job.source_size)
+                job.results.append(
+                    ProcessResult(
+                        output_path=output_path, size=job.source_size, source_size=job.source_size
+                    )
+                )
+                job.copied = True
+                job.data = None
+                return
+            if options.get("draft", True):
+                job.crop_box = apply_draft(
+                    image=source_image,
+                    width=width,
+                    height=height,
+                    keep_aspect=keep_aspect,
+                    fit=fit,
+                    crop_box=job.crop_box,
+                )
+            if budgeted:
+                region = (
+                    (job.crop_box[2], job.crop_box[3])
+                    if job.crop_box
+                    else oriented_size(source_image)
+                )
+                check_budget(
+                    source_image,
+                    output_size=target_size(region, width, height, keep_aspect, fit),
+                    max_pixels=max_pixels,
+                    max_bytes=max_bytes,
+                    name=item.input_path,
+                )
+            with timer.stage("decode"):
+                source_image.load()
+            if options.get("preserve_exif", True):
+                job.exif_bytes = get_exif_bytes(source_image)
+            with timer.stage("orient"):
+                oriented = auto_orient(source_image)
+        job.data = None
+        job.image = oriented
+
+    def transform(self, job: _PipelineJob) -> None:
+        if job.copied:
+            return
+        if self.options.get("sizes"):
+            job.rendered = self.processor.render_renditions(
+                image=job.image,
+                sizes=self.options["sizes"],
+                crop_box=job.crop_box,
+                resample=self.options.get("resample", DEFAULT_RESAMPLE),
+                reducing_gap=self.options.get("reducing_gap"),
+                timer=job.timer,
+            )
+        else:
+            job.rendered = {
+                0: self.processor.render(
+                    image=job.image,
+                    width=self.options.get("width"),
+                    height=self.options.get("height"),
+                    keep_aspect=self.options.get("keep_aspect", True),
+                    fit=self.options["fit"],
+                    crop_box=job.crop_box,
+                    resample=self.options.get("resample", DEFAULT_RESAMPLE),
+                    reducing_gap=self.options.get("reducing_gap"),
+                    timer=job.timer,
+                )
+            }
+        job.image = None
+
+    def encode(self, job: _PipelineJob) -> None:
+        options = self.options
+        largest = None
+        if not job.copied:
+            for key, pillow_format, output_path in job.targets:
+                with job.timer.stage("encode"):
+                    chosen_quality = save_output(
+                        image=job.rendered[key],
+                        output_path=output_path,
+                        pillow_format=pillow_format,
+                        quality=options["quality"],
+                        exif_bytes=job.exif_bytes,
+                        max_output_bytes=options.get("max_output_bytes"),
+                        target_ssim=options.get("target_ssim"),
+                    )
+                job.timer.record_output(output_path, job.rendered[key].size)
+                job.results.append(
+                    ProcessResult(
+                        output_path=output_path,
+                        size=job.rendered[key].size,
+                        source_size=job.source_size,
+                        quality=chosen_quality,
+                    )
+                )
+            largest = job.rendered[job.targets[0][0]]
+            job.rendered = {}
+
+        if options.get("ocr"):
+            job.results[0].ocr_path = self.processor.extract_text(
+                input_path=job.results[0].output_path,
+                out=options.get("ocr_out"),
+                engine=options["ocr_engine"],
+                output_format=options["ocr_format"],
+                lang=options.get("lang", "en"),
+                overwrite=self._overwrite(job),
+                image=largest,
+                timer=job.timer,
+            )
+        if options.get("keep_image"):
+            job.results[0].image = largest
+        if job.timer.enabled:
+            job.results[0].timings = job.timer
+
+    def _run_stage(
+        self,
+        func: Callable[[_PipelineJob], None],
+        inbox: queue.Queue,
+        outbox: queue.Queue,
+        remaining: list[int],
+        lock: threading.Lock,
+    ) -> None:
+        while True:
+            job = inbox.get()
+            if job is _STOP:
+                # Let sibling threads of this stage see the stop marker too.
+                inbox.put(_STOP)
+                with lock:
+                    remaining[0] -= 1
+                    last = remaining[0] == 0
+                if last:
+                    outbox.put(_STOP)
+                return
+            if job.error is None and job.fatal is None and not self.cancelled.is_set():
+                try:
+                    func(job)
+                except ImgshError as error:
+                    job.error = str(error)
+                except BaseException as exc:  # surfaced to the caller like the sequential path
+                    job.fatal = exc
+                if job.error is not None or job.fatal is not None:
+                    job.data = None
+                    job.image = None
+                    job.rendered = {}
+            outbox.put(job)
+
+    def _feed(self, items: Iterable[BatchItem], inbox: queue.Queue) -> None:
+        try:
+            for item in items:
+                if self.cancelled.is_set():
+                    break
+                inbox.put(_PipelineJob(item=item))
+        except BaseException as exc:  # re-raised by run() once the pipeline drains
+            self.feed_error = exc
+        finally:
+            inbox.put(_STOP)
+
+    def run(self, items: Iterable[BatchItem]) -> Iterator[BatchOutcome]:
+        queue_size = self.jobs * PENDING_TASKS_PER_JOB
+        stages: list[tuple[Callable[[_PipelineJob], None], int]] = [
+            (self.read, 1),
+            (self.decode, self.jobs),
+            (self.transform, self.jobs),
+            (self.encode, self.jobs),
+        ]
+        queues = [queue.Queue(maxsize=queue_size) for _ in range(len(stages) + 1)]
+        threads = [
+            threading.Thread(target=self._feed, args=(items, queues[0]), daemon=True)
+        ]
+        for position, (func, count) in enumerate(stages):
+            remaining = [count]
+            lock = threading.Lock()
+            for _ in range(count):
+                threads.append(
+                    threading.Thread(
+                        target=self._run_stage,
+                        args=(func, queues[position], queues[position + 1], remaining, lock),
+                        daemon=True,
+                    )
+                )
+        for thread in threads:
+            thread.start()
+
+        results = queues[-1]
+        finished = False
+        try:
+            while True:
+                job = results.get()
+                if job is _STOP:
+                    finished = True
+                    if self.feed_error is not None:
+                        raise self.feed_error
+                    break
+                if job.fatal is not None:
+                    raise job.fatal
+                yield BatchOutcome(
+                    item=job.item,
+                    results=job.results,
+                    error=job.error,
+                    elapsed=time.perf_counter() - job.started,
+                )
+        finally:
+            if not finished:
+                # Drain so blocked stages can observe the cancel flag and exit.
+                self.cancelled.set()
+                while results.get() is not _STOP:
+                    pass
+
+
+def run_batch_threaded(
+    items: Iterable[BatchItem],
+    options: dict[str, Any],
+    jobs: int = 1,
+) -> Iterator[BatchOutcome]:
+    """
+    Thread-only alternative to run_batch for environments without process pools.
+    Pixel/byte budgets apply; low_memory does not, since the stage queues hold
+    several decoded images at once.
+    """
+    if options.get("low_memory"):
+        raise ImgshError("--low-memory requires --executor process.")
+    yield from _ThreadedPipeline(options=options, jobs=max(1, jobs)).run(items)
+
+
+def _run_ocr(
+    outcome: BatchOutcome, ocr_options: dict[str, Any], cache: OcrCache | None
+) -> BatchOutcome:
+    first = outcome.results[0]
+    started = time.perf_counter()
+    try:
+        first.ocr_path = ImageProcessor().extract_text(
+            input_path=first.output_path,
+            out=None,
+            engine=ocr_options["ocr_engine"],
+            output_format=ocr_options["ocr_format"],
+            lang=ocr_options.get("lang", "en"),
+            overwrite=outcome.item.overwrite or ocr_options.get("overwrite", False),
+            image=first.image,
+            cache=cache,
+            timer=first.timings or NULL_TIMER,
+        )
+    except ImgshError as error:
+        outcome.error = str(error)
+    finally:
+        first.image = None
+        outcome.elapsed += time.perf_counter() - started
+    return outcome
+
+
+def run_ocr_pool(
+    outcomes: Iterable[BatchOutcome],
+    ocr_options: dict[str, Any],
+    jobs: int = 1,
+    cache: OcrCache | None = None,
+) -> Iterator[BatchOutcome]:
+    """
+    OCR successful outcomes on a separate bounded thread pool (textract spawns an
+    external process per image, so threads are enough). Image workers keep encoding
+    while OCR runs; an outcome is yielded once its sidecar is written or has failed.
+    Outcomes produced with keep_image=True are OCRed from their in-memory pixels.
+    """
+    executor = ThreadPoolExecutor(max_workers=jobs, thread_name_prefix="imgsh-ocr")
+    max_pending = jobs * PENDING_TASKS_PER_JOB
+    pending: set[Future[BatchOutcome]] = set()
+    try:
+        for outcome in outcomes:
+            if outcome.error is not None or not outcome.results:
+                yield outcome
+                continue
+            pending.add(executor.submit(_run_ocr, outcome, ocr_options, cache))
+
+            finished = {future for future in pending if future.done()}
+            if len(pending) >= max_pending and not finished:
+                finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in finished:
+                pending.discard(future)
+                yield future.result()
+
+        while pending:
+            finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in finished:
+                yield future.result()
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def hash_ahead(
+    items: Iterable[BatchItem], lookahead: int = HASH_AHEAD_ITEMS
+) -> Iterator[tuple[BatchItem, str | None]]:
+    """
+    Yield (item, SHA-256 of its input) while a background thread reads and hashes up
+    to lookahead items ahead, so hashing overlaps the processing of earlier items.
+    The digest is None for an unreadable input; processing then reports the error.
+    """
+    hashed: queue.Queue = queue.Queue(maxsize=lookahead)
+    cancelled = threading.Event()
+
+    def feed() -> None:
+        try:
+            for item in items:
+                if cancelled.is_set():
+                    break
+                try:
+                    digest = file_sha256(item.input_path)
+                except OSError:
+                    digest = None
+                hashed.put((item, digest))
+        except BaseException as exc:  # re-raised in the consumer
+            hashed.put(exc)
+        finally:
+            hashed.put(_STOP)
+
+    threading.Thread(target=feed, daemon=True).start()
+    finished = False
+    try:
+        while (entry := hashed.get()) is not _STOP:
+            if isinstance(entry, BaseException):
+                raise entry
+            yield entry
+        finished = True
+    finally:
+        if not finished:
+            cancelled.set()
+            while hashed.get() is not _STOP:
+                pass
+
+
+class Deduplicator:
+    """
+    Exact-duplicate handling for a batch run. unique() passes on the first input of
+    each content (SHA-256 plus output formats) and holds back later copies;
+    complete() wraps the executor's outcomes and, once a first input has finished,
+    clones its outputs (hardlink, reflink or copy) for every held copy.
+    """
+
+    def __init__(self, options: dict[str, Any], lookahead: int = HASH_AHEAD_ITEMS) -> None:
+        self.options = options
+        self.lookahead = lookahead
+        self._first: dict[tuple[str, tuple[str, ...]], BatchItem] = {}
+        # Held copies by first item index, and outcomes of first items that finished.
+        self._waiting: dict[int, list[BatchItem]] = {}
+        self._finished: dict[int, BatchOutcome] = {}
+        self._ready: list[tuple[BatchItem, BatchOutcome]] = []
+        # unique() may run on an executor's feeder thread.
+        self._lock = threading.Lock()
+
+    def unique(self, items: Iterable[BatchItem]) -> Iterator[BatchItem]:
+        for item, digest in hash_ahead(items, self.lookahead):
+            if digest is None:
+                yield item
+                continue
+            try:
+                targets = item_targets(item, self.options, overwrite=True)
+            except ImgshError:
+                yield item
+                continue
+            key = (digest, tuple(pillow_format for _, pillow_format, _ in targets))
+            with self._lock:
+                first = self._first.setdefault(key, item)
+                if first is not item:
+                    if first.index in self._finished:
+                        self._ready.append((item, self._finished[first.index]))
+                    else:
+                        self._waiting.setdefault(first.index, []).append(item)
+                    continue
+            yield item
+
+    def complete(self, outcomes: Iterable[BatchOutcome]) -> Iterator[BatchOutcome]:
+        for outcome in outcomes:
+            yield outcome
+            # A copy: later stages (OCR) may still set an error on the yielded outcome.
+            finished = replace(outcome)
+            with self._lock:
+                self._finished[outcome.item.index] = finished
+                held = self._waiting.pop(outcome.item.index, [])
+                self._ready.extend((item, finished) for item in held)
+            yield from self._drain()
+        yield from self._drain()
+
+    def _drain(self) -> Iterator[BatchOutcome]:
+        with self._lock:
+            ready, self._ready = self._ready, []
+        for item, first in ready:
+            yield self._clone(item, first)
+
+    def _clone(self, item: BatchItem, first: BatchOutcome) -> BatchOutcome:
+        started = time.perf_counter()
+        source = first.item.input_path
+        if first.error is not None:
+            return BatchOutcome(
+                item=item, error=f"Same content as {source}, which failed.", duplicate_of=source
+            )
+        overwrite = item.overwrite or self.options.get("overwrite", False)
+        results = []
+        try:
+            targets = item_targets(item, self.options, overwrite=overwrite)
+            for (_, _, output_path), result in zip(targets, first.results, strict=True):
+                clone_file(result.output_path, output_path, hardlink=self.options.get("hardlink", False))
+                results.append(
+                    ProcessResult(
+                        output_path=output_path,
+                        size=result.size,
+                        source_size=result.source_size,
+                        quality=result.quality,
+                    )
+                )
+        except ImgshError as error:
+            return BatchOutcome(
+                item=item, error=str(error), elapsed=time.perf_counter() - started, duplicate_of=source
+            )
+        return BatchOutcome(
+            item=item, results=results, elapsed=time.perf_counter() - started, duplicate_of=source
+        )
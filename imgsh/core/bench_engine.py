@@ -0,0 +1,254 @@
+from __future__ import annotations
+
+import os
+import platform
+import random
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Callable, Sequence
+
+import PIL
+from PIL import Image, ImageDraw
+
+from imgsh.config import (
+    BENCH_FORMATS,
+    BENCH_RESOLUTIONS,
+    BENCH_SCENARIOS,
+    BENCH_SEED,
+    SUPPORTED_FORMATS,
+)
+from imgsh.core.batch_engine import BatchItem, run_batch
+from imgsh.core.errors import ImgshError
+from imgsh.core.metadata import EXIF_ORIENTATION_TAG, oriented_size
+from imgsh.core.processor import ImageProcessor
+from imgsh.core.timing import percentile
+
+BENCH_TARGET = (1024, 768)
+BENCH_QUALITY = 85
+
+# (variant name, has alpha, EXIF orientation); JPEG cannot carry alpha.
+_VARIANTS = [("plain", False, 1), ("alpha", True, 1), ("rotated", False, 6)]
+
+
+@dataclass
+class BenchResult:
+    scenario: str
+    images: int
+    seconds: float
+    megabytes: float
+    p50_ms: float | None
+    p95_ms: float | None
+
+    @property
+    def images_per_second(self) -> float:
+        return self.images / self.seconds if self.seconds else 0.0
+
+    @property
+    def mb_per_second(self) -> float:
+        return self.megabytes / self.seconds if self.seconds else 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self) | {
+            "images_per_second": round(self.images_per_second, 3),
+            "mb_per_second": round(self.mb_per_second, 3),
+        }
+
+
+def _synthetic_image(width: int, height: int, rng: random.Random, alpha: bool) -> Image.Image:
+    # Smooth gradients plus hard-edged shapes, so encoders see both flat and busy areas.
+    red = Image.linear_gradient("L").resize((width, height))
+    green = Image.radial_gradient("L").resize((width, height))
+    blue = Image.effect_mandelbrot((width, height), (-2.0, -1.2, 0.8, 1.2), 64)
+    image = Image.merge("RGB", (red, green, blue))
+    draw = ImageDraw.Draw(image)
+    for _ in range(24):
+        x0, y0 = rng.randrange(width), rng.randrange(height)
+        x1 = min(width, x0 + rng.randrange(8, max(9, width // 4)))
+        y1 = min(height, y0 + rng.randrange(8, max(9, height // 4)))
+        fill = (rng.randrange(256), rng.randrange(256), rng.randrange(256))
+        draw.rectangle((x0, y0, x1, y1), fill=fill)
+    if alpha:
+        image.putalpha(Image.radial_gradient("L").resize((width, height)))
+    return image
+
+
+def generate_corpus(
+    directory: Path,
+    resolutions: Sequence[tuple[int, int]] = BENCH_RESOLUTIONS,
+    formats: Sequence[str] = BENCH_FORMATS,
+    seed: int = BENCH_SEED,
+) -> list[Path]:
+    """
+    Write the synthetic corpus into directory and return its paths. Content depends
+    only on the arguments, and files that already exist are reused; names carry the
+    seed, so a rerun with another seed never picks up the old images.
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for width, height in resolutions:
+        for extension in formats:
+            pillow_format = SUPPORTED_FORMATS[extension]
+            for variant, alpha, orientation in _VARIANTS:
+                if alpha and pillow_format == "JPEG":
+                    continue
+                path = directory / f"{width}x{height}_{variant}_seed{seed}.{extension}"
+                paths.append(path)
+                if path.exists():
+                    continue
+                rng = random.Random(f"{seed}:{width}x{height}:{variant}")
+                image = _synthetic_image(width, height, rng, alpha=alpha)
+                save_kwargs: dict[str, Any] = {}
+                if pillow_format in {"JPEG", "WEBP"}:
+                    save_kwargs["quality"] = BENCH_QUALITY
+                if orientation != 1:
+                    exif = Image.Exif()
+                    exif[EXIF_ORIENTATION_TAG] = orientation
+                    save_kwargs["exif"] = exif.tobytes()
+                image.save(path, format=pillow_format, **save_kwargs)
+    return paths
+
+
+def _time_each(
+    scenario: str,
+    corpus: Sequence[Path],
+    repeat: int,
+    operation: Callable[[Path, Path], None],
+    out_dir: Path,
+) -> BenchResult:
+    latencies = []
+    total_bytes = 0
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for path in corpus:
+            total_bytes += path.stat().st_size
+            begin = time.perf_counter()
+            operation(path, out_dir)
+            latencies.append((time.perf_counter() - begin) * 1000)
+    elapsed = time.perf_counter() - started
+    return BenchResult(
+        scenario=scenario,
+        images=len(latencies),
+        seconds=elapsed,
+        megabytes=total_bytes / 1_000_000,
+        p50_ms=percentile(latencies, 0.50),
+        p95_ms=percentile(latencies, 0.95),
+    )
+
+
+def _run_batch_scenario(
+    corpus: Sequence[Path], repeat: int, jobs: int, out_dir: Path
+) -> BenchResult:
+    width, height = BENCH_TARGET
+    options = {
+        "width": width,
+        "height": height,
+        "keep_aspect": True,
+        "fit": "contain",
+        "output_format": None,
+        "quality": BENCH_QUALITY,
+        "overwrite": True,
+    }
+    items = [
+        BatchItem(
+            index=index,
+            input_path=path,
+            output_path=out_dir / f"{index:04d}_{path.stem}{path.suffix}",
+        )
+        for index, path in enumerate(list(corpus) * repeat)
+    ]
+    started = time.perf_counter()
+    for outcome in run_batch(items=items, options=options, jobs=jobs):
+        if outcome.error is not None:
+            raise ImgshError(f"Benchmark failed on '{outcome.item.input_path}': {outcome.error}")
+    elapsed = time.perf_counter() - started
+    # The pool does not report per-image latency, only overall throughput.
+    return BenchResult(
+        scenario="batch-resize",
+        images=len(items),
+        seconds=elapsed,
+        megabytes=sum(item.input_path.stat().st_size for item in items) / 1_000_000,
+        p50_ms=None,
+        p95_ms=None,
+    )
+
+
+def run_benchmarks(
+    corpus: Sequence[Path],
+    scenarios: Sequence[str] = BENCH_SCENARIOS,
+    repeat: int = 1,
+    jobs: int = 1,
+) -> list[BenchResult]:
+    processor = ImageProcessor()
+    width, height = BENCH_TARGET
+
+    def resize_with(fit: str) -> Callable[[Path, Path], None]:
+        def operation(path: Path, out_dir: Path) -> None:
+            processor.resize(
+                input_path=path,
+                out=out_dir / f"{path.stem}_{path.suffix[1:]}{path.suffix}",
+                width=width,
+                height=height,
+                keep_aspect=True,
+                fit=fit,
+                quality=BENCH_QUALITY,
+                overwrite=True,
+            )
+
+        return operation
+
+    def crop(path: Path, out_dir: Path) -> None:
+        with Image.open(path) as image:
+            image_width, image_height = oriented_size(image)
+        processor.crop(
+            input_path=path,
+            out=out_dir / f"{path.stem}_{path.suffix[1:]}{path.suffix}",
+            x=image_width // 4,
+            y=image_height // 4,
+            width=image_width // 2,
+            height=image_height // 2,
+            quality=BENCH_QUALITY,
+            overwrite=True,
+        )
+
+    def convert(path: Path, out_dir: Path) -> None:
+        processor.convert(
+            input_path=path,
+            out=out_dir / f"{path.stem}_{path.suffix[1:]}.webp",
+            output_format="webp",
+            quality=BENCH_QUALITY,
+            overwrite=True,
+        )
+
+    operations: dict[str, Callable[[Path, Path], None]] = {
+        "resize-contain": resize_with("contain"),
+        "resize-cover": resize_with("cover"),
+        "resize-exact": resize_with("exact"),
+        "crop": crop,
+        "convert": convert,
+    }
+
+    results = []
+    for scenario in scenarios:
+        with tempfile.TemporaryDirectory(prefix="imgsh-bench-") as tmpdir:
+            out_dir = Path(tmpdir)
+            if scenario == "batch-resize":
+                results.append(_run_batch_scenario(corpus, repeat, jobs, out_dir))
+            elif scenario in operations:
+                results.append(_time_each(scenario, corpus, repeat, operations[scenario], out_dir))
+            else:
+                raise ImgshError(
+                    f"Unknown benchmark scenario '{scenario}'. "
+                    f"Supported values: {', '.join(BENCH_SCENARIOS)}"
+                )
+    return results
+
+
+def environment_info() -> dict[str, Any]:
+    return {
+        "python": platform.python_version(),
+        "pillow": PIL.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
@@ -5,9 +5,12 @@ from PIL import Image
 from imgsh.utils.validation import validate_crop_bounds, validate_crop_box
 
 
-def crop_image(image: Image.Image, x: int, y: int, width: int, height: int) -> Image.Image:
+def crop_region(
+    image_size: tuple[int, int], x: float, y: float, width: float, height: float
+) -> tuple[float, float, float, float]:
+    """Validate an (x, y, width, height) crop and return it as a (left, top, right, bottom) box."""
     validate_crop_box(x=x, y=y, width=width, height=height)
-    image_width, image_height = image.size
+    image_width, image_height = image_size
     validate_crop_bounds(
         x=x,
         y=y,
@@ -16,4 +19,8 @@ def crop_image(image: Image.Image, x: int, y: int, width: int, height: int) -> I
         image_width=image_width,
         image_height=image_height,
     )
-    return image.crop((x, y, x + width, y + height))
+    return x, y, x + width, y + height
+
+
+def crop_image(image: Image.Image, x: int, y: int, width: int, height: int) -> Image.Image:
+    return image.crop(crop_region(image.size, x, y, width, height))
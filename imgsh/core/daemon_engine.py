@@ -0,0 +1,370 @@
+from __future__ import annotations
+
+import json
+import os
+import signal
+import socket
+import sys
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from imgsh import __version__
+from imgsh.core.errors import ImgshError
+
+if TYPE_CHECKING:
+    from typing import Any, NoReturn
+
+# The forwarding client runs before anything else on every CLI call, so modules only
+# the daemon side needs are imported where they are used.
+
+# Commands a running daemon executes on behalf of the CLI; everything else runs in-process.
+DAEMON_COMMANDS = {"resize", "crop", "convert", "extract-text"}
+SOCKET_ENV = "IMGSH_DAEMON_SOCKET"
+# Set to force in-process execution even while a daemon is running.
+DISABLE_ENV = "IMGSH_NO_DAEMON"
+MAX_MESSAGE_BYTES = 1024 * 1024
+START_TIMEOUT_SECONDS = 10.0
+STOP_TIMEOUT_SECONDS = 10.0
+UNSUPPORTED_MESSAGE = "The imgsh daemon needs Unix sockets and fork (Linux or macOS)."
+
+
+class _StopDaemon(Exception):
+    pass
+
+
+def daemon_supported() -> bool:
+    return hasattr(socket, "AF_UNIX") and hasattr(socket, "send_fds") and hasattr(os, "fork")
+
+
+def socket_path() -> Path:
+    override = os.environ.get(SOCKET_ENV)
+    if override:
+        return Path(override)
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        return Path(runtime_dir) / "imgsh" / "daemon.sock"
+    import tempfile
+
+    return Path(tempfile.gettempdir()) / f"imgsh-{os.getuid()}" / "daemon.sock"
+
+
+def _read_message(
+    connection: socket.socket, pending: bytes = b""
+) -> tuple[dict[str, Any] | None, bytes]:
+    """
+    One newline-terminated JSON message (None if the peer closed first), plus any
+    bytes received after it. Pass those back in as pending to read the next message.
+    """
+    while b"\n" not in pending:
+        if len(pending) > MAX_MESSAGE_BYTES:
+            return None, b""
+        chunk = connection.recv(65536)
+        if not chunk:
+            return None, b""
+        pending += chunk
+    line, rest = pending.split(b"\n", 1)
+    try:
+        message = json.loads(line)
+    except ValueError:
+        return None, rest
+    return (message if isinstance(message, dict) else None), rest
+
+
+def _send_message(connection: socket.socket, message: dict[str, Any]) -> None:
+    connection.sendall(json.dumps(message).encode("utf-8") + b"\n")
+
+
+def _connect(path: Path) -> socket.socket:
+    connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        connection.connect(str(path))
+    except OSError:
+        connection.close()
+        raise
+    return connection
+
+
+def forward(argv: list[str]) -> int | None:
+    """
+    Run an imgsh command line in the daemon, which writes straight to this process's
+    stdin/stdout/stderr (passed over the socket). Returns the exit code, or None when
+    no daemon is available and the command should run in-process.
+    """
+    if not argv or argv[0] not in DAEMON_COMMANDS or os.environ.get(DISABLE_ENV):
+        return None
+    if not daemon_supported():
+        return None
+    request = {
+        "version": __version__,
+        "argv": argv,
+        "cwd": os.getcwd(),
+        "env": dict(os.environ),
+    }
+    try:
+        connection = _connect(socket_path())
+    except OSError:
+        return None
+    with connection:
+        try:
+            socket.send_fds(
+                connection, [json.dumps(request).encode("utf-8") + b"\n"], [0, 1, 2]
+            )
+            # A fast command's exit message can arrive in the same read as the acceptance.
+            accepted, pending = _read_message(connection)
+        except OSError:
+            return None
+        if not accepted or not accepted.get("accepted"):
+            # Version mismatch or a daemon on its way down: nothing has run yet.
+            return None
+        try:
+            reply, _ = _read_message(connection, pending)
+        except OSError:
+            reply = None
+    if reply is None or "exit" not in reply:
+        print("Error: imgsh daemon stopped while running the command.", file=sys.stderr)
+        return 1
+    return int(reply["exit"])
+
+
+def daemon_request(path: Path, control: str) -> dict[str, Any] | None:
+    """Send a control message (status, stop); None when no daemon answers."""
+    try:
+        connection = _connect(path)
+    except OSError:
+        return None
+    with connection:
+        try:
+            _send_message(connection, {"version": __version__, "control": control})
+            return _read_message(connection)[0]
+        except OSError:
+            return None
+
+
+def _prepare_socket_dir(directory: Path) -> None:
+    directory.mkdir(mode=0o700, parents=True, exist_ok=True)
+    stat = directory.stat()
+    # Anyone who can connect can run commands as us.
+    if stat.st_uid != os.getuid() or stat.st_mode & 0o077:
+        raise ImgshError(
+            f"Refusing to use '{directory}' for the daemon socket: it must be owned by you "
+            "and not accessible to other users (chmod 700)."
+        )
+
+
+def _apply_environment(env: dict[str, str]) -> None:
+    # Only touch what differs: rewriting every variable costs about a millisecond.
+    for key in set(os.environ) - set(env):
+        del os.environ[key]
+    for key, value in env.items():
+        if os.environ.get(key) != value:
+            os.environ[key] = value
+
+
+def _run_child(
+    connection: socket.socket, message: dict[str, Any], fds: list[int], command: Any
+) -> NoReturn:
+    import traceback
+
+    code = 1
+    try:
+        signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        signal.signal(signal.SIGINT, signal.SIG_DFL)
+        for target, fd in enumerate(fds):
+            os.dup2(fd, target)
+            os.close(fd)
+        os.chdir(message["cwd"])
+        _apply_environment(message["env"])
+        _send_message(connection, {"accepted": True})
+        try:
+            command.main(args=message["argv"], prog_name="imgsh")
+            code = 0
+        except SystemExit as exit:
+            if exit.code is None:
+                code = 0
+            elif isinstance(exit.code, int):
+                code = exit.code
+            else:
+                print(exit.code, file=sys.stderr)
+                code = 1
+    except BaseException:
+        traceback.print_exc()
+    finally:
+        try:
+            sys.stdout.flush()
+            sys.stderr.flush()
+            _send_message(connection, {"exit": code})
+        finally:
+            os._exit(0)
+
+
+def _warm_up(command: Any) -> None:
+    """Run one small resize so first-use work happens here rather than in every fork."""
+    import contextlib
+    import io
+    import tempfile
+
+    from PIL import Image
+
+    Image.init()
+    with tempfile.TemporaryDirectory() as tmpdir:
+        source = Path(tmpdir) / "warm.jpg"
+        Image.new("RGB", (64, 64)).save(source)
+        with contextlib.redirect_stdout(io.StringIO()):
+            command.main(
+                args=["resize", str(source), "--width", "16", "--out", f"{tmpdir}/out.jpg"],
+                prog_name="imgsh",
+                standalone_mode=False,
+            )
+
+
+def run_daemon(path: Path) -> None:
+    """
+    Serve forwarded commands on a Unix socket until stopped. Every module the CLI
+    needs is imported once, up front; each command then runs in a fork of this warm
+    process, so it starts in a few milliseconds and cannot leak state into the next.
+    """
+    if not daemon_supported():
+        raise ImgshError(UNSUPPORTED_MESSAGE)
+    import gc
+
+    import typer
+
+    from imgsh.cli.app import app
+
+    # Typer rebuilds the click command tree from type hints on every call (tens of ms).
+    command = typer.main.get_command(app)
+    context = typer.Context(command)
+    for name in DAEMON_COMMANDS:
+        command.get_command(context, name)
+    _warm_up(command)
+    # Keep the collector off the warm heap so forked children do not copy its pages.
+    gc.freeze()
+    _prepare_socket_dir(path.parent)
+    if daemon_request(path, "status") is not None:
+        raise ImgshError(f"A daemon is already listening on {path}.")
+    path.unlink(missing_ok=True)
+
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    listener.bind(str(path))
+    os.chmod(path, 0o600)
+    listener.listen(64)
+
+    def stop(signum: int, frame: Any) -> None:
+        raise _StopDaemon
+
+    # Forked children are reaped by the kernel.
+    signal.signal(signal.SIGCHLD, signal.SIG_IGN)
+    previous_handlers = {
+        signum: signal.signal(signum, stop) for signum in (signal.SIGTERM, signal.SIGINT)
+    }
+    started = time.monotonic()
+    served = 0
+    try:
+        while True:
+            connection, _ = listener.accept()
+            fds: list[int] = []
+            with connection:
+                try:
+                    data, fds, _, _ = socket.recv_fds(connection, MAX_MESSAGE_BYTES, 3)
+                    message = _read_message(connection, data)[0] if data else None
+                except OSError:
+                    message = None
+                # Control messages are answered whatever the client version, so a newer
+                # imgsh can still inspect and stop a daemon left over from an upgrade.
+                if message is None:
+                    _try_send(connection, {"accepted": False})
+                elif message.get("control") == "status":
+                    _try_send(
+                        connection,
+                        {
+                            "pid": os.getpid(),
+                            "uptime": time.monotonic() - started,
+                            "served": served,
+                            "socket": str(path),
+                            "version": __version__,
+                        },
+                    )
+                elif message.get("control") == "stop":
+                    _try_send(connection, {"stopping": True})
+                    break
+                elif message.get("version") != __version__:
+                    _try_send(connection, {"accepted": False})
+                elif len(fds) == 3 and isinstance(message.get("argv"), list):
+                    served += 1
+                    sys.stdout.flush()
+                    sys.stderr.flush()
+                    if os.fork() == 0:
+                        listener.close()
+                        _run_child(connection, message, fds, command)
+                else:
+                    _try_send(connection, {"accepted": False})
+                for fd in fds:
+                    os.close(fd)
+    except _StopDaemon:
+        pass
+    finally:
+        listener.close()
+        path.unlink(missing_ok=True)
+        for signum, handler in previous_handlers.items():
+            signal.signal(signum, handler)
+        signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+
+
+def _try_send(connection: socket.socket, message: dict[str, Any]) -> None:
+    try:
+        _send_message(connection, message)
+    except OSError:
+        pass
+
+
+def start_daemon(path: Path) -> int:
+    """Start a detached daemon on path and wait until it answers. Returns its pid."""
+    import subprocess
+
+    if not daemon_supported():
+        raise ImgshError(UNSUPPORTED_MESSAGE)
+    if daemon_request(path, "status") is not None:
+        raise ImgshError(f"A daemon is already listening on {path}.")
+    _prepare_socket_dir(path.parent)
+    log_path = path.with_suffix(".log")
+    with log_path.open("ab") as log:
+        process = subprocess.Popen(
+            [sys.executable, "-m", "imgsh", "daemon", "start", "--foreground"]
+            + ["--socket", str(path)],
+            stdin=subprocess.DEVNULL,
+            stdout=log,
+            stderr=log,
+            start_new_session=True,
+        )
+    deadline = time.monotonic() + START_TIMEOUT_SECONDS
+    while time.monotonic() < deadline:
+        status = daemon_request(path, "status")
+        if status is not None:
+            return int(status["pid"])
+        if process.poll() is not None:
+            raise ImgshError(f"The daemon exited during start-up; see {log_path}.")
+        time.sleep(0.05)
+    raise ImgshError(f"The daemon did not start within {START_TIMEOUT_SECONDS:g}s; see {log_path}.")
+
+
+def stop_daemon(path: Path) -> bool:
+    """
+    Ask the daemon on path to exit and wait until its socket is gone; False if none
+    was running. Raises ImgshError if it refuses or is still up after the timeout.
+    """
+    reply = daemon_request(path, "stop")
+    if reply is None:
+        return False
+    if not reply.get("stopping"):
+        raise ImgshError(
+            f"The process on {path} did not accept the stop request; stop it manually "
+            "(e.g. with kill) and remove the socket."
+        )
+    deadline = time.monotonic() + STOP_TIMEOUT_SECONDS
+    while path.exists() and time.monotonic() < deadline:
+        time.sleep(0.05)
+    if path.exists():
+        raise ImgshError(f"The daemon on {path} did not stop within {STOP_TIMEOUT_SECONDS:g}s.")
+    return True
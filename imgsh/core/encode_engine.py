@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from pathlib import Path
+
+from PIL import Image
+
+from imgsh.config import DEFAULT_QUALITY, LOSSY_FORMATS, SSIM_TOLERANCE
+from imgsh.core.errors import ImgshError
+from imgsh.core.metadata import encode_image, save_image
+from imgsh.core.quality_metrics import luma, ssim
+
+MIN_QUALITY = 1
+
+
+def _candidates(low: int, high: int, count: int) -> list[int]:
+    """count qualities spread evenly over [low, high], ascending."""
+    span = high - low + 1
+    if span <= count:
+        return list(range(low, high + 1))
+    return sorted({low + span * step // (count + 1) for step in range(1, count + 1)})
+
+
+def _require_lossy(pillow_format: str, option: str) -> None:
+    if pillow_format not in LOSSY_FORMATS:
+        raise ImgshError(f"{option} requires a lossy output format (jpg or webp), not {pillow_format}.")
+
+
+def check_output_limits(
+    pillow_format: str, max_output_bytes: int | None, target_ssim: float | None
+) -> None:
+    """Reject size or SSIM targets for a lossless format, as the encoders would."""
+    if max_output_bytes is not None:
+        _require_lossy(pillow_format, "--max-bytes/--max-kb")
+    if target_ssim is not None:
+        _require_lossy(pillow_format, "--target-ssim")
+
+
+def encode_within(
+    image: Image.Image,
+    pillow_format: str,
+    max_output_bytes: int,
+    quality: int | None,
+    exif_bytes: bytes | None,
+    jobs: int = 1,
+) -> tuple[bytes, int]:
+    """
+    Encode image at the highest quality, up to quality (default DEFAULT_QUALITY), whose
+    output fits max_output_bytes. Candidates are encoded in memory and the search
+    narrows the range by binary search, or by jobs-way search with jobs candidates
+    encoded at once on threads. Returns (encoded bytes, quality).
+    """
+    _require_lossy(pillow_format, "--max-bytes/--max-kb")
+    ceiling = DEFAULT_QUALITY if quality is None else quality
+    encoded = encode_image(image, pillow_format, ceiling, exif_bytes)
+    if len(encoded) <= max_output_bytes:
+        return encoded, ceiling
+
+    best: tuple[bytes, int] | None = None
+    smallest = len(encoded)
+    low, high = MIN_QUALITY, ceiling - 1
+    # Image.save keeps per-call state on the image, so each thread encodes its own copy.
+    copies = [image] + [image.copy() for _ in range(jobs - 1)]
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        while low <= high:
+            candidates = _candidates(low, high, jobs)
+            # Finish the whole round before narrowing: the next round reuses these copies.
+            outputs = list(
+                executor.map(
+                    lambda source, candidate: encode_image(source, pillow_format, candidate, exif_bytes),
+                    copies,
+                    candidates,
+                )
+            )
+            for candidate, output in zip(candidates, outputs):
+                smallest = min(smallest, len(output))
+                if len(output) > max_output_bytes:
+                    high = candidate - 1
+                    break
+                best = output, candidate
+                low = candidate + 1
+    if best is None:
+        raise ImgshError(
+            f"Cannot encode under {max_output_bytes} bytes: the smallest {pillow_format} "
+            f"(quality {MIN_QUALITY}) is {smallest} bytes."
+        )
+    return best
+
+
+def encode_for_ssim(
+    image: Image.Image,
+    pillow_format: str,
+    target_ssim: float,
+    quality: int | None,
+    exif_bytes: bytes | None,
+    jobs: int = 1,
+) -> tuple[bytes, int]:
+    """
+    Encode image at the lowest quality, up to quality (default DEFAULT_QUALITY), whose
+    decoded output scores at least target_ssim against image (quality_metrics.ssim on
+    downsampled luma). The search ends early at a candidate within SSIM_TOLERANCE above
+    the target; if even the ceiling misses it, the ceiling encode is returned.
+    Returns (encoded bytes, quality).
+    """
+    _require_lossy(pillow_format, "--target-ssim")
+    ceiling = DEFAULT_QUALITY if quality is None else quality
+    reference = luma(image)
+
+    def score(source: Image.Image, candidate: int) -> tuple[bytes, float]:
+        encoded = encode_image(source, pillow_format, candidate, exif_bytes)
+        with Image.open(BytesIO(encoded)) as decoded:
+            return encoded, ssim(reference, luma(decoded))
+
+    best: tuple[bytes, int] | None = None
+    at_ceiling = b""
+    low, high = MIN_QUALITY, ceiling
+    copies = [image] + [image.copy() for _ in range(jobs - 1)]
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        while low <= high:
+            candidates = _candidates(low, high, jobs)
+            # Finish the whole round before narrowing: the next round reuses these copies.
+            scores = list(executor.map(score, copies, candidates))
+            for candidate, (encoded, value) in zip(candidates, scores):
+                if value < target_ssim:
+                    low = candidate + 1
+                    if candidate == ceiling:
+                        at_ceiling = encoded
+                    continue
+                best = encoded, candidate
+                if value - target_ssim <= SSIM_TOLERANCE:
+                    return best
+                high = candidate - 1
+                break
+    # Every candidate missing the target means the search ended on the ceiling itself.
+    return best if best is not None else (at_ceiling, ceiling)
+
+
+def save_output(
+    image: Image.Image,
+    output_path: Path,
+    pillow_format: str,
+    quality: int | None,
+    exif_bytes: bytes | None,
+    max_output_bytes: int | None = None,
+    target_ssim: float | None = None,
+    jobs: int = 1,
+) -> int | None:
+    """
+    save_image, or with max_output_bytes and/or target_ssim, write only the winner of
+    encode_for_ssim, capped to max_output_bytes by encode_within. Returns the quality
+    the search picked (None without either limit).
+    """
+    if max_output_bytes is None and target_ssim is None:
+        save_image(image, output_path, pillow_format, quality, exif_bytes)
+        return None
+    if target_ssim is None:
+        data, chosen = encode_within(image, pillow_format, max_output_bytes, quality, exif_bytes, jobs)
+    else:
+        data, chosen = encode_for_ssim(image, pillow_format, target_ssim, quality, exif_bytes, jobs)
+        if max_output_bytes is not None and len(data) > max_output_bytes:
+            data, chosen = encode_within(image, pillow_format, max_output_bytes, chosen, exif_bytes, jobs)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    output_path.write_bytes(data)
+    return chosen
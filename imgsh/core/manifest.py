@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any
+
+from imgsh.core.errors import ImgshError
+
+MANIFEST_FILENAME = ".imgsh-manifest.jsonl"
+HASH_CHUNK_SIZE = 1024 * 1024
+
+# Options that change where/whether a file is written, or what is reported, but
+# not what is written.
+_FINGERPRINT_IGNORED_OPTIONS = {"overwrite", "timings", "max_pixels", "max_bytes", "hardlink"}
+
+
+def options_fingerprint(options: dict[str, Any]) -> str:
+    relevant = {
+        key: value for key, value in options.items() if key not in _FINGERPRINT_IGNORED_OPTIONS
+    }
+    encoded = json.dumps(relevant, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        for chunk in iter(lambda: handle.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class BatchManifest:
+    """
+    Record of inputs already processed into an output directory.
+    Stored as append-only JSON lines (later lines win) and compacted on close,
+    so recording an entry never rewrites the whole file.
+    """
+
+    def __init__(self, path: Path, use_hash: bool = False) -> None:
+        self.path = path
+        self.use_hash = use_hash
+        self.entries: dict[str, dict[str, Any]] = {}
+        self._line_count = 0
+        self._handle = None
+        # Planning and result handling may run on different threads.
+        self._lock = threading.Lock()
+        self._load()
+
+    @staticmethod
+    def _key(input_path: Path) -> str:
+        return str(input_path.resolve())
+
+    def _load(self) -> None:
+        if not self.path.exists():
+            return
+        try:
+            with self.path.open("r", encoding="utf-8") as handle:
+                for line in handle:
+                    self._line_count += 1
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        # A run killed mid-write can leave a truncated last line.
+                        continue
+                    if isinstance(entry, dict) and "input" in entry:
+                        self.entries[entry["input"]] = entry
+        except OSError as exc:
+            raise ImgshError(f"Could not read manifest '{self.path}': {exc}") from exc
+
+    def is_current(self, input_path: Path, output_paths: list[Path], fingerprint: str) -> bool:
+        entry = self.entries.get(self._key(input_path))
+        if entry is None:
+            return False
+        if entry.get("fingerprint") != fingerprint:
+            return False
+        if entry.get("outputs") != [str(path) for path in output_paths]:
+            return False
+        if not all(path.exists() for path in output_paths):
+            return False
+
+        stat = input_path.stat()
+        if entry.get("size") != stat.st_size:
+            return False
+        if entry.get("mtime_ns") == stat.st_mtime_ns:
+            return True
+        # Touched but possibly unchanged: fall back to the content hash when we have one.
+        if self.use_hash and entry.get("sha256"):
+            if file_sha256(input_path) == entry["sha256"]:
+                self.record(input_path, output_paths, fingerprint, sha256=entry["sha256"])
+                return True
+        return False
+
+    def owns(self, input_path: Path, output_paths: list[Path]) -> bool:
+        """True when output_paths were written by an earlier run for this input."""
+        entry = self.entries.get(self._key(input_path))
+        return entry is not None and entry.get("outputs") == [str(path) for path in output_paths]
+
+    def record(
+        self,
+        input_path: Path,
+        output_paths: list[Path],
+        fingerprint: str,
+        sha256: str | None = None,
+    ) -> None:
+        stat = input_path.stat()
+        entry: dict[str, Any] = {
+            "input": self._key(input_path),
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "fingerprint": fingerprint,
+            "outputs": [str(path) for path in output_paths],
+        }
+        if self.use_hash:
+            entry["sha256"] = sha256 or file_sha256(input_path)
+
+        with self._lock:
+            self.entries[entry["input"]] = entry
+            if self._handle is None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self._handle = self.path.open("a", encoding="utf-8")
+            self._handle.write(json.dumps(entry) + "\n")
+            self._handle.flush()
+            self._line_count += 1
+
+    def close(self) -> None:
+        with self._lock:
+            if self._handle is not None:
+                self._handle.close()
+                self._handle = None
+            if self._line_count > 2 * len(self.entries):
+                self._compact()
+
+    def _compact(self) -> None:
+        temp_path = self.path.with_name(f"{self.path.name}.tmp")
+        with temp_path.open("w", encoding="utf-8") as handle:
+            for entry in self.entries.values():
+                handle.write(json.dumps(entry) + "\n")
+        os.replace(temp_path, self.path)
+        self._line_count = len(self.entries)
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import threading
+from pathlib import Path
+from typing import IO
+
+from PIL import Image
+
+from imgsh.core.errors import ImgshError
+from imgsh.core.metadata import get_orientation
+
+BYTES_PER_MB = 1024 * 1024
+_OPEN_LOCK = threading.Lock()
+
+
+def pixel_bytes(mode: str) -> int:
+    """Bytes Pillow uses per pixel in memory (multi-band 8-bit modes are padded to 4)."""
+    if mode in {"1", "L", "P"}:
+        return 1
+    if mode.startswith("I;16"):
+        return 2
+    return 4
+
+
+def open_image(
+    source: Path | IO[bytes], budgeted: bool = False, name: str | Path = ""
+) -> Image.Image:
+    """
+    Image.open that reports Pillow's decompression-bomb limit as an ImgshError. With
+    budgeted=True the limit is lifted instead: the caller enforces its own budget with
+    check_budget after any draft reduction, so a huge JPEG that decodes small is not
+    rejected from its header alone.
+    """
+    try:
+        if not budgeted:
+            return Image.open(source)
+        with _OPEN_LOCK:
+            previous = Image.MAX_IMAGE_PIXELS
+            Image.MAX_IMAGE_PIXELS = None
+            try:
+                return Image.open(source)
+            finally:
+                Image.MAX_IMAGE_PIXELS = previous
+    except Image.DecompressionBombError as exc:
+        raise ImgshError(
+            f"'{name or source}' is too large to process: {exc} "
+            "Set --max-megapixels to allow it."
+        ) from exc
+
+
+def check_budget(
+    image: Image.Image,
+    output_size: tuple[int, int],
+    max_pixels: int | None,
+    max_bytes: int | None,
+    low_memory: bool = False,
+    name: str | Path = "",
+) -> None:
+    """
+    Refuse an image whose decode would exceed the budget. Uses only header data
+    (and any draft already applied), so it must run before the image is loaded.
+    """
+    width, height = image.size
+    pixels = width * height
+    if max_pixels is not None and pixels > max_pixels:
+        raise ImgshError(
+            f"'{name}' decodes to {width}x{height} ({pixels / 1e6:.1f} MP), over the "
+            f"{max_pixels / 1e6:.1f} MP budget."
+        )
+    if max_bytes is None:
+        return
+    per_pixel = pixel_bytes(image.mode)
+    # Decoded source and output buffers coexist; the regular path also holds a
+    # full-size copy when EXIF orientation requires a transpose.
+    estimate = (pixels + output_size[0] * output_size[1]) * per_pixel
+    if not low_memory and get_orientation(image) != 1:
+        estimate += pixels * per_pixel
+    if estimate > max_bytes:
+        raise ImgshError(
+            f"'{name}' needs about {estimate / BYTES_PER_MB:.0f} MB to process, over the "
+            f"{max_bytes / BYTES_PER_MB:.0f} MB budget."
+        )
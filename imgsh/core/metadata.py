@@ -1,15 +1,95 @@
 from __future__ import annotations
 
+from io import BytesIO
 from pathlib import Path
+from typing import IO
 
 from PIL import Image, ImageOps
 
+from imgsh.config import DEFAULT_QUALITY
+
+EXIF_ORIENTATION_TAG = 0x0112
+# EXIF orientations that rotate by 90/270 degrees, swapping width and height.
+TRANSPOSED_ORIENTATIONS = {5, 6, 7, 8}
+# Transpose that displays a stored image with the given EXIF orientation upright.
+ORIENTATION_TRANSPOSE = {
+    2: Image.Transpose.FLIP_LEFT_RIGHT,
+    3: Image.Transpose.ROTATE_180,
+    4: Image.Transpose.FLIP_TOP_BOTTOM,
+    5: Image.Transpose.TRANSPOSE,
+    6: Image.Transpose.ROTATE_270,
+    7: Image.Transpose.TRANSVERSE,
+    8: Image.Transpose.ROTATE_90,
+}
+
 
 def auto_orient(image: Image.Image) -> Image.Image:
-    # Respect EXIF orientation before any resizing.
+    # Respect EXIF orientation before any resizing. Upright images are returned as-is;
+    # exif_transpose would copy them.
+    if get_orientation(image) == 1:
+        return image
     return ImageOps.exif_transpose(image)
 
 
+def get_orientation(image: Image.Image) -> int:
+    # Read from the header, so this is safe to call before pixels are decoded.
+    try:
+        orientation = image.getexif().get(EXIF_ORIENTATION_TAG, 1)
+    except Exception:
+        return 1
+    return orientation if isinstance(orientation, int) else 1
+
+
+def oriented_size(image: Image.Image) -> tuple[int, int]:
+    image_width, image_height = image.size
+    if get_orientation(image) in TRANSPOSED_ORIENTATIONS:
+        return image_height, image_width
+    return image_width, image_height
+
+
+def raw_box(
+    box: tuple[float, float, float, float],
+    orientation: int,
+    stored_size: tuple[int, int],
+) -> tuple[float, float, float, float]:
+    """Map a box in oriented (displayed) coordinates onto the stored, un-rotated image."""
+    raw_width, raw_height = stored_size
+
+    def to_raw(x: float, y: float) -> tuple[float, float]:
+        if orientation == 2:
+            return raw_width - x, y
+        if orientation == 3:
+            return raw_width - x, raw_height - y
+        if orientation == 4:
+            return x, raw_height - y
+        if orientation == 5:
+            return y, x
+        if orientation == 6:
+            return y, raw_height - x
+        if orientation == 7:
+            return raw_width - y, raw_height - x
+        if orientation == 8:
+            return raw_width - y, x
+        return x, y
+
+    x0, y0 = to_raw(box[0], box[1])
+    x1, y1 = to_raw(box[2], box[3])
+    return min(x0, x1), min(y0, y1), max(x0, x1), max(y0, y1)
+
+
+def raw_size(size: tuple[int, int], orientation: int) -> tuple[int, int]:
+    """Stored dimensions for oriented (displayed) dimensions."""
+    if orientation in TRANSPOSED_ORIENTATIONS:
+        return size[1], size[0]
+    return size
+
+
+def apply_orientation(image: Image.Image, orientation: int) -> Image.Image:
+    """Transpose stored pixels upright, without exif_transpose's metadata rewrite."""
+    method = ORIENTATION_TRANSPOSE.get(orientation)
+    return image.transpose(method) if method is not None else image
+
+
 def get_exif_bytes(image: Image.Image) -> bytes | None:
     exif_bytes = image.info.get("exif")
     if isinstance(exif_bytes, bytes):
@@ -17,24 +97,48 @@ def get_exif_bytes(image: Image.Image) -> bytes | None:
     return None
 
 
-def save_image(
+def _save(
     image: Image.Image,
-    output_path: Path,
+    target: Path | IO[bytes],
     pillow_format: str,
-    quality: int,
+    quality: int | None,
     exif_bytes: bytes | None,
 ) -> None:
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-
     save_kwargs: dict[str, object] = {}
     if pillow_format in {"JPEG", "WEBP"}:
-        save_kwargs["quality"] = quality
+        save_kwargs["quality"] = DEFAULT_QUALITY if quality is None else quality
     if exif_bytes:
         save_kwargs["exif"] = exif_bytes
 
     try:
-        image.save(output_path, format=pillow_format, **save_kwargs)
+        image.save(target, format=pillow_format, **save_kwargs)
     except TypeError:
         # Some format/pillow combinations reject EXIF args.
         save_kwargs.pop("exif", None)
-        image.save(output_path, format=pillow_format, **save_kwargs)
+        if not isinstance(target, Path):
+            target.seek(0)
+            target.truncate()
+        image.save(target, format=pillow_format, **save_kwargs)
+
+
+def save_image(
+    image: Image.Image,
+    output_path: Path,
+    pillow_format: str,
+    quality: int | None,
+    exif_bytes: bytes | None,
+) -> None:
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    _save(image, output_path, pillow_format, quality, exif_bytes)
+
+
+def encode_image(
+    image: Image.Image,
+    pillow_format: str,
+    quality: int | None,
+    exif_bytes: bytes | None,
+) -> bytes:
+    """save_image into memory: the encoded file as bytes."""
+    buffer = BytesIO()
+    _save(image, buffer, pillow_format, quality, exif_bytes)
+    return buffer.getvalue()
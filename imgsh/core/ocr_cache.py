@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from imgsh.core.errors import ImgshError
+from imgsh.core.manifest import HASH_CHUNK_SIZE, file_sha256
+
+if TYPE_CHECKING:
+    from PIL import Image
+
+# Bump when the entry layout or key derivation changes.
+CACHE_VERSION = 1
+BYTES_PER_MB = 1024 * 1024
+
+
+def default_cache_dir() -> Path:
+    base = os.environ.get("XDG_CACHE_HOME") or str(Path.home() / ".cache")
+    return Path(base) / "imgsh" / "ocr"
+
+
+def image_sha256(image: Image.Image) -> str:
+    digest = hashlib.sha256(f"{image.mode}:{image.width}x{image.height}:".encode("ascii"))
+    # Hash bands of rows instead of one full-size copy; raw rows are contiguous,
+    # so the digest matches hashing image.tobytes() in one go.
+    row_bytes = len(image.crop((0, 0, image.width, 1)).tobytes()) if image.height else 0
+    rows = max(1, HASH_CHUNK_SIZE // max(1, row_bytes))
+    for top in range(0, image.height, rows):
+        digest.update(image.crop((0, top, image.width, min(top + rows, image.height))).tobytes())
+    return digest.hexdigest()
+
+
+class OcrCache:
+    """
+    On-disk OCR text keyed by content hash, engine and language. Entries are
+    evicted least-recently-used first (by mtime, refreshed on every hit) once the
+    directory grows past max_bytes. Safe to share between threads.
+    """
+
+    def __init__(self, directory: Path, max_bytes: int) -> None:
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._size: int | None = None
+        self._lock = threading.Lock()
+
+    def key(
+        self,
+        engine: str,
+        lang: str,
+        input_path: Path | None = None,
+        image: Image.Image | None = None,
+    ) -> str:
+        content = image_sha256(image) if image is not None else file_sha256(input_path)
+        material = f"v{CACHE_VERSION}:{engine}:{lang.lower()}:{content}"
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def _entry_path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.txt"
+
+    def get(self, key: str) -> str | None:
+        path = self._entry_path(key)
+        try:
+            text = path.read_text(encoding="utf-8")
+            os.utime(path)
+        except FileNotFoundError:
+            with self._lock:
+                self.misses += 1
+            return None
+        except OSError as exc:
+            raise ImgshError(f"Could not read OCR cache entry '{path}': {exc}") from exc
+        with self._lock:
+            self.hits += 1
+        return text
+
+    def put(self, key: str, text: str) -> None:
+        path = self._entry_path(key)
+        data = text.encode("utf-8")
+        temp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            # Extracted text can be sensitive; keep the cache private to the user.
+            self.directory.mkdir(mode=0o700, parents=True, exist_ok=True)
+            path.parent.mkdir(mode=0o700, exist_ok=True)
+            temp_path.write_bytes(data)
+            try:
+                replaced = path.stat().st_size
+            except FileNotFoundError:
+                replaced = 0
+            os.replace(temp_path, path)
+        except OSError as exc:
+            temp_path.unlink(missing_ok=True)
+            raise ImgshError(f"Could not write OCR cache entry '{path}': {exc}") from exc
+
+        with self._lock:
+            if self._size is None:
+                self._size = sum(size for _, size, _ in self._entries())
+            else:
+                self._size += len(data) - replaced
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def _entries(self) -> list[tuple[int, int, Path]]:
+        entries = []
+        if not self.directory.is_dir():
+            return entries
+        for shard in os.scandir(self.directory):
+            if not shard.is_dir(follow_symlinks=False):
+                continue
+            for entry in os.scandir(shard.path):
+                if not entry.name.endswith(".txt"):
+                    continue
+                try:
+                    stat = entry.stat(follow_symlinks=False)
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime_ns, stat.st_size, Path(entry.path)))
+        return entries
+
+    def _evict(self) -> None:
+        # Rescan so entries written by other processes are accounted for too.
+        entries = sorted(self._entries())
+        size = sum(entry_size for _, entry_size, _ in entries)
+        for _, entry_size, path in entries:
+            if size <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            size -= entry_size
+        self._size = size
+
+    def summary(self) -> str:
+        return f"OCR cache: {self.hits} hit(s), {self.misses} miss(es)"
+
+
+def open_ocr_cache(enabled: bool | None, directory: Path | None, size_mb: int) -> OcrCache | None:
+    """
+    enabled is None when neither --ocr-cache nor --no-ocr-cache was given; a
+    directory then turns the cache on, but an explicit --no-ocr-cache always wins.
+    """
+    # Off unless asked for: cached text outlives the images it came from.
+    if enabled is False or (enabled is None and directory is None):
+        return None
+    return OcrCache(directory=directory or default_cache_dir(), max_bytes=size_mb * BYTES_PER_MB)
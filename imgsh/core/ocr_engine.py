@@ -1,14 +1,79 @@
 from __future__ import annotations
 
+import inspect
+import os
+import tempfile
+import threading
+from abc import ABC, abstractmethod
 from pathlib import Path
+from typing import TYPE_CHECKING, Callable
 
 from imgsh.core.errors import ImgshError
 
+if TYPE_CHECKING:
+    from PIL import Image
+
 LANG_CODE_MAP = {
     "en": "eng",
 }
 
 
+def _tesseract_language(lang: str) -> str:
+    return LANG_CODE_MAP.get(lang.lower(), lang)
+
+
+class OCRBackend(ABC):
+    """Base class for OCR engines; register subclasses with register_backend."""
+
+    name = ""
+
+    @abstractmethod
+    def extract_text(self, input_path: Path, lang: str) -> str: ...
+
+    def extract_text_from_image(self, image: Image.Image, lang: str) -> str:
+        # Fallback for engines that only read files: a fast lossless temp copy.
+        handle, temp_name = tempfile.mkstemp(prefix="imgsh-ocr-", suffix=".png")
+        os.close(handle)
+        temp_path = Path(temp_name)
+        try:
+            image.save(temp_path, format="PNG", compress_level=1)
+            return self.extract_text(input_path=temp_path, lang=lang)
+        finally:
+            temp_path.unlink(missing_ok=True)
+
+
+_BACKEND_FACTORIES: dict[str, Callable[[], OCRBackend]] = {}
+_BACKENDS: dict[str, OCRBackend] = {}
+_BACKENDS_LOCK = threading.Lock()
+
+
+def register_backend(name: str, factory: Callable[[], OCRBackend]) -> None:
+    # Backends are built on first use; reject an incomplete class now rather than mid-batch.
+    if inspect.isclass(factory) and inspect.isabstract(factory):
+        missing = ", ".join(sorted(factory.__abstractmethods__))
+        raise ImgshError(f"OCR engine '{name}' does not implement: {missing}")
+    with _BACKENDS_LOCK:
+        _BACKEND_FACTORIES[name] = factory
+        _BACKENDS.pop(name, None)
+
+
+def available_backends() -> list[str]:
+    return sorted(_BACKEND_FACTORIES)
+
+
+def get_backend(name: str) -> OCRBackend:
+    """Return the process-wide instance of a backend, creating it on first use."""
+    with _BACKENDS_LOCK:
+        backend = _BACKENDS.get(name)
+        if backend is None:
+            factory = _BACKEND_FACTORIES.get(name)
+            if factory is None:
+                supported = ", ".join(sorted(_BACKEND_FACTORIES))
+                raise ImgshError(f"Unsupported OCR engine '{name}'. Supported values: {supported}")
+            backend = _BACKENDS[name] = factory()
+        return backend
+
+
 def _load_textract():
     try:
         import textract  # type: ignore
@@ -21,7 +86,7 @@ def _load_textract():
 
 def extract_text_with_textract(input_path: Path, lang: str) -> str:
     textract = _load_textract()
-    language = LANG_CODE_MAP.get(lang.lower(), lang)
+    language = _tesseract_language(lang)
 
     try:
         data = textract.process(str(input_path), language=language)
@@ -34,3 +99,69 @@ def extract_text_with_textract(input_path: Path, lang: str) -> str:
     if isinstance(data, bytes):
         return data.decode("utf-8", errors="replace")
     return str(data)
+
+
+class TextractBackend(OCRBackend):
+    """Runs the tesseract executable through textract; one process per image."""
+
+    name = "textract"
+
+    def extract_text(self, input_path: Path, lang: str) -> str:
+        return extract_text_with_textract(input_path=input_path, lang=lang)
+
+
+def _load_tesserocr():
+    try:
+        import tesserocr  # type: ignore
+    except ImportError as exc:
+        raise ImgshError(
+            "OCR engine 'tesserocr' is not installed. Install with: pip install tesserocr"
+        ) from exc
+    return tesserocr
+
+
+class TesserocrBackend(OCRBackend):
+    """
+    In-process tesseract. Each thread keeps one initialised API per language, so
+    the language model is loaded once per worker instead of once per image.
+    """
+
+    name = "tesserocr"
+
+    def __init__(self) -> None:
+        self._tesserocr = _load_tesserocr()
+        self._local = threading.local()
+
+    def _api(self, lang: str):
+        apis = getattr(self._local, "apis", None)
+        if apis is None:
+            apis = self._local.apis = {}
+        language = _tesseract_language(lang)
+        api = apis.get(language)
+        if api is None:
+            try:
+                api = self._tesserocr.PyTessBaseAPI(lang=language)
+            except RuntimeError as exc:
+                raise ImgshError(f"Could not start tesseract for language '{lang}': {exc}") from exc
+            apis[language] = api
+        return api
+
+    def extract_text(self, input_path: Path, lang: str) -> str:
+        api = self._api(lang)
+        try:
+            api.SetImageFile(str(input_path))
+            return api.GetUTF8Text()
+        except RuntimeError as exc:
+            raise ImgshError(f"OCR failed for '{input_path}': {exc}") from exc
+
+    def extract_text_from_image(self, image: Image.Image, lang: str) -> str:
+        api = self._api(lang)
+        try:
+            api.SetImage(image)
+            return api.GetUTF8Text()
+        except RuntimeError as exc:
+            raise ImgshError(f"OCR failed: {exc}") from exc
+
+
+register_backend(TextractBackend.name, TextractBackend)
+register_backend(TesserocrBackend.name, TesserocrBackend)
@@ -2,27 +2,465 @@ from __future__ import annotations
 
 import json
 from dataclasses import dataclass
+from io import BytesIO
 from pathlib import Path
 
 from PIL import Image
 
-from imgsh.config import DEFAULT_OCR_ENGINE, DEFAULT_OCR_FORMAT, DEFAULT_QUALITY
-from imgsh.core.crop_engine import crop_image
+from imgsh.config import (
+    DEFAULT_EXTENSION_FOR_FORMAT,
+    DEFAULT_FIT,
+    DEFAULT_OCR_ENGINE,
+    DEFAULT_OCR_FORMAT,
+    DEFAULT_RESAMPLE,
+    LOSSY_FORMATS,
+)
+from imgsh.core.crop_engine import crop_image, crop_region
+from imgsh.core.encode_engine import check_output_limits, save_output
 from imgsh.core.errors import ImgshError
 from imgsh.core.format_engine import resolve_output_format
-from imgsh.core.metadata import auto_orient, get_exif_bytes, save_image
-from imgsh.core.ocr_engine import extract_text_with_textract
-from imgsh.core.resize_engine import resize_image
-from imgsh.utils.file_utils import ensure_not_exists_unless_overwrite, resolve_single_output_path
+from imgsh.core.memory import check_budget, open_image
+from imgsh.core.metadata import (
+    apply_orientation,
+    auto_orient,
+    encode_image,
+    get_exif_bytes,
+    get_orientation,
+    oriented_size,
+    raw_box,
+    raw_size,
+    save_image,
+)
+from imgsh.core.ocr_cache import OcrCache
+from imgsh.core.ocr_engine import get_backend
+from imgsh.core.resize_engine import (
+    DRAFT_OVERSAMPLE,
+    LOW_MEMORY_DRAFT_OVERSAMPLE,
+    apply_draft,
+    cover_box,
+    resample_in_strips,
+    resample_to,
+    resize_image,
+    target_size,
+)
+from imgsh.core.timing import NULL_TIMER, StageTimer, Timer, make_timer
+from imgsh.utils.file_utils import (
+    clone_file,
+    ensure_not_exists_unless_overwrite,
+    resolve_single_output_path,
+)
+
+
+# A rendition is resized from the previous (larger) one when that is at least this
+# many times the target width; otherwise it is resized from the full source.
+RENDITION_CHAIN_FACTOR = 2.0
 
 
 @dataclass
 class ProcessResult:
     output_path: Path
     ocr_path: Path | None = None
+    # Output dimensions, and the oriented source dimensions (before any draft decode).
+    size: tuple[int, int] | None = None
+    source_size: tuple[int, int] | None = None
+    # Rendered pixels, kept only with keep_image=True so OCR can run on them later.
+    image: Image.Image | None = None
+    # Per-stage timings with timings=True; renditions attach one timer to the first result.
+    timings: StageTimer | None = None
+    # Encode quality picked by the max_output_bytes / target_ssim search.
+    quality: int | None = None
+
+
+def prepare_output(
+    input_path: Path,
+    out: Path | None,
+    output_format: str | None,
+    overwrite: bool,
+    default_suffix: str,
+) -> tuple[str, Path]:
+    pillow_format, extension = resolve_output_format(output_format, out, input_path)
+    output_path = resolve_single_output_path(
+        input_path=input_path,
+        out=out,
+        extension=extension,
+        default_suffix=default_suffix,
+    )
+    ensure_not_exists_unless_overwrite(output_path, overwrite=overwrite)
+    return pillow_format, output_path
+
+
+def is_passthrough(
+    image: Image.Image,
+    pillow_format: str,
+    quality: int | None,
+    preserve_exif: bool,
+    max_output_bytes: int | None = None,
+    source_bytes: int = 0,
+    target_ssim: float | None = None,
+) -> bool:
+    """
+    True when re-encoding image (opened, not decoded) unchanged as pillow_format could
+    only reproduce it: same format, upright, a single frame, metadata kept, no
+    explicit quality or target_ssim for a lossy format and the source file
+    (source_bytes) within max_output_bytes. The file can then be copied byte for byte.
+    Size and SSIM targets for a lossless format raise ImgshError, as re-encoding would.
+    """
+    check_output_limits(pillow_format, max_output_bytes, target_ssim)
+    return (
+        image.format == pillow_format
+        and get_orientation(image) == 1
+        and getattr(image, "n_frames", 1) == 1
+        and preserve_exif
+        and ((quality is None and target_ssim is None) or pillow_format not in LOSSY_FORMATS)
+        and (max_output_bytes is None or source_bytes <= max_output_bytes)
+    )
+
+
+def is_identity_resize(
+    image: Image.Image,
+    width: int | None,
+    height: int | None,
+    keep_aspect: bool,
+    fit: str,
+    crop_box: tuple[float, float, float, float] | None = None,
+) -> bool:
+    """True when the resize options would leave image (opened, not decoded) as it is."""
+    if crop_box is not None or (fit == "cover" and (width is None or height is None)):
+        return False
+    size = oriented_size(image)
+    return target_size(size, width, height, keep_aspect, fit) == size
+
+
+def rendition_targets(
+    input_path: Path,
+    out: Path | None,
+    sizes: list[int],
+    formats: list[str] | None,
+    overwrite: bool,
+    stem: str | None = None,
+) -> list[tuple[int, str, Path]]:
+    """(width, pillow format, output path) for every size x format, largest size first."""
+    if out is not None and out.suffix and not out.is_dir():
+        raise ImgshError("--out must be a directory when --sizes is used.")
+    target_dir = out if out is not None else input_path.parent
+    base_stem = stem or input_path.stem
+
+    targets: list[tuple[int, str, Path]] = []
+    for size in sorted(set(sizes), reverse=True):
+        for requested_format in formats or [None]:
+            pillow_format, extension = resolve_output_format(requested_format, None, input_path)
+            output_path = target_dir / f"{base_stem}_{size}{extension}"
+            ensure_not_exists_unless_overwrite(output_path, overwrite=overwrite)
+            targets.append((size, pillow_format, output_path))
+    return targets
 
 
 class ImageProcessor:
+    def render(
+        self,
+        image: Image.Image,
+        width: int | None,
+        height: int | None,
+        keep_aspect: bool,
+        fit: str,
+        crop_box: tuple[float, float, float, float] | None = None,
+        resample: str = DEFAULT_RESAMPLE,
+        reducing_gap: float | None = None,
+        timer: Timer = NULL_TIMER,
+    ) -> Image.Image:
+        """Crop (optional) and resize an already oriented image in one resampling pass."""
+        box = crop_region(image.size, *crop_box) if crop_box else None
+        with timer.stage("resize"):
+            return resize_image(
+                image=image,
+                width=width,
+                height=height,
+                keep_aspect=keep_aspect,
+                fit=fit,
+                resample=resample,
+                reducing_gap=reducing_gap,
+                box=box,
+            )
+
+    def render_low_memory(
+        self,
+        image: Image.Image,
+        width: int | None,
+        height: int | None,
+        keep_aspect: bool,
+        fit: str,
+        crop_box: tuple[int, int, int, int] | None = None,
+        resample: str = DEFAULT_RESAMPLE,
+        reducing_gap: float | None = None,
+        timer: Timer = NULL_TIMER,
+    ) -> Image.Image:
+        """
+        render for a decoded image that has not been oriented: the crop and cover box
+        are mapped onto the stored pixels and folded into a strip-wise resize, so no
+        full-size copy is made, and only the output is transposed upright.
+        """
+        orientation = get_orientation(image)
+        region_width, region_height = oriented_size(image)
+        left = top = 0
+        if crop_box:
+            left, top, region_width, region_height = crop_box
+        box = crop_region(oriented_size(image), left, top, region_width, region_height)
+
+        if width is None and height is None:
+            if fit == "cover":
+                raise ImgshError("Fit mode 'cover' requires both --width and --height.")
+            with timer.stage("crop"):
+                output = image.crop(
+                    tuple(round(edge) for edge in raw_box(box, orientation, image.size))
+                )
+        else:
+            if fit == "cover":
+                if width is None or height is None:
+                    raise ImgshError("Fit mode 'cover' requires both --width and --height.")
+                cover_left, cover_top, cover_right, cover_bottom = cover_box(
+                    (region_width, region_height), (width, height)
+                )
+                box = (left + cover_left, top + cover_top, left + cover_right, top + cover_bottom)
+            size = tuple(
+                max(1, round(side))
+                for side in target_size(
+                    (region_width, region_height), width, height, keep_aspect, fit
+                )
+            )
+            with timer.stage("resize"):
+                output = resample_in_strips(
+                    image,
+                    raw_size(size, orientation),
+                    box=raw_box(box, orientation, image.size),
+                    resample=resample,
+                    reducing_gap=reducing_gap,
+                )
+        with timer.stage("orient"):
+            return apply_orientation(output, orientation)
+
+    def render_renditions(
+        self,
+        image: Image.Image,
+        sizes: list[int],
+        crop_box: tuple[int, int, int, int] | None = None,
+        resample: str = DEFAULT_RESAMPLE,
+        reducing_gap: float | None = None,
+        timer: Timer = NULL_TIMER,
+        low_memory: bool = False,
+    ) -> dict[int, Image.Image]:
+        """
+        Resize an oriented image to each width, largest first, reusing larger results.
+        With low_memory, image is not yet oriented and is read through render_low_memory.
+        """
+        box = None
+        if low_memory:
+            region = (crop_box[2], crop_box[3]) if crop_box else oriented_size(image)
+        elif crop_box:
+            # The crop is folded into each resize from the source; nothing is copied.
+            box = crop_region(image.size, *crop_box)
+            region = (crop_box[2], crop_box[3])
+        else:
+            region = image.size
+
+        rendered: dict[int, Image.Image] = {}
+        previous: Image.Image | None = None
+        for size in sorted(set(sizes), reverse=True):
+            # Size from the full image so chained results match a direct resize exactly.
+            size_px = target_size(region, width=size, height=None, keep_aspect=True, fit="contain")
+            if previous is not None and previous.width >= size * RENDITION_CHAIN_FACTOR:
+                with timer.stage("resize"):
+                    previous = resample_to(
+                        previous, size_px, resample=resample, reducing_gap=reducing_gap
+                    )
+            elif low_memory:
+                previous = self.render_low_memory(
+                    image=image,
+                    width=size,
+                    height=None,
+                    keep_aspect=True,
+                    fit="contain",
+                    crop_box=crop_box,
+                    resample=resample,
+                    reducing_gap=reducing_gap,
+                    timer=timer,
+                )
+            else:
+                with timer.stage("resize"):
+                    previous = resample_to(
+                        image, size_px, box=box, resample=resample, reducing_gap=reducing_gap
+                    )
+            rendered[size] = previous
+        return rendered
+
+    def _copy_source(
+        self,
+        input_path: Path,
+        output_path: Path,
+        size: tuple[int, int],
+        hardlink: bool,
+        overwrite: bool,
+        ocr: bool,
+        ocr_engine: str,
+        ocr_out: Path | None,
+        ocr_format: str,
+        lang: str,
+        ocr_cache: OcrCache | None,
+        timer: Timer,
+    ) -> ProcessResult:
+        """Write an output identical to its input by copying the file, not re-encoding it."""
+        with timer.stage("copy"):
+            clone_file(input_path, output_path, hardlink=hardlink)
+        timer.record_output(output_path, size)
+        ocr_path: Path | None = None
+        if ocr:
+            ocr_path = self.extract_text(
+                input_path=output_path,
+                out=ocr_out,
+                engine=ocr_engine,
+                output_format=ocr_format,
+                lang=lang,
+                overwrite=overwrite,
+                cache=ocr_cache,
+                timer=timer,
+            )
+        return ProcessResult(
+            output_path=output_path,
+            ocr_path=ocr_path,
+            size=size,
+            source_size=size,
+            timings=timer if timer.enabled else None,
+        )
+
+    def renditions(
+        self,
+        input_path: Path,
+        out: Path | None,
+        sizes: list[int],
+        formats: list[str] | None = None,
+        stem: str | None = None,
+        crop_box: tuple[int, int, int, int] | None = None,
+        quality: int | None = None,
+        preserve_exif: bool = True,
+        overwrite: bool = False,
+        ocr: bool = False,
+        ocr_engine: str = DEFAULT_OCR_ENGINE,
+        ocr_out: Path | None = None,
+        ocr_format: str = DEFAULT_OCR_FORMAT,
+        lang: str = "en",
+        ocr_cache: OcrCache | None = None,
+        draft: bool = True,
+        resample: str = DEFAULT_RESAMPLE,
+        reducing_gap: float | None = None,
+        keep_image: bool = False,
+        timings: bool = False,
+        low_memory: bool = False,
+        max_pixels: int | None = None,
+        max_bytes: int | None = None,
+        max_output_bytes: int | None = None,
+        target_ssim: float | None = None,
+        search_jobs: int = 1,
+    ) -> list[ProcessResult]:
+        """
+        Write every width in sizes in every format in formats from a single decode.
+        Outputs are named {stem}_{width}{ext} inside out (default: next to the input).
+        """
+        targets = rendition_targets(
+            input_path=input_path,
+            out=out,
+            sizes=sizes,
+            formats=formats,
+            overwrite=overwrite,
+            stem=stem,
+        )
+        timer = make_timer(timings)
+        budgeted = max_pixels is not None or max_bytes is not None
+
+        with timer.stage("open"):
+            source_image = open_image(input_path, budgeted=budgeted, name=input_path)
+        with source_image:
+            timer.record_input(input_path, source_image.size)
+            source_size = oriented_size(source_image)
+            if draft:
+                crop_box = apply_draft(
+                    image=source_image,
+                    width=max(sizes),
+                    height=None,
+                    keep_aspect=True,
+                    fit="contain",
+                    crop_box=crop_box,
+                    oversample=LOW_MEMORY_DRAFT_OVERSAMPLE if low_memory else DRAFT_OVERSAMPLE,
+                )
+            if budgeted:
+                region = (crop_box[2], crop_box[3]) if crop_box else oriented_size(source_image)
+                check_budget(
+                    source_image,
+                    output_size=target_size(region, max(sizes), None, True, "contain"),
+                    max_pixels=max_pixels,
+                    max_bytes=max_bytes,
+                    low_memory=low_memory,
+                    name=input_path,
+                )
+            with timer.stage("decode"):
+                source_image.load()
+            if low_memory:
+                # render_renditions orients each output instead of the whole source.
+                working_image = source_image
+            else:
+                with timer.stage("orient"):
+                    working_image = auto_orient(source_image)
+            rendered = self.render_renditions(
+                image=working_image,
+                sizes=sizes,
+                crop_box=crop_box,
+                resample=resample,
+                reducing_gap=reducing_gap,
+                timer=timer,
+                low_memory=low_memory,
+            )
+            exif_bytes = get_exif_bytes(source_image) if preserve_exif else None
+            results = []
+            for size, pillow_format, output_path in targets:
+                with timer.stage("encode"):
+                    chosen_quality = save_output(
+                        image=rendered[size],
+                        output_path=output_path,
+                        pillow_format=pillow_format,
+                        quality=quality,
+                        exif_bytes=exif_bytes,
+                        max_output_bytes=max_output_bytes,
+                        target_ssim=target_ssim,
+                        jobs=search_jobs,
+                    )
+                timer.record_output(output_path, rendered[size].size)
+                results.append(
+                    ProcessResult(
+                        output_path=output_path,
+                        size=rendered[size].size,
+                        source_size=source_size,
+                        quality=chosen_quality,
+                    )
+                )
+
+        largest = rendered[targets[0][0]]
+        if ocr:
+            # OCR the largest rendition once; the text is the same at every size.
+            results[0].ocr_path = self.extract_text(
+                input_path=results[0].output_path,
+                out=ocr_out,
+                engine=ocr_engine,
+                output_format=ocr_format,
+                lang=lang,
+                overwrite=overwrite,
+                cache=ocr_cache,
+                image=largest,
+                timer=timer,
+            )
+        if keep_image:
+            results[0].image = largest
+        if timings:
+            results[0].timings = timer
+        return results
+
     def resize(
         self,
         input_path: Path,
@@ -32,7 +470,7 @@ class ImageProcessor:
         keep_aspect: bool,
         fit: str,
         crop_box: tuple[int, int, int, int] | None = None,
-        quality: int = DEFAULT_QUALITY,
+        quality: int | None = None,
         output_format: str | None = None,
         preserve_exif: bool = True,
         overwrite: bool = False,
@@ -41,43 +479,113 @@ class ImageProcessor:
         ocr_out: Path | None = None,
         ocr_format: str = DEFAULT_OCR_FORMAT,
         lang: str = "en",
+        ocr_cache: OcrCache | None = None,
+        draft: bool = True,
+        resample: str = DEFAULT_RESAMPLE,
+        reducing_gap: float | None = None,
+        keep_image: bool = False,
+        timings: bool = False,
+        low_memory: bool = False,
+        max_pixels: int | None = None,
+        max_bytes: int | None = None,
+        hardlink: bool = False,
+        max_output_bytes: int | None = None,
+        target_ssim: float | None = None,
+        search_jobs: int = 1,
     ) -> ProcessResult:
-        pillow_format, extension = resolve_output_format(output_format, out, input_path)
-        output_path = resolve_single_output_path(
+        pillow_format, output_path = prepare_output(
             input_path=input_path,
             out=out,
-            extension=extension,
+            output_format=output_format,
+            overwrite=overwrite,
             default_suffix="_imgsh",
         )
-        ensure_not_exists_unless_overwrite(output_path, overwrite=overwrite)
+        timer = make_timer(timings)
+        budgeted = max_pixels is not None or max_bytes is not None
 
-        with Image.open(input_path) as source_image:
-            oriented = auto_orient(source_image)
-            working_image = oriented
-            if crop_box:
-                crop_x, crop_y, crop_width, crop_height = crop_box
-                working_image = crop_image(
-                    image=working_image,
-                    x=crop_x,
-                    y=crop_y,
-                    width=crop_width,
-                    height=crop_height,
-                )
-            resized = resize_image(
+        with timer.stage("open"):
+            source_image = open_image(input_path, budgeted=budgeted, name=input_path)
+        with source_image:
+            timer.record_input(input_path, source_image.size)
+            source_size = oriented_size(source_image)
+            if is_identity_resize(
+                source_image, width, height, keep_aspect, fit, crop_box
+            ) and is_passthrough(
+                source_image,
+                pillow_format,
+                quality,
+                preserve_exif,
+                max_output_bytes,
+                source_bytes=input_path.stat().st_size,
+                target_ssim=target_ssim,
+            ):
+                return self._copy_source(
+                    input_path=input_path,
+                    output_path=output_path,
+                    size=source_size,
+                    hardlink=hardlink,
+                    overwrite=overwrite,
+                    ocr=ocr,
+                    ocr_engine=ocr_engine,
+                    ocr_out=ocr_out,
+                    ocr_format=ocr_format,
+                    lang=lang,
+                    ocr_cache=ocr_cache,
+                    timer=timer,
+                )
+            if draft:
+                # Decode JPEGs at reduced scale when the output is much smaller.
+                crop_box = apply_draft(
+                    image=source_image,
+                    width=width,
+                    height=height,
+                    keep_aspect=keep_aspect,
+                    fit=fit,
+                    crop_box=crop_box,
+                    oversample=LOW_MEMORY_DRAFT_OVERSAMPLE if low_memory else DRAFT_OVERSAMPLE,
+                )
+            if budgeted:
+                region = (crop_box[2], crop_box[3]) if crop_box else oriented_size(source_image)
+                check_budget(
+                    source_image,
+                    output_size=target_size(region, width, height, keep_aspect, fit),
+                    max_pixels=max_pixels,
+                    max_bytes=max_bytes,
+                    low_memory=low_memory,
+                    name=input_path,
+                )
+            with timer.stage("decode"):
+                source_image.load()
+            if low_memory:
+                render, working_image = self.render_low_memory, source_image
+            else:
+                render = self.render
+                with timer.stage("orient"):
+                    working_image = auto_orient(source_image)
+            resized = render(
                 image=working_image,
                 width=width,
                 height=height,
                 keep_aspect=keep_aspect,
                 fit=fit,
+                crop_box=crop_box,
+                resample=resample,
+                reducing_gap=reducing_gap,
+                timer=timer,
             )
             exif_bytes = get_exif_bytes(source_image) if preserve_exif else None
-            save_image(
-                image=resized,
-                output_path=output_path,
-                pillow_format=pillow_format,
-                quality=quality,
-                exif_bytes=exif_bytes,
-            )
+            with timer.stage("encode"):
+                chosen_quality = save_output(
+                    image=resized,
+                    output_path=output_path,
+                    pillow_format=pillow_format,
+                    quality=quality,
+                    exif_bytes=exif_bytes,
+                    max_output_bytes=max_output_bytes,
+                    target_ssim=target_ssim,
+                    jobs=search_jobs,
+                )
+            timer.record_output(output_path, resized.size)
 
         ocr_path: Path | None = None
         if ocr:
@@ -88,8 +596,90 @@ class ImageProcessor:
                 output_format=ocr_format,
                 lang=lang,
                 overwrite=overwrite,
+                cache=ocr_cache,
+                image=resized,
+                timer=timer,
             )
-        return ProcessResult(output_path=output_path, ocr_path=ocr_path)
+        return ProcessResult(
+            output_path=output_path,
+            ocr_path=ocr_path,
+            size=resized.size,
+            source_size=source_size,
+            image=resized if keep_image else None,
+            timings=timer if timings else None,
+            quality=chosen_quality,
+        )
+
+    def resize_bytes(
+        self,
+        data: bytes,
+        width: int | None,
+        height: int | None,
+        keep_aspect: bool = True,
+        fit: str = DEFAULT_FIT,
+        crop_box: tuple[int, int, int, int] | None = None,
+        quality: int | None = None,
+        output_format: str | None = None,
+        preserve_exif: bool = True,
+        draft: bool = True,
+        resample: str = DEFAULT_RESAMPLE,
+        reducing_gap: float | None = None,
+        max_pixels: int | None = None,
+        max_bytes: int | None = None,
+    ) -> tuple[bytes, str, tuple[int, int]]:
+        """
+        resize for an encoded image held in memory: no files are read or written.
+        Returns (encoded output, Pillow format, output size).
+        """
+        budgeted = max_pixels is not None or max_bytes is not None
+        source_image = open_image(BytesIO(data), budgeted=budgeted, name="upload")
+        with source_image:
+            if output_format:
+                pillow_format, _ = resolve_output_format(output_format, None, Path())
+            elif source_image.format in DEFAULT_EXTENSION_FOR_FORMAT:
+                pillow_format = source_image.format
+            else:
+                raise ImgshError(
+                    f"Cannot write {source_image.format} images; choose a format: jpg, png, webp."
+                )
+            if is_identity_resize(
+                source_image, width, height, keep_aspect, fit, crop_box
+            ) and is_passthrough(source_image, pillow_format, quality, preserve_exif):
+                return data, pillow_format, source_image.size
+            if draft:
+                crop_box = apply_draft(
+                    image=source_image,
+                    width=width,
+                    height=height,
+                    keep_aspect=keep_aspect,
+                    fit=fit,
+                    crop_box=crop_box,
+                )
+            if budgeted:
+                region = (crop_box[2], crop_box[3]) if crop_box else oriented_size(source_image)
+                check_budget(
+                    source_image,
+                    output_size=target_size(region, width, height, keep_aspect, fit),
+                    max_pixels=max_pixels,
+                    max_bytes=max_bytes,
+                    name="upload",
+                )
+            source_image.load()
+            resized = self.render(
+                image=auto_orient(source_image),
+                width=width,
+                height=height,
+                keep_aspect=keep_aspect,
+                fit=fit,
+                crop_box=crop_box,
+                resample=resample,
+                reducing_gap=reducing_gap,
+            )
+            exif_bytes = get_exif_bytes(source_image) if preserve_exif else None
+        encoded = encode_image(
+            image=resized, pillow_format=pillow_format, quality=quality, exif_bytes=exif_bytes
+        )
+        return encoded, pillow_format, resized.size
 
     def crop(
         self,
@@ -99,7 +689,7 @@ class ImageProcessor:
         y: int,
         width: int,
         height: int,
-        quality: int = DEFAULT_QUALITY,
+        quality: int | None = None,
         output_format: str | None = None,
         preserve_exif: bool = True,
         overwrite: bool = False,
@@ -108,33 +698,69 @@ class ImageProcessor:
         ocr_out: Path | None = None,
         ocr_format: str = DEFAULT_OCR_FORMAT,
         lang: str = "en",
+        ocr_cache: OcrCache | None = None,
+        timings: bool = False,
+        low_memory: bool = False,
+        max_pixels: int | None = None,
+        max_bytes: int | None = None,
     ) -> ProcessResult:
-        pillow_format, extension = resolve_output_format(output_format, out, input_path)
-        output_path = resolve_single_output_path(
+        pillow_format, output_path = prepare_output(
             input_path=input_path,
             out=out,
-            extension=extension,
+            output_format=output_format,
+            overwrite=overwrite,
             default_suffix="_crop",
         )
-        ensure_not_exists_unless_overwrite(output_path, overwrite=overwrite)
+        timer = make_timer(timings)
+        budgeted = max_pixels is not None or max_bytes is not None
 
-        with Image.open(input_path) as source_image:
-            oriented = auto_orient(source_image)
-            cropped = crop_image(
-                image=oriented,
-                x=x,
-                y=y,
-                width=width,
-                height=height,
-            )
+        with timer.stage("open"):
+            source_image = open_image(input_path, budgeted=budgeted, name=input_path)
+        with source_image:
+            timer.record_input(input_path, source_image.size)
+            source_size = oriented_size(source_image)
+            if budgeted:
+                check_budget(
+                    source_image,
+                    output_size=(width, height),
+                    max_pixels=max_pixels,
+                    max_bytes=max_bytes,
+                    low_memory=low_memory,
+                    name=input_path,
+                )
+            with timer.stage("decode"):
+                source_image.load()
+            if low_memory:
+                cropped = self.render_low_memory(
+                    image=source_image,
+                    width=None,
+                    height=None,
+                    keep_aspect=True,
+                    fit="contain",
+                    crop_box=(x, y, width, height),
+                    timer=timer,
+                )
+            else:
+                with timer.stage("orient"):
+                    oriented = auto_orient(source_image)
+                with timer.stage("crop"):
+                    cropped = crop_image(
+                        image=oriented,
+                        x=x,
+                        y=y,
+                        width=width,
+                        height=height,
+                    )
             exif_bytes = get_exif_bytes(source_image) if preserve_exif else None
-            save_image(
-                image=cropped,
-                output_path=output_path,
-                pillow_format=pillow_format,
-                quality=quality,
-                exif_bytes=exif_bytes,
-            )
+            with timer.stage("encode"):
+                save_image(
+                    image=cropped,
+                    output_path=output_path,
+                    pillow_format=pillow_format,
+                    quality=quality,
+                    exif_bytes=exif_bytes,
+                )
+            timer.record_output(output_path, cropped.size)
 
         ocr_path: Path | None = None
         if ocr:
@@ -145,15 +771,24 @@ class ImageProcessor:
                 output_format=ocr_format,
                 lang=lang,
                 overwrite=overwrite,
+                cache=ocr_cache,
+                image=cropped,
+                timer=timer,
             )
-        return ProcessResult(output_path=output_path, ocr_path=ocr_path)
+        return ProcessResult(
+            output_path=output_path,
+            ocr_path=ocr_path,
+            size=cropped.size,
+            source_size=source_size,
+            timings=timer if timings else None,
+        )
 
     def convert(
         self,
         input_path: Path,
         out: Path | None,
         output_format: str,
-        quality: int = DEFAULT_QUALITY,
+        quality: int | None = None,
         preserve_exif: bool = True,
         overwrite: bool = False,
         ocr: bool = False,
@@ -161,26 +796,78 @@ class ImageProcessor:
         ocr_out: Path | None = None,
         ocr_format: str = DEFAULT_OCR_FORMAT,
         lang: str = "en",
+        ocr_cache: OcrCache | None = None,
+        timings: bool = False,
+        max_pixels: int | None = None,
+        max_bytes: int | None = None,
+        hardlink: bool = False,
+        max_output_bytes: int | None = None,
+        target_ssim: float | None = None,
+        search_jobs: int = 1,
     ) -> ProcessResult:
-        pillow_format, extension = resolve_output_format(output_format, out, input_path)
-        output_path = resolve_single_output_path(
+        pillow_format, output_path = prepare_output(
             input_path=input_path,
             out=out,
-            extension=extension,
+            output_format=output_format,
+            overwrite=overwrite,
             default_suffix="_converted",
         )
-        ensure_not_exists_unless_overwrite(output_path, overwrite=overwrite)
+        timer = make_timer(timings)
+        budgeted = max_pixels is not None or max_bytes is not None
 
-        with Image.open(input_path) as source_image:
-            oriented = auto_orient(source_image)
+        with timer.stage("open"):
+            source_image = open_image(input_path, budgeted=budgeted, name=input_path)
+        with source_image:
+            timer.record_input(input_path, source_image.size)
+            source_size = oriented_size(source_image)
+            if is_passthrough(
+                source_image,
+                pillow_format,
+                quality,
+                preserve_exif,
+                max_output_bytes,
+                source_bytes=input_path.stat().st_size,
+                target_ssim=target_ssim,
+            ):
+                return self._copy_source(
+                    input_path=input_path,
+                    output_path=output_path,
+                    size=source_size,
+                    hardlink=hardlink,
+                    overwrite=overwrite,
+                    ocr=ocr,
+                    ocr_engine=ocr_engine,
+                    ocr_out=ocr_out,
+                    ocr_format=ocr_format,
+                    lang=lang,
+                    ocr_cache=ocr_cache,
+                    timer=timer,
+                )
+            if budgeted:
+                check_budget(
+                    source_image,
+                    output_size=source_size,
+                    max_pixels=max_pixels,
+                    max_bytes=max_bytes,
+                    name=input_path,
+                )
+            with timer.stage("decode"):
+                source_image.load()
+            with timer.stage("orient"):
+                oriented = auto_orient(source_image)
             exif_bytes = get_exif_bytes(source_image) if preserve_exif else None
-            save_image(
-                image=oriented,
-                output_path=output_path,
-                pillow_format=pillow_format,
-                quality=quality,
-                exif_bytes=exif_bytes,
-            )
+            with timer.stage("encode"):
+                chosen_quality = save_output(
+                    image=oriented,
+                    output_path=output_path,
+                    pillow_format=pillow_format,
+                    quality=quality,
+                    exif_bytes=exif_bytes,
+                    max_output_bytes=max_output_bytes,
+                    target_ssim=target_ssim,
+                    jobs=search_jobs,
+                )
+            timer.record_output(output_path, oriented.size)
 
         ocr_path: Path | None = None
         if ocr:
@@ -191,8 +878,18 @@ class ImageProcessor:
                 output_format=ocr_format,
                 lang=lang,
                 overwrite=overwrite,
+                cache=ocr_cache,
+                image=oriented,
+                timer=timer,
             )
-        return ProcessResult(output_path=output_path, ocr_path=ocr_path)
+        return ProcessResult(
+            output_path=output_path,
+            ocr_path=ocr_path,
+            size=oriented.size,
+            source_size=source_size,
+            timings=timer if timings else None,
+            quality=chosen_quality,
+        )
 
     def extract_text(
         self,
@@ -202,13 +899,33 @@ class ImageProcessor:
         output_format: str = DEFAULT_OCR_FORMAT,
         lang: str = "en",
         overwrite: bool = False,
+        image: Image.Image | None = None,
+        cache: OcrCache | None = None,
+        timer: Timer = NULL_TIMER,
     ) -> Path:
-        if engine != "textract":
-            raise ImgshError(f"Unsupported OCR engine '{engine}'. Only 'textract' is supported.")
+        """
+        Write the text of input_path as a sidecar. When image is given (the pixels
+        just written to input_path), OCR runs on it instead of re-reading the file.
+        With a cache, previously seen content is answered without running OCR.
+        """
         if output_format not in {"txt", "json"}:
             raise ImgshError(f"Unsupported OCR output format '{output_format}'. Use txt or json.")
 
-        text = extract_text_with_textract(input_path=input_path, lang=lang)
+        backend = get_backend(engine)
+        cache_key = None
+        text = None
+        if cache is not None:
+            with timer.stage("ocr cache"):
+                cache_key = cache.key(engine=engine, lang=lang, input_path=input_path, image=image)
+                text = cache.get(cache_key)
+        if text is None:
+            with timer.stage("ocr"):
+                if image is not None:
+                    text = backend.extract_text_from_image(image=image, lang=lang)
+                else:
+                    text = backend.extract_text(input_path=input_path, lang=lang)
+            if cache_key is not None:
+                cache.put(cache_key, text)
 
         if out:
             if (out.exists() and out.is_dir()) or out.suffix == "":
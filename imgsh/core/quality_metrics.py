@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from imgsh.config import SSIM_MAX_SIDE, SSIM_WINDOW
+from imgsh.core.errors import ImgshError
+
+if TYPE_CHECKING:
+    from PIL import Image
+
+# Stabilising constants from Wang et al. for 8-bit samples.
+_C1 = (0.01 * 255) ** 2
+_C2 = (0.03 * 255) ** 2
+
+
+def load_numpy() -> Any:
+    try:
+        import numpy  # type: ignore
+    except ImportError as exc:
+        raise ImgshError('--target-ssim needs NumPy. Install with: pip install "imgsh[ssim]"') from exc
+    return numpy
+
+
+def luma(image: Image.Image, max_side: int = SSIM_MAX_SIDE) -> Any:
+    """Luma of image as a float64 array, box-reduced so neither side exceeds max_side."""
+    numpy = load_numpy()
+    gray = image.convert("L")
+    factor = -(-max(gray.size) // max_side)
+    if factor > 1:
+        gray = gray.reduce(factor)
+    return numpy.asarray(gray, dtype=numpy.float64)
+
+
+def _window_means(numpy: Any, plane: Any, window: int) -> Any:
+    # Mean of every window x window block, from an integral image.
+    integral = numpy.pad(plane, ((1, 0), (1, 0))).cumsum(axis=0).cumsum(axis=1)
+    sums = (
+        integral[window:, window:]
+        - integral[:-window, window:]
+        - integral[window:, :-window]
+        + integral[:-window, :-window]
+    )
+    return sums / (window * window)
+
+
+def ssim(reference: Any, candidate: Any, window: int = SSIM_WINDOW) -> float:
+    """Mean SSIM of two equally sized luma arrays over sliding window x window blocks."""
+    numpy = load_numpy()
+    if reference.shape != candidate.shape:
+        raise ImgshError(f"Cannot compare {reference.shape} and {candidate.shape} luma planes.")
+    window = max(1, min(window, *reference.shape))
+    mean_x = _window_means(numpy, reference, window)
+    mean_y = _window_means(numpy, candidate, window)
+    var_x = _window_means(numpy, reference * reference, window) - mean_x * mean_x
+    var_y = _window_means(numpy, candidate * candidate, window) - mean_y * mean_y
+    covariance = _window_means(numpy, reference * candidate, window) - mean_x * mean_y
+    scores = ((2 * mean_x * mean_y + _C1) * (2 * covariance + _C2)) / (
+        (mean_x * mean_x + mean_y * mean_y + _C1) * (var_x + var_y + _C2)
+    )
+    return float(scores.mean())
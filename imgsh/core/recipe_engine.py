@@ -0,0 +1,358 @@
+from __future__ import annotations
+
+import json
+import time
+import tomllib
+from dataclasses import dataclass, fields, replace
+from pathlib import Path
+from typing import Any
+
+from imgsh.config import DEFAULT_FIT, DEFAULT_OCR_ENGINE, DEFAULT_OCR_FORMAT, DEFAULT_RESAMPLE
+from imgsh.core.batch_engine import BatchItem, BatchOutcome
+from imgsh.core.crop_engine import crop_image
+from imgsh.core.errors import ImgshError
+from imgsh.core.format_engine import resolve_output_format
+from imgsh.core.memory import check_budget, open_image
+from imgsh.core.metadata import auto_orient, get_exif_bytes, oriented_size, save_image
+from imgsh.core.processor import ImageProcessor, ProcessResult
+from imgsh.core.resize_engine import apply_draft, target_size
+from imgsh.core.timing import make_timer
+from imgsh.utils.file_utils import ensure_not_exists_unless_overwrite
+from imgsh.utils.validation import (
+    validate_crop_box,
+    validate_ocr_options,
+    validate_quality,
+    validate_resample,
+    validate_resize_dimensions,
+)
+
+DEFAULT_OUTPUT_NAME = "{stem}_pipeline"
+
+
+@dataclass
+class CropStep:
+    x: int
+    y: int
+    width: int
+    height: int
+
+
+@dataclass
+class ResizeStep:
+    width: int | None = None
+    height: int | None = None
+    keep_aspect: bool = True
+    fit: str = DEFAULT_FIT
+    resample: str = DEFAULT_RESAMPLE
+    reducing_gap: float | None = None
+    # Set when the recipe crops right before this resize; both run as one resampling pass.
+    crop_box: tuple[int, int, int, int] | None = None
+
+
+@dataclass
+class ConvertStep:
+    format: str
+    quality: int | None = None
+
+
+@dataclass
+class StripExifStep:
+    pass
+
+
+@dataclass
+class OcrStep:
+    engine: str = DEFAULT_OCR_ENGINE
+    format: str = DEFAULT_OCR_FORMAT
+    lang: str = "en"
+
+
+@dataclass
+class OutputStep:
+    # File name without extension; supports {stem} and {index}.
+    name: str = DEFAULT_OUTPUT_NAME
+    format: str | None = None
+    quality: int | None = None
+
+
+Step = CropStep | ResizeStep | ConvertStep | StripExifStep | OcrStep | OutputStep
+
+STEP_TYPES: dict[str, type] = {
+    "crop": CropStep,
+    "resize": ResizeStep,
+    "convert": ConvertStep,
+    "strip_exif": StripExifStep,
+    "ocr": OcrStep,
+    "output": OutputStep,
+}
+# Filled in while compiling the recipe, never read from the recipe file.
+_INTERNAL_FIELDS = {"crop_box"}
+
+
+@dataclass
+class Recipe:
+    steps: list[Step]
+
+
+def _validate_step(step: Step) -> None:
+    if isinstance(step, CropStep):
+        validate_crop_box(x=step.x, y=step.y, width=step.width, height=step.height)
+    elif isinstance(step, ResizeStep):
+        validate_resize_dimensions(width=step.width, height=step.height, fit=step.fit)
+        validate_resample(step.resample, step.reducing_gap)
+    elif isinstance(step, ConvertStep):
+        resolve_output_format(step.format, None, Path())
+        validate_quality(step.quality)
+    elif isinstance(step, OcrStep):
+        validate_ocr_options(engine=step.engine, output_format=step.format)
+    elif isinstance(step, OutputStep):
+        if step.format is not None:
+            resolve_output_format(step.format, None, Path())
+        validate_quality(step.quality)
+        try:
+            step.name.format(stem="stem", index=1)
+        except (KeyError, IndexError, ValueError) as exc:
+            raise ImgshError(
+                f"Invalid output name '{step.name}'. Supported placeholders: {{stem}}, {{index}}"
+            ) from exc
+
+
+def _parse_step(number: int, raw: Any) -> Step:
+    if not isinstance(raw, dict) or "op" not in raw:
+        raise ImgshError(f"Recipe step {number} must be a table with an 'op' key.")
+    params = dict(raw)
+    op = str(params.pop("op")).replace("-", "_")
+    step_type = STEP_TYPES.get(op)
+    if step_type is None:
+        raise ImgshError(
+            f"Recipe step {number}: unknown op '{op}'. Supported ops: {', '.join(STEP_TYPES)}"
+        )
+    allowed = {item.name for item in fields(step_type)} - _INTERNAL_FIELDS
+    unknown = sorted(set(params) - allowed)
+    if unknown:
+        raise ImgshError(f"Recipe step {number} ({op}): unknown keys {', '.join(unknown)}.")
+    try:
+        step = step_type(**params)
+        _validate_step(step)
+    except TypeError as exc:
+        raise ImgshError(f"Recipe step {number} ({op}): {exc}") from exc
+    except ImgshError as error:
+        raise ImgshError(f"Recipe step {number} ({op}): {error}") from error
+    return step
+
+
+def compile_steps(steps: list[Step]) -> list[Step]:
+    """
+    Plan the per-image work once: fold each crop that directly precedes a resize into
+    that resize, and end with a default output when the recipe names none.
+    """
+    planned: list[Step] = []
+    for step in steps:
+        if isinstance(step, ResizeStep) and planned and isinstance(planned[-1], CropStep):
+            crop = planned.pop()
+            step = replace(step, crop_box=(crop.x, crop.y, crop.width, crop.height))
+        planned.append(step)
+
+    output_positions = [
+        position for position, step in enumerate(planned) if isinstance(step, OutputStep)
+    ]
+    if not output_positions:
+        planned.append(OutputStep())
+    elif any(not isinstance(step, OcrStep) for step in planned[output_positions[-1] + 1 :]):
+        raise ImgshError("Recipe steps after the last output have no effect; add an output step.")
+    return planned
+
+
+def parse_recipe(data: Any) -> Recipe:
+    if not isinstance(data, dict) or not isinstance(data.get("steps"), list) or not data["steps"]:
+        raise ImgshError("A recipe needs a non-empty 'steps' list.")
+    unknown = sorted(set(data) - {"steps"})
+    if unknown:
+        raise ImgshError(f"Unknown recipe keys: {', '.join(unknown)}.")
+    steps = [_parse_step(number, raw) for number, raw in enumerate(data["steps"], start=1)]
+    return Recipe(steps=compile_steps(steps))
+
+
+def load_recipe(path: Path) -> Recipe:
+    suffix = path.suffix.lower()
+    if suffix not in {".json", ".toml"}:
+        raise ImgshError(f"Recipe must be a .json or .toml file, got: {path}")
+    try:
+        if suffix == ".toml":
+            with path.open("rb") as handle:
+                data = tomllib.load(handle)
+        else:
+            data = json.loads(path.read_text(encoding="utf-8"))
+    except FileNotFoundError as exc:
+        raise ImgshError(f"Recipe not found: {path}") from exc
+    except (OSError, ValueError) as exc:
+        raise ImgshError(f"Could not read recipe '{path}': {exc}") from exc
+    return parse_recipe(data)
+
+
+def output_targets(
+    recipe: Recipe,
+    input_path: Path,
+    out_dir: Path,
+    stem: str,
+    index: int = 1,
+    overwrite: bool = False,
+) -> list[tuple[str, int | None, Path]]:
+    """(pillow format, quality, path) for each output step, in recipe order."""
+    requested_format: str | None = None
+    quality: int | None = None
+    targets: list[tuple[str, int | None, Path]] = []
+    for step in recipe.steps:
+        if isinstance(step, ConvertStep):
+            requested_format, quality = step.format, step.quality
+        elif isinstance(step, OutputStep):
+            pillow_format, extension = resolve_output_format(
+                step.format or requested_format, None, input_path
+            )
+            path = out_dir / f"{step.name.format(stem=stem, index=index)}{extension}"
+            if any(path == target_path for _, _, target_path in targets):
+                raise ImgshError(f"Recipe writes '{path}' twice; give each output its own name.")
+            ensure_not_exists_unless_overwrite(path, overwrite=overwrite)
+            output_quality = step.quality if step.quality is not None else quality
+            targets.append((pillow_format, output_quality, path))
+    return targets
+
+
+def run_recipe(
+    recipe: Recipe,
+    input_path: Path,
+    out_dir: Path,
+    stem: str | None = None,
+    index: int = 1,
+    overwrite: bool = False,
+    timings: bool = False,
+    max_pixels: int | None = None,
+    max_bytes: int | None = None,
+) -> list[ProcessResult]:
+    """
+    Run every step on one image with a single decode. Steps work on the in-memory
+    image; files are encoded only by output steps. Returns one result per output.
+    """
+    targets = iter(
+        output_targets(recipe, input_path, out_dir, stem or input_path.stem, index, overwrite)
+    )
+    timer = make_timer(timings)
+    processor = ImageProcessor()
+    budgeted = max_pixels is not None or max_bytes is not None
+
+    with timer.stage("open"):
+        source_image = open_image(input_path, budgeted=budgeted, name=input_path)
+    with source_image:
+        timer.record_input(input_path, source_image.size)
+        source_size = oriented_size(source_image)
+        first = recipe.steps[0]
+        first_crop_box = None
+        if isinstance(first, ResizeStep):
+            # Decode JPEGs at reduced scale when the first step shrinks them a lot.
+            first_crop_box = apply_draft(
+                image=source_image,
+                width=first.width,
+                height=first.height,
+                keep_aspect=first.keep_aspect,
+                fit=first.fit,
+                crop_box=first.crop_box,
+            )
+        if budgeted:
+            region = (first_crop_box[2], first_crop_box[3]) if first_crop_box else oriented_size(source_image)
+            output_size = region
+            if isinstance(first, ResizeStep):
+                output_size = target_size(region, first.width, first.height, first.keep_aspect, first.fit)
+            check_budget(
+                source_image,
+                output_size=output_size,
+                max_pixels=max_pixels,
+                max_bytes=max_bytes,
+                name=input_path,
+            )
+        with timer.stage("decode"):
+            source_image.load()
+        with timer.stage("orient"):
+            image = auto_orient(source_image)
+        exif_bytes = get_exif_bytes(source_image)
+
+    results: list[ProcessResult] = []
+    pending_ocr_path: Path | None = None
+    for position, step in enumerate(recipe.steps):
+        if isinstance(step, CropStep):
+            with timer.stage("crop"):
+                image = crop_image(image, x=step.x, y=step.y, width=step.width, height=step.height)
+        elif isinstance(step, ResizeStep):
+            image = processor.render(
+                image,
+                width=step.width,
+                height=step.height,
+                keep_aspect=step.keep_aspect,
+                fit=step.fit,
+                crop_box=first_crop_box if position == 0 else step.crop_box,
+                resample=step.resample,
+                reducing_gap=step.reducing_gap,
+                timer=timer,
+            )
+        elif isinstance(step, StripExifStep):
+            exif_bytes = None
+        elif isinstance(step, OcrStep):
+            # The sidecar is named after the latest output, or the input before any output.
+            named_after = results[-1].output_path if results else out_dir / input_path.name
+            ocr_path = processor.extract_text(
+                input_path=named_after,
+                out=None,
+                engine=step.engine,
+                output_format=step.format,
+                lang=step.lang,
+                overwrite=overwrite,
+                image=image,
+                timer=timer,
+            )
+            if results:
+                results[-1].ocr_path = ocr_path
+            else:
+                pending_ocr_path = ocr_path
+        elif isinstance(step, OutputStep):
+            pillow_format, quality, output_path = next(targets)
+            with timer.stage("encode"):
+                save_image(
+                    image=image,
+                    output_path=output_path,
+                    pillow_format=pillow_format,
+                    quality=quality,
+                    exif_bytes=exif_bytes,
+                )
+            timer.record_output(output_path, image.size)
+            results.append(
+                ProcessResult(
+                    output_path=output_path,
+                    ocr_path=pending_ocr_path,
+                    size=image.size,
+                    source_size=source_size,
+                )
+            )
+            pending_ocr_path = None
+
+    if timings:
+        results[0].timings = timer
+    return results
+
+
+def process_recipe_item(item: BatchItem, options: dict[str, Any]) -> BatchOutcome:
+    """run_batch worker: item.output_path is the output directory plus the name stem."""
+    started = time.perf_counter()
+    try:
+        results = run_recipe(
+            recipe=options["recipe"],
+            input_path=item.input_path,
+            out_dir=item.output_path.parent,
+            stem=item.output_path.name,
+            index=item.index,
+            overwrite=item.overwrite or options.get("overwrite", False),
+            timings=options.get("timings", False),
+            max_pixels=options.get("max_pixels"),
+            max_bytes=options.get("max_bytes"),
+        )
+    except ImgshError as error:
+        return BatchOutcome(item=item, error=str(error), elapsed=time.perf_counter() - started)
+    return BatchOutcome(item=item, results=results, elapsed=time.perf_counter() - started)
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import json
+import threading
+import time
+from array import array
+from pathlib import Path
+from typing import Any
+
+from imgsh.core.errors import ImgshError
+from imgsh.core.processor import ProcessResult
+from imgsh.core.timing import percentiles
+
+REPORT_PERCENTILES = {"p50": 0.50, "p90": 0.90, "p95": 0.95, "p99": 0.99}
+
+
+def _file_size(path: Path) -> int | None:
+    try:
+        return path.stat().st_size
+    except OSError:
+        return None
+
+
+class BatchReport:
+    """
+    JSON-lines run report: one "file" record per input, written as it completes,
+    then one "summary" record on close. Only latencies are kept in memory, as a
+    packed array of doubles (8 bytes per file).
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Line-buffered, so a consumer tailing the file sees each record promptly.
+            self._handle = path.open("w", encoding="utf-8", buffering=1)
+        except OSError as exc:
+            raise ImgshError(f"Could not open report '{path}': {exc}") from exc
+        self._started = time.perf_counter()
+        self._latencies = array("d")
+        self._counts = {"ok": 0, "failed": 0, "skipped": 0}
+        self._duplicates = 0
+        # record() is also called from the executor's planning/feeder thread.
+        self._lock = threading.Lock()
+        self._input_bytes = 0
+        self._output_bytes = 0
+
+    def _write(self, record: dict[str, Any]) -> None:
+        self._handle.write(json.dumps(record) + "\n")
+
+    def record(
+        self,
+        input_path: Path,
+        status: str,
+        results: list[ProcessResult] | None = None,
+        error: str | None = None,
+        elapsed: float | None = None,
+        duplicate_of: Path | None = None,
+    ) -> None:
+        results = results or []
+        input_bytes = _file_size(input_path)
+        source_size = results[0].source_size if results else None
+        outputs = []
+        for result in results:
+            output_bytes = _file_size(result.output_path)
+            outputs.append(
+                {
+                    "path": str(result.output_path),
+                    "bytes": output_bytes,
+                    "width": result.size[0] if result.size else None,
+                    "height": result.size[1] if result.size else None,
+                    "ocr_path": str(result.ocr_path) if result.ocr_path else None,
+                }
+            )
+
+        record: dict[str, Any] = {
+            "type": "file",
+            "status": status,
+            "input": str(input_path),
+            "input_bytes": input_bytes,
+            "input_width": source_size[0] if source_size else None,
+            "input_height": source_size[1] if source_size else None,
+            "outputs": outputs,
+            "elapsed_ms": round(elapsed * 1000, 3) if elapsed is not None else None,
+            "error": error,
+        }
+        if duplicate_of is not None:
+            record["duplicate_of"] = str(duplicate_of)
+        if results and results[0].timings is not None:
+            record["timings"] = results[0].timings.to_dict()
+
+        with self._lock:
+            self._counts[status] += 1
+            if status != "skipped":
+                self._input_bytes += input_bytes or 0
+            self._output_bytes += sum(output["bytes"] or 0 for output in outputs)
+            if elapsed is not None:
+                self._latencies.append(elapsed)
+            if duplicate_of is not None:
+                self._duplicates += 1
+            self._write(record)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._handle.closed:
+                return
+            wall = time.perf_counter() - self._started
+            values = percentiles(self._latencies, list(REPORT_PERCENTILES.values()))
+            completed = self._counts["ok"] + self._counts["failed"]
+            self._write(
+                {
+                    "type": "summary",
+                    "processed": self._counts["ok"],
+                    "failed": self._counts["failed"],
+                    "skipped": self._counts["skipped"],
+                    "duplicates": self._duplicates,
+                    "wall_seconds": round(wall, 3),
+                    "files_per_second": round(completed / wall, 3) if wall else None,
+                    "input_mb_per_second": round(self._input_bytes / 1e6 / wall, 3) if wall else None,
+                    "input_bytes": self._input_bytes,
+                    "output_bytes": self._output_bytes,
+                    "latency_ms": {
+                        name: round(value * 1000, 3) if value is not None else None
+                        for name, value in zip(REPORT_PERCENTILES, values)
+                    }
+                    | {"max": round(max(self._latencies) * 1000, 3) if self._latencies else None},
+                }
+            )
+            self._handle.close()
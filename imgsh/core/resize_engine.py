@@ -1,10 +1,230 @@
 from __future__ import annotations
 
-from PIL import Image, ImageOps
+import math
 
+from PIL import Image
+
+from imgsh.config import DEFAULT_RESAMPLE
 from imgsh.core.errors import ImgshError
+from imgsh.core.metadata import oriented_size
+from imgsh.utils.validation import validate_crop_bounds
 
 LANCZOS = Image.Resampling.LANCZOS
+RESAMPLE_FILTERS = {
+    "nearest": Image.Resampling.NEAREST,
+    "box": Image.Resampling.BOX,
+    "bilinear": Image.Resampling.BILINEAR,
+    "bicubic": Image.Resampling.BICUBIC,
+    "lanczos": LANCZOS,
+}
+# resample="auto": below this scale, pre-reduce by an integer factor before LANCZOS...
+AUTO_REDUCE_BELOW_SCALE = 0.5
+AUTO_REDUCING_GAP = 3.0
+# ...and below this one (thumbnails/previews), finish with a cheaper bilinear pass.
+AUTO_PREVIEW_BELOW_SCALE = 0.125
+AUTO_PREVIEW_REDUCING_GAP = 2.0
+# Draft decoding keeps at least this many source pixels per output pixel on each
+# axis, so the final LANCZOS pass still has real detail to filter.
+DRAFT_OVERSAMPLE = 2.0
+# Low-memory mode drafts as far as the output allows; strips do the remaining work.
+LOW_MEMORY_DRAFT_OVERSAMPLE = 1.0
+DRAFT_SCALES = (8, 4, 2)
+# Source pixels each low-memory strip reads; bounds Pillow's intermediate buffers.
+STRIP_SOURCE_PIXELS = 4 * 1024 * 1024
+# Half-width of each filter's kernel in source pixels at scale 1 (Pillow's values).
+FILTER_SUPPORT = {
+    Image.Resampling.NEAREST: 0.5,
+    Image.Resampling.BOX: 0.5,
+    Image.Resampling.BILINEAR: 1.0,
+    Image.Resampling.HAMMING: 1.0,
+    Image.Resampling.BICUBIC: 2.0,
+    LANCZOS: 3.0,
+}
+
+
+def _contain_size(image_size: tuple[int, int], size: tuple[int, int]) -> tuple[int, int]:
+    # Same rounding as ImageOps.contain so dimensions match a direct resize.
+    image_width, image_height = image_size
+    image_ratio = image_width / image_height
+    target_ratio = size[0] / size[1]
+    if image_ratio > target_ratio:
+        return size[0], max(1, round(image_height / image_width * size[0]))
+    if image_ratio < target_ratio:
+        return max(1, round(image_width / image_height * size[1])), size[1]
+    return size
+
+
+def target_size(
+    image_size: tuple[int, int],
+    width: int | None,
+    height: int | None,
+    keep_aspect: bool,
+    fit: str,
+) -> tuple[int, int]:
+    """Output dimensions resize_image would produce for an image of image_size."""
+    original_width, original_height = image_size
+    if width is None and height is None:
+        return image_size
+    if fit in {"cover", "exact"}:
+        return width or original_width, height or original_height
+
+    if keep_aspect:
+        if width is None:
+            ratio = height / original_height
+            width = max(1, int(round(original_width * ratio)))
+        if height is None:
+            ratio = width / original_width
+            height = max(1, int(round(original_height * ratio)))
+        return _contain_size(image_size, (width, height))
+
+    return width or original_width, height or original_height
+
+
+def cover_box(
+    image_size: tuple[int, int], size: tuple[int, int]
+) -> tuple[float, float, float, float]:
+    """Centered source region with the aspect ratio of size (ImageOps.fit geometry)."""
+    image_width, image_height = image_size
+    image_ratio = image_width / image_height
+    output_ratio = size[0] / size[1]
+    if image_ratio == output_ratio:
+        crop_width, crop_height = float(image_width), float(image_height)
+    elif image_ratio > output_ratio:
+        crop_width, crop_height = output_ratio * image_height, float(image_height)
+    else:
+        crop_width, crop_height = float(image_width), image_width / output_ratio
+    left = (image_width - crop_width) * 0.5
+    top = (image_height - crop_height) * 0.5
+    return left, top, left + crop_width, top + crop_height
+
+
+def resolve_resample(
+    resample: str,
+    scale: float,
+    reducing_gap: float | None = None,
+) -> tuple[Image.Resampling, float | None]:
+    """
+    Map a --resample name to a Pillow filter. 'auto' picks by scale (output/source):
+    bicubic when enlarging, lanczos for mild downscales, lanczos after an integer
+    pre-reduction for large ones, and bilinear after pre-reduction for thumbnails.
+    """
+    if resample != "auto":
+        return RESAMPLE_FILTERS[resample], reducing_gap
+    if scale >= 1.0:
+        return Image.Resampling.BICUBIC, reducing_gap
+    if scale >= AUTO_REDUCE_BELOW_SCALE:
+        return LANCZOS, reducing_gap
+    if scale >= AUTO_PREVIEW_BELOW_SCALE:
+        return LANCZOS, reducing_gap or AUTO_REDUCING_GAP
+    return Image.Resampling.BILINEAR, reducing_gap or AUTO_PREVIEW_REDUCING_GAP
+
+
+def resample_to(
+    image: Image.Image,
+    size: tuple[int, int],
+    box: tuple[float, float, float, float] | None = None,
+    resample: str = DEFAULT_RESAMPLE,
+    reducing_gap: float | None = None,
+) -> Image.Image:
+    if box is None:
+        region_width, region_height = image.size
+    else:
+        region_width, region_height = box[2] - box[0], box[3] - box[1]
+    scale = min(size[0] / region_width, size[1] / region_height)
+    resample_filter, gap = resolve_resample(resample, scale=scale, reducing_gap=reducing_gap)
+    return image.resize(size, resample=resample_filter, box=box, reducing_gap=gap)
+
+
+def _strip_rows(width: int) -> int:
+    return max(1, STRIP_SOURCE_PIXELS // max(1, width))
+
+
+def _reduce_in_strips(
+    image: Image.Image,
+    factor: tuple[int, int],
+    box: tuple[float, float, float, float],
+    support: float,
+    scale: tuple[float, float],
+) -> tuple[Image.Image, tuple[float, float, float, float]]:
+    """
+    Image.reduce over the part of box the final filter reads, a band of whole
+    factor-high blocks at a time. Returns the reduced image and box mapped into it.
+    """
+    factor_x, factor_y = factor
+    # Same margin Pillow's resize(reducing_gap=...) keeps for the final filter.
+    margin_x = (support - 0.5) / scale[0]
+    margin_y = (support - 0.5) / scale[1]
+    left = max(0, int(box[0] - margin_x))
+    top = max(0, int(box[1] - margin_y))
+    right = min(image.width, math.ceil(box[2] + margin_x))
+    bottom = min(image.height, math.ceil(box[3] + margin_y))
+
+    reduced_size = (math.ceil((right - left) / factor_x), math.ceil((bottom - top) / factor_y))
+    reduced = Image.new(image.mode, reduced_size)
+    band = max(factor_y, _strip_rows(right - left) // factor_y * factor_y)
+    for band_top in range(top, bottom, band):
+        band_bottom = min(bottom, band_top + band)
+        reduced.paste(
+            image.reduce(factor, box=(left, band_top, right, band_bottom)),
+            (0, (band_top - top) // factor_y),
+        )
+    reduced_box = (
+        (box[0] - left) / factor_x,
+        (box[1] - top) / factor_y,
+        (box[2] - left) / factor_x,
+        (box[3] - top) / factor_y,
+    )
+    return reduced, reduced_box
+
+
+def resample_in_strips(
+    image: Image.Image,
+    size: tuple[int, int],
+    box: tuple[float, float, float, float] | None = None,
+    resample: str = DEFAULT_RESAMPLE,
+    reducing_gap: float | None = None,
+) -> Image.Image:
+    """
+    resample_to that never holds more than the output, the integer-reduced source and
+    one strip of intermediate rows: the optional pre-reduction and the final filter both
+    run over horizontal bands. Matches resample_to to within rounding.
+    """
+    if box is None:
+        box = (0.0, 0.0, float(image.width), float(image.height))
+    scale_x = size[0] / (box[2] - box[0])
+    scale_y = size[1] / (box[3] - box[1])
+    resample_filter, gap = resolve_resample(
+        resample, scale=min(scale_x, scale_y), reducing_gap=reducing_gap
+    )
+    if image.mode in {"1", "P"}:
+        # Pillow resizes these with NEAREST only.
+        resample_filter, gap = Image.Resampling.NEAREST, None
+    if gap is not None and resample_filter != Image.Resampling.NEAREST:
+        factor = (max(1, int(1 / scale_x / gap)), max(1, int(1 / scale_y / gap)))
+        if factor != (1, 1):
+            image, box = _reduce_in_strips(
+                image, factor, box, FILTER_SUPPORT[resample_filter], (scale_x, scale_y)
+            )
+
+    output = Image.new(image.mode, size)
+    if image.mode == "P":
+        output.putpalette(image.getpalette())
+    region_height = box[3] - box[1]
+    # Output rows per strip, sized so each strip reads about STRIP_SOURCE_PIXELS.
+    rows = max(1, int(_strip_rows(image.width) * size[1] / region_height))
+    for strip_top in range(0, size[1], rows):
+        strip_bottom = min(size[1], strip_top + rows)
+        strip_box = (
+            box[0],
+            box[1] + region_height * strip_top / size[1],
+            box[2],
+            box[1] + region_height * strip_bottom / size[1],
+        )
+        strip = image.resize(
+            (size[0], strip_bottom - strip_top), resample=resample_filter, box=strip_box
+        )
+        output.paste(strip, (0, strip_top))
+    return output
 
 
 def resize_image(
@@ -13,36 +233,93 @@ def resize_image(
     height: int | None,
     keep_aspect: bool,
     fit: str,
+    resample: str = DEFAULT_RESAMPLE,
+    reducing_gap: float | None = None,
+    box: tuple[float, float, float, float] | None = None,
 ) -> Image.Image:
-    original_width, original_height = image.size
+    """
+    Resize image, or only its box region (left, top, right, bottom) when given. The
+    crop is folded into the resampling pass, so no intermediate crop is allocated.
+    """
+    if box is None:
+        region = image.size
+    else:
+        region = (box[2] - box[0], box[3] - box[1])
     if width is None and height is None:
         if fit == "cover":
             raise ImgshError("Fit mode 'cover' requires both --width and --height.")
-        # Allow quality-only exports by keeping source dimensions unchanged.
-        return image.copy()
+        # Quality/format-only exports keep the source pixels as they are, uncopied.
+        if box is None:
+            return image
+        return image.crop(tuple(round(edge) for edge in box))
 
     if fit == "cover":
         if width is None or height is None:
             raise ImgshError("Fit mode 'cover' requires both --width and --height.")
-        return ImageOps.fit(image, (width, height), method=LANCZOS)
+        left, top, right, bottom = cover_box(region, (width, height))
+        if box is not None:
+            left, top, right, bottom = left + box[0], top + box[1], right + box[0], bottom + box[1]
+        box = (left, top, right, bottom)
+    # A drafted crop region is fractional; output dimensions are always whole pixels.
+    size = tuple(
+        max(1, round(side)) for side in target_size(region, width, height, keep_aspect, fit)
+    )
+    return resample_to(image, size, box=box, resample=resample, reducing_gap=reducing_gap)
 
-    if fit == "exact":
-        target_width = width or original_width
-        target_height = height or original_height
-        return image.resize((target_width, target_height), resample=LANCZOS)
 
-    # contain mode
-    if keep_aspect:
-        if width is None:
-            ratio = height / original_height
-            width = max(1, int(round(original_width * ratio)))
-        if height is None:
-            ratio = width / original_width
-            height = max(1, int(round(original_height * ratio)))
+def apply_draft(
+    image: Image.Image,
+    width: int | None,
+    height: int | None,
+    keep_aspect: bool,
+    fit: str,
+    crop_box: tuple[float, float, float, float] | None = None,
+    oversample: float = DRAFT_OVERSAMPLE,
+) -> tuple[float, float, float, float] | None:
+    """
+    Ask Pillow to decode a not-yet-loaded JPEG at 1/2, 1/4 or 1/8 scale (DCT scaling)
+    when the requested output is small enough. Must be called before the image is loaded.
+    Returns crop_box rescaled to the drafted image (in oriented coordinates), keeping
+    the fractional edges so the fused crop+resize samples exactly the requested region.
+    """
+    if image.format != "JPEG" or (width is None and height is None):
+        return crop_box
+
+    full_width, full_height = oriented_size(image)
+    if crop_box:
+        crop_x, crop_y, crop_width, crop_height = crop_box
+        # Validate against the full-resolution image so errors use the caller's coordinates.
+        validate_crop_bounds(
+            x=crop_x,
+            y=crop_y,
+            width=crop_width,
+            height=crop_height,
+            image_width=full_width,
+            image_height=full_height,
+        )
+        region = (crop_width, crop_height)
+    else:
+        region = (full_width, full_height)
+
+    output_width, output_height = target_size(region, width, height, keep_aspect, fit)
+    max_reduction = min(
+        region[0] / (oversample * output_width),
+        region[1] / (oversample * output_height),
+    )
+    scale = next((candidate for candidate in DRAFT_SCALES if candidate <= max_reduction), 1)
+    raw_width, raw_height = image.size
+    if scale == 1 or raw_width // scale == 0 or raw_height // scale == 0:
+        return crop_box
 
-        if width is not None and height is not None:
-            return ImageOps.contain(image, (width, height), method=LANCZOS)
+    image.draft(image.mode, (raw_width // scale, raw_height // scale))
+    if not crop_box:
+        return None
 
-    target_width = width or original_width
-    target_height = height or original_height
-    return image.resize((target_width, target_height), resample=LANCZOS)
+    drafted_width, drafted_height = oriented_size(image)
+    scale_x = drafted_width / full_width
+    scale_y = drafted_height / full_height
+    left = crop_x * scale_x
+    top = crop_y * scale_y
+    right = min(drafted_width, (crop_x + crop_width) * scale_x)
+    bottom = min(drafted_height, (crop_y + crop_height) * scale_y)
+    return left, top, right - left, bottom - top
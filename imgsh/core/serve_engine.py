@@ -0,0 +1,354 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, replace
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from multiprocessing import Pool
+from pathlib import Path
+from typing import Any, Hashable, Iterator
+from urllib.parse import parse_qs, urlsplit
+
+from PIL import UnidentifiedImageError
+
+from imgsh.config import DEFAULT_FIT, DEFAULT_RESAMPLE
+from imgsh.core.batch_engine import PENDING_TASKS_PER_JOB, init_worker_signals
+from imgsh.core.errors import ImgshError
+from imgsh.core.format_engine import resolve_output_format
+from imgsh.core.processor import ImageProcessor
+from imgsh.utils.validation import (
+    validate_crop_box,
+    validate_quality,
+    validate_resample,
+    validate_resize_dimensions,
+)
+
+CONTENT_TYPES = {"JPEG": "image/jpeg", "PNG": "image/png", "WEBP": "image/webp"}
+_TRUE_VALUES = {"1", "true", "yes", "on"}
+_FALSE_VALUES = {"0", "false", "no", "off"}
+
+
+@dataclass(frozen=True)
+class RenderParams:
+    width: int | None = None
+    height: int | None = None
+    keep_aspect: bool = True
+    fit: str = DEFAULT_FIT
+    crop_box: tuple[int, int, int, int] | None = None
+    quality: int | None = None
+    output_format: str | None = None
+    preserve_exif: bool = True
+    resample: str = DEFAULT_RESAMPLE
+    reducing_gap: float | None = None
+
+
+def _parse_bool(name: str, value: str) -> bool:
+    if value.lower() in _TRUE_VALUES:
+        return True
+    if value.lower() in _FALSE_VALUES:
+        return False
+    raise ImgshError(f"Invalid {name} '{value}'. Use true or false.")
+
+
+def _parse_number(name: str, value: str, kind: type) -> Any:
+    try:
+        return kind(value)
+    except ValueError as exc:
+        raise ImgshError(f"Invalid {name} '{value}'. Expected a number.") from exc
+
+
+def _parse_crop(value: str) -> tuple[int, int, int, int]:
+    parts = value.split(",")
+    if len(parts) != 4:
+        raise ImgshError(f"Invalid crop '{value}'. Expected x,y,width,height.")
+    x, y, width, height = (_parse_number("crop", part.strip(), int) for part in parts)
+    validate_crop_box(x=x, y=y, width=width, height=height)
+    return x, y, width, height
+
+
+def parse_render_params(query: str) -> tuple[RenderParams, str | None]:
+    """
+    Query string of a /render request as (RenderParams, source digest or None).
+    Keys: width, height, keep_aspect, fit, crop=x,y,w,h, quality, format, strip_exif,
+    resample, reducing_gap, and source to reuse a previously uploaded image.
+    """
+    params = RenderParams()
+    source = None
+    for key, values in parse_qs(query, keep_blank_values=True, strict_parsing=False).items():
+        value = values[-1]
+        if key in {"width", "height", "quality"}:
+            params = replace(params, **{key: _parse_number(key, value, int)})
+        elif key == "reducing_gap":
+            params = replace(params, reducing_gap=_parse_number(key, value, float))
+        elif key == "keep_aspect":
+            params = replace(params, keep_aspect=_parse_bool(key, value))
+        elif key == "strip_exif":
+            params = replace(params, preserve_exif=not _parse_bool(key, value))
+        elif key in {"fit", "resample"}:
+            params = replace(params, **{key: value})
+        elif key == "format":
+            resolve_output_format(value, None, Path())
+            params = replace(params, output_format=value)
+        elif key == "crop":
+            params = replace(params, crop_box=_parse_crop(value))
+        elif key == "source":
+            source = value
+        else:
+            raise ImgshError(f"Unknown parameter '{key}'.")
+    validate_resize_dimensions(width=params.width, height=params.height, fit=params.fit)
+    validate_quality(params.quality)
+    validate_resample(params.resample, params.reducing_gap)
+    return params, source
+
+
+def render_upload(
+    data: bytes, params: RenderParams, max_pixels: int | None, max_bytes: int | None
+) -> tuple[bytes, str, tuple[int, int]]:
+    """Pool worker: ImageProcessor.resize_bytes on one uploaded image."""
+    try:
+        return ImageProcessor().resize_bytes(
+            data, max_pixels=max_pixels, max_bytes=max_bytes, **asdict(params)
+        )
+    except (UnidentifiedImageError, OSError, ValueError, SyntaxError) as exc:
+        # Pillow decoders also raise ValueError or SyntaxError on truncated or garbage data.
+        raise ImgshError(f"Could not decode the uploaded image: {exc}") from exc
+
+
+class LruCache:
+    """Thread-safe LRU map bounded by the total size in bytes of its values."""
+
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[Hashable, tuple[Any, int]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Any | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: Hashable, value: Any, size: int) -> None:
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.size -= previous[1]
+            self._entries[key] = (value, size)
+            self.size += size
+            while self.size > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.size -= evicted_size
+
+    def stats(self) -> dict[str, int]:
+        return {"entries": len(self), "bytes": self.size, "hits": self.hits, "misses": self.misses}
+
+
+class ServiceBusy(ImgshError):
+    pass
+
+
+class UnknownSource(ImgshError):
+    pass
+
+
+@dataclass
+class Rendered:
+    body: bytes
+    pillow_format: str
+    size: tuple[int, int]
+    source: str
+    cached: bool
+
+
+class ResizeService:
+    """
+    Warm resize workers behind bounded admission. Work runs on a process pool started
+    up front; at most max_pending requests are admitted at once and the rest are
+    refused immediately (HTTP 503), so a burst cannot queue unbounded uploads in
+    memory. Uploaded sources and rendered outputs are kept in LRU caches.
+    """
+
+    def __init__(
+        self,
+        jobs: int,
+        max_pending: int | None = None,
+        source_cache_bytes: int = 0,
+        output_cache_bytes: int = 0,
+        max_pixels: int | None = None,
+        max_bytes: int | None = None,
+    ) -> None:
+        self.jobs = jobs
+        self.max_pending = max_pending or jobs * PENDING_TASKS_PER_JOB
+        self.slots = threading.BoundedSemaphore(self.max_pending)
+        self.sources = LruCache(source_cache_bytes)
+        self.outputs = LruCache(output_cache_bytes)
+        self.max_pixels = max_pixels
+        self.max_bytes = max_bytes
+        self.rejected = 0
+        self._lock = threading.Lock()
+        self._pool = Pool(processes=jobs, initializer=init_worker_signals)
+
+    @contextmanager
+    def admit(self) -> Iterator[None]:
+        """Hold one request slot, or raise ServiceBusy when all are taken."""
+        if not self.slots.acquire(blocking=False):
+            with self._lock:
+                self.rejected += 1
+            raise ServiceBusy(f"All {self.max_pending} request slots are busy; retry shortly.")
+        try:
+            yield
+        finally:
+            self.slots.release()
+
+    def render(self, data: bytes, source: str | None, params: RenderParams) -> Rendered:
+        if data:
+            source = hashlib.sha256(data).hexdigest()
+            self.sources.put(source, data, len(data))
+        elif source is None:
+            raise ImgshError("Send the image as the request body, or pass source=<digest>.")
+        else:
+            data = self.sources.get(source)
+            if data is None:
+                raise UnknownSource(f"Source {source} is not cached; upload it again.")
+
+        key = (source, params)
+        cached = self.outputs.get(key)
+        if cached is not None:
+            body, pillow_format, size = cached
+            return Rendered(body, pillow_format, size, source, cached=True)
+        body, pillow_format, size = self._pool.apply(
+            render_upload, (data, params, self.max_pixels, self.max_bytes)
+        )
+        self.outputs.put(key, (body, pillow_format, size), len(body))
+        return Rendered(body, pillow_format, size, source, cached=False)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "jobs": self.jobs,
+            "max_pending": self.max_pending,
+            "rejected": self.rejected,
+            "source_cache": self.sources.stats(),
+            "output_cache": self.outputs.stats(),
+        }
+
+    def close(self) -> None:
+        self._pool.close()
+        self._pool.join()
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out as separate writes; do not let Nagle hold the body back.
+    disable_nagle_algorithm = True
+    server: ServiceServer
+
+    def _send(
+        self,
+        status: int,
+        body: bytes,
+        content_type: str,
+        headers: dict[str, str] | None = None,
+    ) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_error(
+        self, status: int, message: str, headers: dict[str, str] | None = None
+    ) -> None:
+        self._send(status, f"{message}\n".encode("utf-8"), "text/plain; charset=utf-8", headers)
+
+    def do_GET(self) -> None:
+        if urlsplit(self.path).path != "/health":
+            self._send_error(404, "Not found. Use POST /render or GET /health.")
+            return
+        body = json.dumps(self.server.service.stats()).encode("utf-8")
+        self._send(200, body, "application/json")
+
+    def do_POST(self) -> None:
+        url = urlsplit(self.path)
+        if url.path != "/render":
+            self._send_error(404, "Not found. Use POST /render or GET /health.")
+            return
+        try:
+            length = int(self.headers["Content-Length"])
+        except (TypeError, ValueError):
+            self.close_connection = True
+            self._send_error(411, "A valid Content-Length is required.")
+            return
+        if length > self.server.max_upload_bytes:
+            self.close_connection = True
+            self._send_error(413, f"Upload exceeds {self.server.max_upload_bytes} bytes.")
+            return
+        try:
+            params, source = parse_render_params(url.query)
+            # Admit before reading the body, so a refused upload is never buffered.
+            with self.server.service.admit():
+                data = self.rfile.read(length)
+                rendered = self.server.service.render(data, source, params)
+        except ServiceBusy as error:
+            self.close_connection = True
+            self._send_error(503, str(error), {"Retry-After": "1"})
+            return
+        except UnknownSource as error:
+            self._send_error(404, str(error))
+            return
+        except ImgshError as error:
+            self.close_connection = True
+            self._send_error(400, str(error))
+            return
+        except Exception as error:
+            # Anything else is a bug or a dead worker; answer rather than drop the connection.
+            self.close_connection = True
+            self.log_error("Render failed: %r", error)
+            self._send_error(500, f"Internal error while rendering: {error}")
+            return
+        self._send(
+            200,
+            rendered.body,
+            CONTENT_TYPES[rendered.pillow_format],
+            {
+                "X-Imgsh-Size": f"{rendered.size[0]}x{rendered.size[1]}",
+                "X-Imgsh-Source": rendered.source,
+                "X-Imgsh-Cache": "hit" if rendered.cached else "miss",
+            },
+        )
+
+    def log_message(self, format: str, *args: Any) -> None:
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class ServiceServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address: tuple[str, int],
+        service: ResizeService,
+        max_upload_bytes: int,
+        verbose: bool = False,
+    ) -> None:
+        self.service = service
+        self.max_upload_bytes = max_upload_bytes
+        self.verbose = verbose
+        super().__init__(address, _RequestHandler)
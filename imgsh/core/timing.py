@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import math
+import time
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import Any, ContextManager, Iterable, Iterator, Sequence
+
+COUNTERS = ("input_pixels", "output_pixels", "input_bytes", "output_bytes")
+
+
+def percentiles(values: Iterable[float], fractions: Sequence[float]) -> list[float | None]:
+    """Linear-interpolated percentiles (fractions in 0..1), sorting values once."""
+    ordered = sorted(values)
+    if not ordered:
+        return [None] * len(fractions)
+    results: list[float | None] = []
+    for fraction in fractions:
+        position = (len(ordered) - 1) * fraction
+        lower = math.floor(position)
+        upper = math.ceil(position)
+        weight = position - lower
+        results.append(ordered[lower] * (1 - weight) + ordered[upper] * weight)
+    return results
+
+
+def percentile(values: Iterable[float], fraction: float) -> float | None:
+    return percentiles(values, [fraction])[0]
+
+
+class StageTimer:
+    """
+    Wall and CPU seconds per named stage plus pixel/byte counters for one operation.
+    CPU time is per thread, so it stays accurate inside the threaded batch pipeline;
+    work done by external processes (e.g. textract's tesseract) is not included.
+    """
+
+    enabled = True
+
+    def __init__(self) -> None:
+        self.stages: dict[str, list[float]] = {}
+        self.counters: dict[str, int] = dict.fromkeys(COUNTERS, 0)
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        wall_start = time.perf_counter()
+        cpu_start = time.thread_time()
+        try:
+            yield
+        finally:
+            totals = self.stages.setdefault(name, [0.0, 0.0])
+            totals[0] += time.perf_counter() - wall_start
+            totals[1] += time.thread_time() - cpu_start
+
+    def add(self, counter: str, value: int) -> None:
+        self.counters[counter] += value
+
+    def record_input(self, path: Path, size: tuple[int, int]) -> None:
+        self.add("input_bytes", path.stat().st_size)
+        self.add("input_pixels", size[0] * size[1])
+
+    def record_output(self, path: Path, size: tuple[int, int]) -> None:
+        self.add("output_bytes", path.stat().st_size)
+        self.add("output_pixels", size[0] * size[1])
+
+    def merge(self, other: StageTimer) -> None:
+        for name, (wall, cpu) in other.stages.items():
+            totals = self.stages.setdefault(name, [0.0, 0.0])
+            totals[0] += wall
+            totals[1] += cpu
+        for counter, value in other.counters.items():
+            self.add(counter, value)
+
+    @property
+    def wall_seconds(self) -> float:
+        return sum(wall for wall, _ in self.stages.values())
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "stages": {
+                name: {"wall_ms": round(wall * 1000, 3), "cpu_ms": round(cpu * 1000, 3)}
+                for name, (wall, cpu) in self.stages.items()
+            },
+            **self.counters,
+        }
+
+    def format(self) -> str:
+        stages = ", ".join(
+            f"{name} {wall * 1000:.1f}ms (cpu {cpu * 1000:.1f}ms)"
+            for name, (wall, cpu) in self.stages.items()
+        )
+        counters = self.counters
+        if not any(counters.values()):
+            return stages
+        return (
+            f"{stages} | in {counters['input_pixels'] / 1e6:.2f} MP "
+            f"{counters['input_bytes'] / 1e6:.3f} MB -> out "
+            f"{counters['output_pixels'] / 1e6:.2f} MP {counters['output_bytes'] / 1e6:.3f} MB"
+        )
+
+
+class _NullTimer:
+    """Stand-in used when timings are off: no clock reads, no allocation per stage."""
+
+    enabled = False
+    _context = nullcontext()
+
+    def stage(self, name: str) -> ContextManager[None]:
+        return self._context
+
+    def add(self, counter: str, value: int) -> None:
+        pass
+
+    def record_input(self, path: Path, size: tuple[int, int]) -> None:
+        pass
+
+    def record_output(self, path: Path, size: tuple[int, int]) -> None:
+        pass
+
+
+NULL_TIMER = _NullTimer()
+
+
+Timer = StageTimer | _NullTimer
+
+
+def make_timer(enabled: bool) -> Timer:
+    return StageTimer() if enabled else NULL_TIMER
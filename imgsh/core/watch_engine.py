@@ -0,0 +1,348 @@
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import os
+import queue
+import select
+import struct
+import threading
+import time
+from functools import partial
+from multiprocessing import Pool
+from pathlib import Path
+from typing import Any, Callable, Iterable
+
+from imgsh.config import DEFAULT_WATCH_POLL_INTERVAL, DEFAULT_WATCH_SETTLE_SECONDS
+from imgsh.core.batch_engine import BatchItem, BatchOutcome, init_worker_signals, process_item
+from imgsh.core.manifest import BatchManifest
+from imgsh.utils.file_utils import is_image_file, iter_image_files
+
+# inotify(7) constants from <sys/inotify.h>.
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = os.O_CLOEXEC
+WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+_EVENT_HEADER = struct.Struct("iIII")
+EVENT_BUFFER_SIZE = 64 * 1024
+# Upper bound on how long a finished job waits before its outcome is reported.
+OUTCOME_POLL_SECONDS = 0.2
+
+
+def _load_inotify() -> ctypes.CDLL | None:
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+    except OSError:
+        return None
+    if not hasattr(libc, "inotify_init1"):
+        return None
+    return libc
+
+
+class InotifyWatcher:
+    """Directory change events from Linux inotify, read through ctypes."""
+
+    def __init__(self, root: Path, recursive: bool, libc: ctypes.CDLL) -> None:
+        self.root = root
+        self.recursive = recursive
+        self._libc = libc
+        self._fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            error = ctypes.get_errno()
+            raise OSError(error, os.strerror(error))
+        self._directories: dict[int, Path] = {}
+        self._add_tree(root)
+
+    def _add_tree(self, directory: Path) -> None:
+        watch = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), WATCH_MASK)
+        if watch < 0:
+            # Removed before we got to it, or not readable: nothing to watch.
+            return
+        self._directories[watch] = directory
+        if not self.recursive:
+            return
+        try:
+            with os.scandir(directory) as scan:
+                subdirectories = [entry.name for entry in scan if entry.is_dir(follow_symlinks=False)]
+        except OSError:
+            return
+        for name in subdirectories:
+            self._add_tree(directory / name)
+
+    def poll(self, timeout: float) -> set[Path]:
+        """Paths changed since the last call, waiting up to timeout seconds for one."""
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+        if not readable:
+            return set()
+        try:
+            data = os.read(self._fd, EVENT_BUFFER_SIZE)
+        except BlockingIOError:
+            return set()
+
+        changed: set[Path] = set()
+        offset = 0
+        while offset < len(data):
+            watch, mask, _, length = _EVENT_HEADER.unpack_from(data, offset)
+            name = data[offset + _EVENT_HEADER.size : offset + _EVENT_HEADER.size + length]
+            offset += _EVENT_HEADER.size + length
+            if mask & IN_Q_OVERFLOW:
+                # Events were dropped: fall back to one full listing.
+                changed.update(iter_image_files(self.root, recursive=self.recursive, sort=False))
+                continue
+            if mask & IN_IGNORED:
+                self._directories.pop(watch, None)
+                continue
+            directory = self._directories.get(watch)
+            name = name.rstrip(b"\0")
+            if directory is None or not name:
+                continue
+            path = directory / os.fsdecode(name)
+            if mask & IN_ISDIR:
+                if self.recursive and mask & (IN_CREATE | IN_MOVED_TO):
+                    # Files can land in a new directory before its watch exists.
+                    self._add_tree(path)
+                    changed.update(iter_image_files(path, recursive=True, sort=False))
+                continue
+            changed.add(path)
+        return changed
+
+    def close(self) -> None:
+        os.close(self._fd)
+
+
+class PollingWatcher:
+    """Fallback watcher: relists the tree every interval and diffs sizes and mtimes."""
+
+    def __init__(self, root: Path, recursive: bool, interval: float) -> None:
+        self.root = root
+        self.recursive = recursive
+        self.interval = interval
+        self._snapshot = self._scan()
+        self._next_scan = time.monotonic() + interval
+
+    def _scan(self) -> dict[Path, tuple[int, int]]:
+        snapshot = {}
+        for path in iter_image_files(self.root, recursive=self.recursive, sort=False):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            snapshot[path] = (stat.st_size, stat.st_mtime_ns)
+        return snapshot
+
+    def poll(self, timeout: float) -> set[Path]:
+        wait = self._next_scan - time.monotonic()
+        if wait > timeout:
+            time.sleep(timeout)
+            return set()
+        if wait > 0:
+            time.sleep(wait)
+        snapshot = self._scan()
+        changed = {
+            path for path, signature in snapshot.items() if self._snapshot.get(path) != signature
+        }
+        self._snapshot = snapshot
+        self._next_scan = time.monotonic() + self.interval
+        return changed
+
+    def close(self) -> None:
+        pass
+
+
+def open_watcher(
+    root: Path, recursive: bool, poll_interval: float, polling: bool = False
+) -> InotifyWatcher | PollingWatcher:
+    libc = None if polling else _load_inotify()
+    if libc is not None:
+        try:
+            return InotifyWatcher(root, recursive=recursive, libc=libc)
+        except OSError:
+            # e.g. fs.inotify.max_user_instances exhausted.
+            pass
+    return PollingWatcher(root, recursive=recursive, interval=poll_interval)
+
+
+class SettleTracker:
+    """
+    Holds changed files until their size and mtime have stayed the same for settle
+    seconds, so files still being uploaded or copied are not picked up half-written.
+    """
+
+    def __init__(self, settle: float) -> None:
+        self.settle = settle
+        # path -> ((size, mtime_ns) last seen, monotonic time it last changed)
+        self._pending: dict[Path, tuple[tuple[int, int], float]] = {}
+
+    def touch(self, path: Path, now: float | None = None) -> None:
+        try:
+            stat = path.stat()
+        except OSError:
+            self._pending.pop(path, None)
+            return
+        now = time.monotonic() if now is None else now
+        self._pending[path] = ((stat.st_size, stat.st_mtime_ns), now)
+
+    def next_deadline(self) -> float | None:
+        if not self._pending:
+            return None
+        return min(changed_at for _, changed_at in self._pending.values()) + self.settle
+
+    def ready(self, now: float | None = None) -> list[Path]:
+        now = time.monotonic() if now is None else now
+        settled = []
+        for path, (signature, changed_at) in list(self._pending.items()):
+            try:
+                stat = path.stat()
+            except OSError:
+                # Deleted or renamed away while pending.
+                del self._pending[path]
+                continue
+            current = (stat.st_size, stat.st_mtime_ns)
+            if current != signature:
+                self._pending[path] = (current, now)
+            elif now - changed_at >= self.settle:
+                del self._pending[path]
+                settled.append(path)
+        return sorted(settled)
+
+
+def _guarded(
+    worker: Callable[[BatchItem, dict[str, Any]], BatchOutcome], item: BatchItem, options: dict[str, Any]
+) -> BatchOutcome:
+    # A truncated or non-image upload must fail its own item, not end the watch. Pillow
+    # decoders raise OSError, ValueError, SyntaxError and more on garbage, so take them all.
+    started = time.perf_counter()
+    try:
+        return worker(item, options)
+    except Exception as exc:
+        return BatchOutcome(
+            item=item, error=str(exc) or type(exc).__name__, elapsed=time.perf_counter() - started
+        )
+
+
+def watch_folder(
+    input_dir: Path,
+    output_paths: Callable[[Path], tuple[Path, list[Path]]],
+    on_outcome: Callable[[BatchOutcome], None],
+    options: dict[str, Any],
+    stop: threading.Event,
+    recursive: bool = False,
+    jobs: int = 1,
+    settle: float = DEFAULT_WATCH_SETTLE_SECONDS,
+    poll_interval: float = DEFAULT_WATCH_POLL_INTERVAL,
+    polling: bool = False,
+    manifest: BatchManifest | None = None,
+    fingerprint: str = "",
+    exclude: Iterable[Path] = (),
+    worker: Callable[[BatchItem, dict[str, Any]], BatchOutcome] = process_item,
+    on_skip: Callable[[Path], None] | None = None,
+) -> None:
+    """
+    Process images already in input_dir, then every new or changed one, until stop is
+    set. output_paths(input) gives (BatchItem.output_path, every file written). Inputs
+    whose outputs the manifest shows as current are skipped, so restarts only pick up
+    what changed; outcomes are recorded in the manifest before on_outcome sees them.
+    """
+    excluded = [path.resolve() for path in exclude]
+
+    def wanted(path: Path) -> bool:
+        if not is_image_file(path):
+            return False
+        resolved = path.resolve()
+        return not any(resolved.is_relative_to(root) for root in excluded)
+
+    # Start watching before the catch-up listing so nothing written in between is missed.
+    watcher = open_watcher(input_dir, recursive=recursive, poll_interval=poll_interval, polling=polling)
+    tracker = SettleTracker(settle)
+    for path in iter_image_files(input_dir, recursive=recursive):
+        if wanted(path):
+            tracker.touch(path)
+
+    run_item = partial(_guarded, worker)
+    pool = Pool(processes=jobs, initializer=init_worker_signals) if jobs > 1 else None
+    completed: queue.SimpleQueue = queue.SimpleQueue()
+    in_flight: set[Path] = set()
+    # Changed again while being processed: re-checked once the current run finishes.
+    dirty: set[Path] = set()
+    index = 0
+
+    def finish(outcome: BatchOutcome) -> None:
+        path = outcome.item.input_path
+        in_flight.discard(path)
+        if outcome.error is None and manifest is not None:
+            manifest.record(path, [result.output_path for result in outcome.results], fingerprint)
+        on_outcome(outcome)
+        if path in dirty:
+            dirty.discard(path)
+            tracker.touch(path)
+
+    def drain(block: bool) -> None:
+        while in_flight:
+            try:
+                value = completed.get(timeout=OUTCOME_POLL_SECONDS) if block else completed.get_nowait()
+            except queue.Empty:
+                if block:
+                    continue
+                return
+            if isinstance(value, BaseException):
+                raise value
+            finish(value)
+
+    try:
+        while not stop.is_set():
+            drain(block=False)
+            timeout = poll_interval
+            deadline = tracker.next_deadline()
+            if deadline is not None:
+                timeout = min(timeout, max(0.0, deadline - time.monotonic()))
+            if in_flight:
+                timeout = min(timeout, OUTCOME_POLL_SECONDS)
+            for path in watcher.poll(timeout):
+                if wanted(path):
+                    if path in in_flight:
+                        dirty.add(path)
+                    else:
+                        tracker.touch(path)
+
+            deadline = tracker.next_deadline()
+            settled = [] if deadline is None or deadline > time.monotonic() else tracker.ready()
+            for path in settled:
+                if path in in_flight:
+                    dirty.add(path)
+                    continue
+                output_path, written = output_paths(path)
+                overwrite = False
+                if manifest is not None:
+                    if manifest.is_current(path, written, fingerprint):
+                        if on_skip is not None:
+                            on_skip(path)
+                        continue
+                    overwrite = manifest.owns(path, written)
+                index += 1
+                item = BatchItem(
+                    index=index, input_path=path, output_path=output_path, overwrite=overwrite
+                )
+                in_flight.add(path)
+                if pool is None:
+                    finish(run_item(item, options))
+                else:
+                    pool.apply_async(
+                        run_item,
+                        (item, options),
+                        callback=completed.put,
+                        error_callback=completed.put,
+                    )
+        drain(block=True)
+        if pool is not None:
+            pool.close()
+            pool.join()
+    finally:
+        watcher.close()
+        if pool is not None:
+            pool.terminate()
@@ -1,11 +1,23 @@
 from __future__ import annotations
 
+import os
+import shutil
+import threading
 from pathlib import Path
-from typing import Iterable
+from typing import IO, Iterator
 
 from imgsh.config import SUPPORTED_EXTENSIONS
 from imgsh.core.errors import ImgshError
 
+LIST_READ_CHUNK_SIZE = 64 * 1024
+# ioctl(dest_fd, FICLONE, src_fd): share extents copy-on-write (Linux btrfs/XFS/bcachefs).
+FICLONE = 0x40049409
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
 
 def ensure_input_file(path: Path) -> None:
     if not path.exists():
@@ -45,11 +57,120 @@ def resolve_single_output_path(
     return out.with_suffix(extension)
 
 
-def iter_image_files(input_dir: Path, recursive: bool) -> Iterable[Path]:
-    pattern = "**/*" if recursive else "*"
-    files = sorted(
-        path
-        for path in input_dir.glob(pattern)
-        if path.is_file() and path.suffix.lower() in SUPPORTED_EXTENSIONS
+def _reflink(source: Path, destination: Path) -> bool:
+    if fcntl is None:
+        return False
+    with source.open("rb") as source_file, destination.open("wb") as destination_file:
+        try:
+            fcntl.ioctl(destination_file.fileno(), FICLONE, source_file.fileno())
+        except OSError:
+            return False
+    return True
+
+
+def clone_file(source: Path, destination: Path, hardlink: bool = False) -> None:
+    """
+    Give destination the bytes of source without reading them through Python: a
+    hardlink when asked for, else a copy-on-write reflink where the filesystem supports
+    it, else a kernel-side copy (shutil.copyfile). destination is replaced atomically.
+    """
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    if destination.exists() and os.path.samefile(source, destination):
+        return
+    temp_path = destination.with_name(
+        f".{destination.name}.{os.getpid()}.{threading.get_ident()}.tmp"
     )
-    return files
+    try:
+        linked = False
+        if hardlink:
+            try:
+                os.link(source, temp_path)
+                linked = True
+            except OSError:
+                pass
+        if not linked and not _reflink(source, temp_path):
+            shutil.copyfile(source, temp_path)
+        os.replace(temp_path, destination)
+    except OSError as exc:
+        temp_path.unlink(missing_ok=True)
+        raise ImgshError(f"Could not copy '{source}' to '{destination}': {exc}") from exc
+
+
+def sniff_image_format(path: Path) -> str | None:
+    """Pillow format name from the file's magic bytes, or None if not a supported image."""
+    try:
+        with path.open("rb") as handle:
+            header = handle.read(12)
+    except OSError:
+        return None
+    if header.startswith(b"\xff\xd8\xff"):
+        return "JPEG"
+    if header.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "PNG"
+    if header[:4] == b"RIFF" and header[8:12] == b"WEBP":
+        return "WEBP"
+    return None
+
+
+def is_image_file(path: Path, sniff: bool = False) -> bool:
+    if sniff:
+        return sniff_image_format(path) is not None
+    return path.suffix.lower() in SUPPORTED_EXTENSIONS
+
+
+def _walk_image_files(
+    directory: Path, recursive: bool, sort: bool, sniff: bool
+) -> Iterator[Path]:
+    try:
+        with os.scandir(directory) as scan:
+            entries = sorted(scan, key=lambda entry: os.path.normcase(entry.name)) if sort else scan
+            # Sorting per directory reproduces sorted(paths) order for the whole tree.
+            for entry in entries:
+                path = directory / entry.name
+                try:
+                    if entry.is_file():
+                        if is_image_file(path, sniff=sniff):
+                            yield path
+                    elif recursive and entry.is_dir(follow_symlinks=False):
+                        yield from _walk_image_files(path, recursive, sort, sniff)
+                except OSError:
+                    continue
+    except PermissionError:
+        return
+
+
+def iter_image_files(
+    input_dir: Path,
+    recursive: bool,
+    sort: bool = True,
+    sniff: bool = False,
+) -> Iterator[Path]:
+    """
+    Stream image files from input_dir as they are discovered.
+    With sort, output is in sorted(path) order while only one directory listing per
+    tree level is held in memory; without it, files come in filesystem order.
+    With sniff, files are recognised by magic bytes instead of extension.
+    """
+    yield from _walk_image_files(input_dir, recursive=recursive, sort=sort, sniff=sniff)
+
+
+def iter_listed_files(stream: IO[bytes], null_separated: bool = False) -> Iterator[Path]:
+    """Stream paths from a newline- or NUL-delimited list (e.g. find ... -print0)."""
+    separator = b"\0" if null_separated else b"\n"
+    pending = b""
+    while True:
+        chunk = stream.read(LIST_READ_CHUNK_SIZE)
+        if not chunk:
+            break
+        pending += chunk
+        *lines, pending = pending.split(separator)
+        for line in lines:
+            yield from _listed_path(line, null_separated)
+    yield from _listed_path(pending, null_separated)
+
+
+def _listed_path(raw: bytes, null_separated: bool) -> Iterator[Path]:
+    if not null_separated:
+        raw = raw.rstrip(b"\r")
+    if raw:
+        yield Path(os.fsdecode(raw))
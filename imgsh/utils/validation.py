@@ -1,6 +1,13 @@
 from __future__ import annotations
 
-from imgsh.config import FIT_MODES, OCR_ENGINES, OCR_FORMATS
+from imgsh.config import (
+    BATCH_EXECUTORS,
+    FIT_MODES,
+    LOSSY_FORMATS,
+    OCR_FORMATS,
+    RESAMPLE_MODES,
+    SUPPORTED_FORMATS,
+)
 from imgsh.core.errors import ImgshError
 
 
@@ -14,8 +21,8 @@ def validate_non_negative(name: str, value: int | None) -> None:
         raise ImgshError(f"{name} must be 0 or greater. Got: {value}")
 
 
-def validate_quality(quality: int) -> None:
-    if quality < 1 or quality > 100:
+def validate_quality(quality: int | None) -> None:
+    if quality is not None and (quality < 1 or quality > 100):
         raise ImgshError(f"--quality must be between 1 and 100. Got: {quality}")
 
 
@@ -24,6 +31,16 @@ def validate_fit_mode(fit: str) -> None:
         raise ImgshError(f"Invalid --fit '{fit}'. Supported values: contain, cover, exact")
 
 
+def validate_resample(resample: str, reducing_gap: float | None = None) -> None:
+    if resample not in RESAMPLE_MODES:
+        raise ImgshError(
+            f"Invalid --resample '{resample}'. "
+            "Supported values: auto, nearest, box, bilinear, bicubic, lanczos"
+        )
+    if reducing_gap is not None and reducing_gap < 1.0:
+        raise ImgshError(f"--reducing-gap must be 1.0 or greater. Got: {reducing_gap}")
+
+
 def validate_resize_dimensions(width: int | None, height: int | None, fit: str) -> None:
     validate_positive("--width", width)
     validate_positive("--height", height)
@@ -37,13 +54,139 @@ def validate_resize_dimensions(width: int | None, height: int | None, fit: str)
         raise ImgshError(f"Fit mode '{fit}' requires both --width and --height.")
 
 
+def parse_sizes(value: str | None) -> list[int] | None:
+    if value is None:
+        return None
+    sizes: list[int] = []
+    for part in value.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        try:
+            size = int(part)
+        except ValueError as exc:
+            raise ImgshError(
+                f"Invalid --sizes entry '{part}'. Use comma-separated widths, e.g. 320,640,1280"
+            ) from exc
+        validate_positive("--sizes", size)
+        sizes.append(size)
+    if not sizes:
+        raise ImgshError("--sizes must list at least one width.")
+    return sizes
+
+
+def parse_resolutions(value: str) -> list[tuple[int, int]]:
+    resolutions: list[tuple[int, int]] = []
+    for part in value.split(","):
+        part = part.strip().lower()
+        if not part:
+            continue
+        try:
+            width, height = (int(side) for side in part.split("x"))
+        except ValueError as exc:
+            raise ImgshError(
+                f"Invalid resolution '{part}'. Use WIDTHxHEIGHT, e.g. 640x480,1920x1080"
+            ) from exc
+        validate_positive("resolution width", width)
+        validate_positive("resolution height", height)
+        resolutions.append((width, height))
+    if not resolutions:
+        raise ImgshError("--resolutions must list at least one WIDTHxHEIGHT.")
+    return resolutions
+
+
+def parse_formats(value: str | None) -> list[str] | None:
+    if value is None:
+        return None
+    formats = [part.strip().lower().lstrip(".") for part in value.split(",") if part.strip()]
+    if not formats:
+        raise ImgshError("--formats must list at least one format.")
+    for output_format in formats:
+        if output_format not in SUPPORTED_FORMATS:
+            raise ImgshError(
+                f"Unsupported format '{output_format}' in --formats. "
+                f"Supported formats: {', '.join(sorted(SUPPORTED_FORMATS))}"
+            )
+    return formats
+
+
+def validate_rendition_options(
+    sizes: list[int] | None,
+    formats: list[str] | None,
+    width: int | None,
+    height: int | None,
+    fit: str,
+) -> None:
+    if sizes is None:
+        if formats is not None:
+            raise ImgshError("--formats requires --sizes.")
+        return
+    if width is not None or height is not None:
+        raise ImgshError("--sizes cannot be combined with --width or --height.")
+    if fit != "contain":
+        raise ImgshError("--sizes only supports --fit contain.")
+
+
 def validate_ocr_options(engine: str, output_format: str) -> None:
-    if engine not in OCR_ENGINES:
-        raise ImgshError(f"Unsupported OCR engine '{engine}'. Supported values: textract")
+    from imgsh.core.ocr_engine import available_backends
+
+    engines = available_backends()
+    if engine not in engines:
+        raise ImgshError(
+            f"Unsupported OCR engine '{engine}'. Supported values: {', '.join(engines)}"
+        )
     if output_format not in OCR_FORMATS:
         raise ImgshError(f"Unsupported --ocr-format '{output_format}'. Supported values: txt, json")
 
 
+def validate_batch_executor(executor: str) -> None:
+    if executor not in BATCH_EXECUTORS:
+        raise ImgshError(f"Invalid --executor '{executor}'. Supported values: process, thread")
+
+
+def parse_memory_budget(
+    max_megapixels: float | None, max_memory_mb: int | None
+) -> tuple[int | None, int | None]:
+    """--max-megapixels/--max-memory-mb as (max_pixels, max_bytes)."""
+    validate_positive("--max-megapixels", max_megapixels)
+    validate_positive("--max-memory-mb", max_memory_mb)
+    max_pixels = int(max_megapixels * 1_000_000) if max_megapixels is not None else None
+    max_bytes = max_memory_mb * 1024 * 1024 if max_memory_mb is not None else None
+    return max_pixels, max_bytes
+
+
+def parse_output_size_limit(
+    max_bytes: int | None, max_kb: int | None, formats: list[str] | None = None
+) -> int | None:
+    """--max-bytes/--max-kb as one byte limit; formats are the explicitly requested ones."""
+    if max_bytes is not None and max_kb is not None:
+        raise ImgshError("Use either --max-bytes or --max-kb, not both.")
+    validate_positive("--max-bytes", max_bytes)
+    validate_positive("--max-kb", max_kb)
+    limit = max_kb * 1024 if max_kb is not None else max_bytes
+    if limit is not None:
+        _require_lossy_formats("--max-bytes/--max-kb", formats)
+    return limit
+
+
+def validate_target_ssim(target_ssim: float | None, formats: list[str] | None = None) -> None:
+    if target_ssim is None:
+        return
+    if not 0 < target_ssim <= 1:
+        raise ImgshError("--target-ssim must be greater than 0 and at most 1.")
+    _require_lossy_formats("--target-ssim", formats)
+    from imgsh.core.quality_metrics import load_numpy
+
+    load_numpy()
+
+
+def _require_lossy_formats(option: str, formats: list[str] | None) -> None:
+    for output_format in formats or []:
+        pillow_format = SUPPORTED_FORMATS.get(output_format.lower().lstrip("."))
+        if pillow_format is not None and pillow_format not in LOSSY_FORMATS:
+            raise ImgshError(f"{option} requires a lossy output format (jpg or webp), not {output_format}.")
+
+
 def validate_crop_box(x: int, y: int, width: int, height: int) -> None:
     validate_non_negative("--x", x)
     validate_non_negative("--y", y)
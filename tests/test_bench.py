@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from PIL import Image
+from typer.testing import CliRunner
+
+from imgsh.cli.main import app
+from imgsh.core.bench_engine import generate_corpus
+from imgsh.core.timing import percentile
+
+
+class BenchTests(unittest.TestCase):
+    def test_corpus_is_reproducible_and_covers_variants(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmp_path = Path(tmpdir)
+            first = generate_corpus(tmp_path / "a", resolutions=[(48, 32)])
+            second = generate_corpus(tmp_path / "b", resolutions=[(48, 32)])
+
+            self.assertEqual([path.name for path in first], [path.name for path in second])
+            for left, right in zip(first, second):
+                self.assertEqual(left.read_bytes(), right.read_bytes())
+            names = {path.name for path in first}
+            self.assertIn("48x32_rotated_seed1234.jpg", names)
+            self.assertNotIn("48x32_alpha_seed1234.jpg", names)
+            with Image.open(tmp_path / "a" / "48x32_alpha_seed1234.webp") as image:
+                self.assertEqual(image.mode, "RGBA")
+
+    def test_rerun_with_another_seed_regenerates_the_corpus(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            directory = Path(tmpdir)
+            first = generate_corpus(directory, resolutions=[(48, 32)], formats=["png"], seed=1)
+            again = generate_corpus(directory, resolutions=[(48, 32)], formats=["png"], seed=1)
+            other = generate_corpus(directory, resolutions=[(48, 32)], formats=["png"], seed=2)
+
+            self.assertEqual(first, again)
+            self.assertTrue(set(first).isdisjoint(other))
+            self.assertNotEqual(
+                [path.read_bytes() for path in first], [path.read_bytes() for path in other]
+            )
+
+    def test_percentile_interpolates(self) -> None:
+        self.assertEqual(percentile([4.0, 1.0, 3.0, 2.0], 0.5), 2.5)
+        self.assertEqual(percentile([1.0, 2.0], 0.95), 1.95)
+        self.assertIsNone(percentile([], 0.5))
+
+    def test_bench_command_reports_json(self) -> None:
+        result = CliRunner().invoke(
+            app,
+            ["bench", "--resolutions", "40x30", "--scenarios", "resize-cover,crop", "--json"],
+        )
+
+        self.assertEqual(result.exit_code, 0, result.output)
+        payload = json.loads(result.output)
+        self.assertEqual(
+            [entry["scenario"] for entry in payload["results"]], ["resize-cover", "crop"]
+        )
+        self.assertEqual(payload["results"][0]["images"], 8)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,307 @@
+from __future__ import annotations
+
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from PIL import Image
+from typer.testing import CliRunner
+
+from imgsh.cli.main import app
+from imgsh.core.ocr_engine import TextractBackend
+from imgsh.core.processor import ImageProcessor
+
+
+class BatchCliTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.runner = CliRunner()
+
+    def _make_inputs(self, input_dir: Path, count: int) -> list[Path]:
+        input_dir.mkdir(parents=True, exist_ok=True)
+        paths = []
+        for number in range(count):
+            path = input_dir / f"img{number}.png"
+            Image.new("RGB", (60, 40), color=(number * 20, 10, 10)).save(path)
+            paths.append(path)
+        return paths
+
+    def test_batch_resize_with_process_pool_keeps_index_naming(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmp_path = Path(tmpdir)
+            self._make_inputs(tmp_path / "in", count=5)
+            out_dir = tmp_path / "out"
+
+            result = self.runner.invoke(
+                app,
+                [
+                    "batch-resize",
+                    str(tmp_path / "in"),
+                    "--width",
+                    "30",
+                    "--out",
+                    str(out_dir),
+                    "--name-pattern",
+                    "{index}_{stem}",
+                    "--jobs",
+                    "2",
+                    "--max-tasks-per-child",
+                    "2",
+                ],
+            )
+
+            self.assertEqual(result.exit_code, 0, result.output)
+            self.assertIn("Processed: 5, Failed: 0", result.output)
+            for number in range(5):
+                output_path = out_dir / f"{number + 1}_img{number}.png"
+                self.assertTrue(output_path.exists(), output_path)
+                with Image.open(output_path) as resized:
+                    self.assertEqual(resized.size[0], 30)
+
+    def test_batch_resize_sizes_on_process_executor(self) -> None:
+        for extra in ([], ["--hardlink"]):
+            with self.subTest(extra=extra), tempfile.TemporaryDirectory() as tmpdir:
+                tmp_path = Path(tmpdir)
+                self._make_inputs(tmp_path / "in", count=2)
+                out_dir = tmp_path / "out"
+
+                result = self.runner.invoke(
+                    app,
+                    [
+                        "batch-resize",
+                        str(tmp_path / "in"),
+                        "--sizes",
+                        "20,40",
+                        "--formats",
+                        "webp,png",
+                        "--out",
+                        str(out_dir),
+                        "--executor",
+                        "process",
+                        "--jobs",
+                        "1",
+                        *extra,
+                    ],
+                )
+
+                self.assertEqual(result.exit_code, 0, result.output)
+                self.assertIn("Processed: 2, Failed: 0", result.output)
+                for number in range(2):
+                    for width in (20, 40):
+                        for extension in ("webp", "png"):
+                            output_path = out_dir / f"img{number}_imgsh_{width}.{extension}"
+                            with Image.open(output_path) as rendition:
+                                self.assertEqual(rendition.size[0], width)
+
+    def test_batch_resize_counts_failures(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmp_path = Path(tmpdir)
+            self._make_inputs(tmp_path / "in", count=2)
+            out_dir = tmp_path / "out"
+            out_dir.mkdir()
+            (out_dir / "img0_imgsh.png").write_bytes(b"existing")
+
+            result = self.runner.invoke(
+                app,
+                [
+                    "batch-resize",
+                    str(tmp_path / "in"),
+                    "--width",
+                    "30",
+                    "--out",
+                    str(out_dir),
+                    "--jobs",
+                    "1",
+                ],
+            )
+
+            self.assertEqual(result.exit_code, 1)
+            self.assertIn("Processed: 1, Failed: 1", result.output)
+
+    def test_batch_resize_thread_executor_reports_each_file(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmp_path = Path(tmpdir)
+            self._make_inputs(tmp_path / "in", count=4)
+            out_dir = tmp_path / "out"
+            out_dir.mkdir()
+            (out_dir / "img2_imgsh.png").write_bytes(b"existing")
+
+            result = self.runner.invoke(
+                app,
+                [
+                    "batch-resize",
+                    str(tmp_path / "in"),
+                    "--width",
+                    "30",
+                    "--out",
+                    str(out_dir),
+                    "--executor",
+                    "thread",
+                    "--jobs",
+                    "2",
+                ],
+            )
+
+            self.assertEqual(result.exit_code, 1)
+            self.assertIn("Processed: 3, Failed: 1", result.output)
+            self.assertIn("img2.png: Output already exists", result.output)
+            with Image.open(out_dir / "img3_imgsh.png") as resized:
+                self.assertEqual(resized.size, (30, 20))
+
+    def test_batch_resize_incremental_skips_unchanged_inputs(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmp_path = Path(tmpdir)
+            inputs = self._make_inputs(tmp_path / "in", count=3)
+            arguments = [
+                "batch-resize",
+                str(tmp_path / "in"),
+                "--width",
+                "30",
+                "--out",
+                str(tmp_path / "out"),
+                "--jobs",
+                "1",
+                "--incremental",
+            ]
+
+            first = self.runner.invoke(app, arguments)
+            self.assertEqual(first.exit_code, 0, first.output)
+            self.assertIn("Processed: 3, Failed: 0, Skipped: 0", first.output)
+
+            Image.new("RGB", (90, 30), color=(1, 2, 3)).save(inputs[1])
+            second = self.runner.invoke(app, arguments)
+            self.assertEqual(second.exit_code, 0, second.output)
+            self.assertIn("Processed: 1, Failed: 0, Skipped: 2", second.output)
+            with Image.open(tmp_path / "out" / "img1_imgsh.png") as resized:
+                self.assertEqual(resized.size, (30, 10))
+
+            changed_options = self.runner.invoke(app, [*arguments, "--quality", "70"])
+            self.assertIn("Processed: 3, Failed: 0, Skipped: 0", changed_options.output)
+
+    def test_batch_resize_runs_ocr_on_separate_pool(self) -> None:
+        for executor, expected in [("thread", "text of 30x20"), ("process", "text of file")]:
+            with self.subTest(executor=executor), tempfile.TemporaryDirectory() as tmpdir:
+                tmp_path = Path(tmpdir)
+                self._make_inputs(tmp_path / "in", count=3)
+                out_dir = tmp_path / "out"
+
+                with mock.patch.object(
+                    TextractBackend,
+                    "extract_text_from_image",
+                    autospec=True,
+                    side_effect=lambda self, image, lang: f"text of {image.width}x{image.height}",
+                ), mock.patch.object(
+                    TextractBackend, "extract_text", return_value="text of file"
+                ) as from_file:
+                    result = self.runner.invoke(
+                        app,
+                        [
+                            "batch-resize",
+                            str(tmp_path / "in"),
+                            "--width",
+                            "30",
+                            "--out",
+                            str(out_dir),
+                            "--jobs",
+                            "2",
+                            "--executor",
+                            executor,
+                            "--ocr",
+                            "--ocr-jobs",
+                            "2",
+                        ],
+                    )
+
+                self.assertEqual(result.exit_code, 0, result.output)
+                self.assertIn("Processed: 3, Failed: 0", result.output)
+                # Thread workers hand their pixels to OCR; process workers leave it the written files.
+                self.assertEqual(from_file.call_count, 0 if executor == "thread" else 3)
+                for number in range(3):
+                    sidecar = out_dir / f"img{number}_imgsh.txt"
+                    self.assertEqual(sidecar.read_text(encoding="utf-8"), expected)
+
+    def test_batch_resize_writes_jsonl_report(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmp_path = Path(tmpdir)
+            self._make_inputs(tmp_path / "in", count=2)
+            report_path = tmp_path / "report.jsonl"
+            arguments = [
+                "batch-resize",
+                str(tmp_path / "in"),
+                "--width",
+                "30",
+                "--out",
+                str(tmp_path / "out"),
+                "--jobs",
+                "1",
+                "--incremental",
+                "--report",
+                str(report_path),
+            ]
+
+            first = self.runner.invoke(app, arguments)
+            self.assertEqual(first.exit_code, 0, first.output)
+            records = [json.loads(line) for line in report_path.read_text().splitlines()]
+            self.assertEqual([record["type"] for record in records], ["file", "file", "summary"])
+            self.assertEqual(records[0]["status"], "ok")
+            self.assertEqual((records[0]["input_width"], records[0]["input_height"]), (60, 40))
+            self.assertEqual(records[0]["outputs"][0]["width"], 30)
+            self.assertGreater(records[0]["outputs"][0]["bytes"], 0)
+            self.assertEqual(records[-1]["processed"], 2)
+            self.assertIsNotNone(records[-1]["latency_ms"]["p95"])
+
+            second = self.runner.invoke(app, arguments)
+            self.assertEqual(second.exit_code, 0, second.output)
+            records = [json.loads(line) for line in report_path.read_text().splitlines()]
+            self.assertEqual([record["status"] for record in records[:-1]], ["skipped"] * 2)
+            self.assertEqual(records[-1]["skipped"], 2)
+
+    def test_batch_resize_dedupe_clones_duplicate_outputs(self) -> None:
+        for executor in ("process", "thread"):
+            with self.subTest(executor=executor), tempfile.TemporaryDirectory() as tmpdir:
+                tmp_path = Path(tmpdir)
+                first, _ = self._make_inputs(tmp_path / "in", count=2)
+                (tmp_path / "in" / "copy.png").write_bytes(first.read_bytes())
+                (tmp_path / "in" / "copy.jpg").write_bytes(first.read_bytes())
+                out_dir = tmp_path / "out"
+                report_path = tmp_path / "run.jsonl"
+
+                with mock.patch.object(
+                    ImageProcessor, "render", autospec=True, side_effect=ImageProcessor.render
+                ) as render:
+                    result = self.runner.invoke(
+                        app,
+                        [
+                            "batch-resize",
+                            str(tmp_path / "in"),
+                            "--width",
+                            "30",
+                            "--out",
+                            str(out_dir),
+                            "--dedupe",
+                            "--hardlink",
+                            "--executor",
+                            executor,
+                            "--jobs",
+                            "1",
+                            "--report",
+                            str(report_path),
+                        ],
+                    )
+
+                self.assertEqual(result.exit_code, 0, result.output)
+                # copy.jpg has the same bytes but a different output format, so it is rendered.
+                self.assertEqual(render.call_count, 3)
+                self.assertIn("Processed: 4, Failed: 0, Duplicates: 1", result.output)
+                self.assertIn(f"duplicate: {first} = {tmp_path / 'in' / 'copy.png'}", result.output)
+                self.assertTrue((out_dir / "img0_imgsh.png").samefile(out_dir / "copy_imgsh.png"))
+                self.assertFalse((out_dir / "img1_imgsh.png").samefile(out_dir / "copy_imgsh.png"))
+                records = [json.loads(line) for line in report_path.read_text().splitlines()]
+                duplicates = [record for record in records[:-1] if "duplicate_of" in record]
+                self.assertEqual([record["input"] for record in duplicates], [str(first)])
+                self.assertEqual(records[-1]["duplicates"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
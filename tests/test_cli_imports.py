@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+import unittest
+from pathlib import Path
+
+import typer
+
+from imgsh.cli.app import COMMANDS, app
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+# Loaded only by a command that actually runs, never for start-up, help or completion.
+HEAVY_MODULES = [
+    "PIL",
+    "multiprocessing",
+    "http.server",
+    "imgsh.core.processor",
+    "imgsh.core.ocr_engine",
+    "imgsh.core.batch_engine",
+]
+
+PROBE = """
+import contextlib, io, json, sys
+import imgsh.cli.main
+loaded = {"import": sorted(sys.modules)}
+for args in json.loads(sys.argv[1]):
+    with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+        try:
+            imgsh.cli.main.app(args=args, prog_name="imgsh")
+        except SystemExit:
+            pass
+    loaded[" ".join(args)] = sorted(sys.modules)
+print(json.dumps(loaded))
+"""
+
+
+def _loaded_modules(invocations: list[list[str]]) -> dict[str, list[str]]:
+    env = {
+        **os.environ,
+        "PYTHONPATH": os.pathsep.join(filter(None, [str(REPO_ROOT), os.environ.get("PYTHONPATH")])),
+    }
+    completed = subprocess.run(
+        [sys.executable, "-c", PROBE, json.dumps(invocations)],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+        timeout=60,
+    )
+    return json.loads(completed.stdout)
+
+
+class CliImportTests(unittest.TestCase):
+    def assertNotLoaded(self, modules: list[str], names: list[str], context: str) -> None:
+        loaded = [
+            module
+            for module in modules
+            if any(module == name or module.startswith(f"{name}.") for name in names)
+        ]
+        self.assertEqual(loaded, [], f"{context} imported {loaded}")
+
+    def test_importing_the_entry_point_does_not_load_typer(self) -> None:
+        modules = _loaded_modules([])["import"]
+        self.assertNotLoaded(modules, [*HEAVY_MODULES, "typer", "click", "rich"], "import")
+
+    def test_help_and_usage_errors_do_not_load_pillow_or_engines(self) -> None:
+        invocations = [["--help"], ["resize", "--width", "0"]]
+        invocations += [[name, "--help"] for name in COMMANDS]
+        for context, modules in _loaded_modules(invocations).items():
+            self.assertNotLoaded(modules, HEAVY_MODULES, context)
+
+    def test_command_table_matches_registered_commands(self) -> None:
+        group = typer.main.get_command(app)
+        context = typer.Context(group)
+        for name, (_, help_text) in COMMANDS.items():
+            command = group.get_command(context, name)
+            self.assertEqual(command.name, name)
+            self.assertEqual(command.help or "", help_text, name)
+
+
+if __name__ == "__main__":
+    unittest.main()
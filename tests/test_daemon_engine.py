@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import os
+import socket as socket_module
+import subprocess
+import sys
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from PIL import Image
+
+from imgsh.core.daemon_engine import (
+    DISABLE_ENV,
+    SOCKET_ENV,
+    daemon_request,
+    daemon_supported,
+    forward,
+    start_daemon,
+    stop_daemon,
+)
+from imgsh.core.errors import ImgshError
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+
+@unittest.skipUnless(daemon_supported(), "needs Unix sockets and fork")
+class DaemonEngineTests(unittest.TestCase):
+    def test_forward_falls_back_when_no_daemon_is_listening(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with mock.patch.dict(os.environ, {SOCKET_ENV: str(Path(tmpdir) / "missing.sock")}):
+                self.assertIsNone(forward(["resize", "in.jpg", "--width", "10"]))
+                self.assertIsNone(forward(["batch-resize", "in", "--width", "10"]))
+                self.assertIsNone(forward([]))
+
+    def test_forwarded_commands_match_in_process_runs(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            run_dir = root / "run"
+            run_dir.mkdir(mode=0o700)
+            socket = run_dir / "daemon.sock"
+            Image.new("RGB", (40, 20)).save(root / "in.png")
+            env = {
+                SOCKET_ENV: str(socket),
+                "PYTHONPATH": os.pathsep.join(
+                    filter(None, [str(REPO_ROOT), os.environ.get("PYTHONPATH")])
+                ),
+            }
+
+            def imgsh(*args: str, daemon: bool) -> subprocess.CompletedProcess:
+                run_env = {**os.environ, **env}
+                if not daemon:
+                    run_env[DISABLE_ENV] = "1"
+                return subprocess.run(
+                    [sys.executable, "-m", "imgsh", *args],
+                    cwd=root,
+                    env=run_env,
+                    capture_output=True,
+                    text=True,
+                    timeout=60,
+                )
+
+            with mock.patch.dict(os.environ, env):
+                start_daemon(socket)
+            try:
+                for daemon in (False, True):
+                    with self.subTest(daemon=daemon):
+                        output = f"out-{daemon}.png"
+                        resized = imgsh(
+                            "resize", "in.png", "--width", "10", "--out", output, daemon=daemon
+                        )
+                        self.assertEqual(
+                            (resized.returncode, resized.stdout), (0, f"Saved image: {output}\n")
+                        )
+                        with Image.open(root / output) as image:
+                            self.assertEqual(image.size, (10, 5))
+                        missing = imgsh(
+                            "crop", "missing.png", "--x", "0", "--y", "0",
+                            "--width", "5", "--height", "5", daemon=daemon,
+                        )
+                        self.assertEqual(missing.returncode, 1)
+                        self.assertIn("Error: File not found: missing.png", missing.stderr)
+                self.assertEqual(daemon_request(socket, "status")["served"], 2)
+            finally:
+                self.assertTrue(stop_daemon(socket))
+            self.assertFalse(socket.exists())
+            self.assertIsNone(daemon_request(socket, "status"))
+
+    def test_client_of_another_version_can_query_and_stop_the_daemon(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            run_dir = Path(tmpdir) / "run"
+            run_dir.mkdir(mode=0o700)
+            socket = run_dir / "daemon.sock"
+            env = {
+                "PYTHONPATH": os.pathsep.join(
+                    filter(None, [str(REPO_ROOT), os.environ.get("PYTHONPATH")])
+                )
+            }
+            with mock.patch.dict(os.environ, env):
+                start_daemon(socket)
+            try:
+                with mock.patch("imgsh.core.daemon_engine.__version__", "0.0.0-upgraded"):
+                    self.assertIn("pid", daemon_request(socket, "status"))
+                    self.assertTrue(stop_daemon(socket))
+            finally:
+                if socket.exists():
+                    stop_daemon(socket)
+            self.assertFalse(socket.exists())
+
+    def test_stop_raises_when_the_stop_is_not_acknowledged(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "daemon.sock"
+            listener = socket_module.socket(socket_module.AF_UNIX, socket_module.SOCK_STREAM)
+            listener.bind(str(path))
+            listener.listen(1)
+
+            def refuse() -> None:
+                connection, _ = listener.accept()
+                with connection:
+                    connection.recv(65536)
+                    connection.sendall(b'{"accepted": false}\n')
+
+            thread = threading.Thread(target=refuse)
+            thread.start()
+            try:
+                with self.assertRaisesRegex(ImgshError, "did not accept the stop request"):
+                    stop_daemon(path)
+            finally:
+                thread.join(timeout=10)
+                listener.close()
+
+    def test_forward_keeps_an_exit_message_read_together_with_the_acceptance(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "daemon.sock"
+            listener = socket_module.socket(socket_module.AF_UNIX, socket_module.SOCK_STREAM)
+            listener.bind(str(path))
+            listener.listen(1)
+
+            def finish_at_once() -> None:
+                connection, _ = listener.accept()
+                with connection:
+                    _, fds, _, _ = socket_module.recv_fds(connection, 65536, 3)
+                    for fd in fds:
+                        os.close(fd)
+                    connection.sendall(b'{"accepted": true}\n{"exit": 2}\n')
+
+            thread = threading.Thread(target=finish_at_once)
+            thread.start()
+            try:
+                with mock.patch.dict(os.environ, {SOCKET_ENV: str(path)}):
+                    os.environ.pop(DISABLE_ENV, None)
+                    code = forward(["resize", "in.jpg", "--width", "10"])
+            finally:
+                thread.join(timeout=10)
+                listener.close()
+
+            self.assertEqual(code, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
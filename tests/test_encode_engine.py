@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from PIL import Image
+from typer.testing import CliRunner, Result
+
+from imgsh.cli.main import app
+from imgsh.core.encode_engine import encode_within
+from imgsh.core.errors import ImgshError
+from imgsh.core.metadata import encode_image
+
+
+class EncodeWithinTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.image = Image.effect_noise((320, 240), 60).convert("RGB")
+
+    def test_picks_highest_quality_that_fits(self) -> None:
+        limit = len(encode_image(self.image, "JPEG", 50, None)) + 1
+        data, quality = encode_within(self.image, "JPEG", limit, None, None)
+
+        self.assertLessEqual(len(data), limit)
+        self.assertGreaterEqual(quality, 50)
+        self.assertLess(quality, 90)
+        self.assertGreater(len(encode_image(self.image, "JPEG", quality + 1, None)), limit)
+        self.assertEqual(data, encode_image(self.image, "JPEG", quality, None))
+
+    def test_parallel_search_matches_sequential(self) -> None:
+        limit = len(encode_image(self.image, "WEBP", 40, None))
+        sequential = encode_within(self.image, "WEBP", limit, 80, None)
+        parallel = encode_within(self.image, "WEBP", limit, 80, None, jobs=3)
+
+        self.assertEqual(sequential, parallel)
+
+    def test_parallel_search_never_shares_an_image_between_threads(self) -> None:
+        busy: set[int] = set()
+        shared: list[int] = []
+        lock = threading.Lock()
+
+        def exclusive_encode(image: Image.Image, pillow_format: str, quality: int, exif: None) -> bytes:
+            with lock:
+                if id(image) in busy:
+                    shared.append(id(image))
+                busy.add(id(image))
+            try:
+                # Higher qualities take longer, so a round's stale encodes outlive its first result.
+                time.sleep(quality / 2000)
+                return encode_image(image, pillow_format, quality, exif)
+            finally:
+                with lock:
+                    busy.discard(id(image))
+
+        limit = len(encode_image(self.image, "JPEG", 30, None))
+        with mock.patch("imgsh.core.encode_engine.encode_image", side_effect=exclusive_encode):
+            encode_within(self.image, "JPEG", limit, None, None, jobs=4)
+
+        self.assertEqual(shared, [])
+
+    def test_quality_caps_the_search(self) -> None:
+        _, quality = encode_within(self.image, "JPEG", 10**9, 70, None)
+
+        self.assertEqual(quality, 70)
+
+    def test_rejects_lossless_format_and_impossible_limit(self) -> None:
+        with self.assertRaisesRegex(ImgshError, "lossy output format"):
+            encode_within(self.image, "PNG", 10_000, None, None)
+        with self.assertRaisesRegex(ImgshError, "Cannot encode under 10 bytes"):
+            encode_within(self.image, "JPEG", 10, None, None, jobs=2)
+
+
+class MaxBytesCliTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.runner = CliRunner()
+
+    def test_resize_writes_output_under_limit(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmp_path = Path(tmpdir)
+            input_path = tmp_path / "noise.png"
+            Image.effect_noise((640, 480), 60).convert("RGB").save(input_path)
+            output_path = tmp_path / "small.jpg"
+
+            result = self.runner.invoke(
+                app,
+                [
+                    "resize",
+                    str(input_path),
+                    "--width",
+                    "400",
+                    "--max-kb",
+                    "12",
+                    "--out",
+                    str(output_path),
+                ],
+            )
+
+            self.assertEqual(result.exit_code, 0, result.output)
+            self.assertIn("quality", result.output)
+            self.assertLessEqual(output_path.stat().st_size, 12 * 1024)
+
+    def test_convert_copies_source_only_when_it_fits(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmp_path = Path(tmpdir)
+            input_path = tmp_path / "noise.jpg"
+            Image.effect_noise((320, 240), 60).convert("RGB").save(input_path, quality=95)
+            size = input_path.stat().st_size
+
+            def convert(limit: int, name: str) -> Result:
+                return self.runner.invoke(
+                    app,
+                    ["convert", str(input_path), "--format", "jpg"]
+                    + ["--max-bytes", str(limit), "--out", str(tmp_path / name)],
+                )
+
+            fits = convert(size, "a.jpg")
+            shrunk = convert(size // 2, "b.jpg")
+
+            self.assertEqual(fits.exit_code, 0, fits.output)
+            self.assertEqual((tmp_path / "a.jpg").read_bytes(), input_path.read_bytes())
+            self.assertEqual(shrunk.exit_code, 0, shrunk.output)
+            self.assertLessEqual((tmp_path / "b.jpg").stat().st_size, size // 2)
+
+    def test_rejects_both_limits_and_lossless_format(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            input_path = Path(tmpdir) / "photo.png"
+            Image.new("RGB", (40, 30)).save(input_path)
+
+            both = self.runner.invoke(
+                app, ["convert", str(input_path), "--format", "jpg", "--max-bytes", "10", "--max-kb", "1"]
+            )
+            lossless = self.runner.invoke(
+                app, ["convert", str(input_path), "--format", "png", "--max-kb", "1"]
+            )
+
+            self.assertEqual(both.exit_code, 1)
+            self.assertIn("not both", both.output)
+            self.assertEqual(lossless.exit_code, 1)
+            self.assertIn("lossy", lossless.output)
+
+
+if __name__ == "__main__":
+    unittest.main()
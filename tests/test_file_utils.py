@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import io
+import tempfile
+import unittest
+from pathlib import Path
+
+from PIL import Image
+
+from imgsh.utils.file_utils import (
+    clone_file,
+    iter_image_files,
+    iter_listed_files,
+    sniff_image_format,
+)
+
+
+class FileUtilsTests(unittest.TestCase):
+    def test_iter_image_files_streams_in_sorted_path_order(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            for name in ["b.png", "a.jpg", "a-x.webp", "a/c.png", "a/d/e.jpg", "a.b/f.jpeg", "x.txt"]:
+                path = root / name
+                path.parent.mkdir(parents=True, exist_ok=True)
+                path.write_bytes(b"")
+
+            expected = sorted(
+                path
+                for path in root.glob("**/*")
+                if path.is_file() and path.suffix != ".txt"
+            )
+
+            self.assertEqual(list(iter_image_files(root, recursive=True)), expected)
+            self.assertEqual(
+                sorted(iter_image_files(root, recursive=True, sort=False)), expected
+            )
+            self.assertEqual(
+                list(iter_image_files(root, recursive=False)),
+                [root / "a-x.webp", root / "a.jpg", root / "b.png"],
+            )
+
+    def test_clone_file_replaces_destination_and_can_hardlink(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            source = root / "source.png"
+            source.write_bytes(b"pixels" * 1000)
+            copied = root / "out" / "copy.png"
+            copied.parent.mkdir()
+            copied.write_bytes(b"stale")
+
+            clone_file(source, copied)
+            clone_file(source, root / "out" / "linked.png", hardlink=True)
+
+            self.assertEqual(copied.read_bytes(), source.read_bytes())
+            self.assertNotEqual(copied.stat().st_ino, source.stat().st_ino)
+            self.assertEqual((root / "out" / "linked.png").stat().st_ino, source.stat().st_ino)
+            self.assertEqual(
+                sorted(path.name for path in copied.parent.iterdir()), ["copy.png", "linked.png"]
+            )
+
+    def test_sniff_detects_images_without_extension(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            Image.new("RGB", (4, 4)).save(root / "photo", format="WEBP")
+            (root / "notes.jpg").write_text("not an image", encoding="utf-8")
+
+            self.assertEqual(sniff_image_format(root / "photo"), "WEBP")
+            self.assertIsNone(sniff_image_format(root / "notes.jpg"))
+            self.assertEqual(
+                list(iter_image_files(root, recursive=False, sniff=True)), [root / "photo"]
+            )
+
+    def test_iter_listed_files_supports_newline_and_nul_separators(self) -> None:
+        newline_list = io.BytesIO(b"a.jpg\r\nb c.png\n\nd.webp")
+        nul_list = io.BytesIO(b"a.jpg\0odd\nname.png\0")
+
+        self.assertEqual(
+            list(iter_listed_files(newline_list)),
+            [Path("a.jpg"), Path("b c.png"), Path("d.webp")],
+        )
+        self.assertEqual(
+            list(iter_listed_files(nul_list, null_separated=True)),
+            [Path("a.jpg"), Path("odd\nname.png")],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from PIL import Image
+from typer.testing import CliRunner
+
+from imgsh.cli.main import app
+from imgsh.core.ocr_cache import OcrCache, image_sha256
+from imgsh.core.ocr_engine import TextractBackend
+
+
+class OcrCacheTests(unittest.TestCase):
+    def test_extract_text_reuses_cached_text_for_same_content(self) -> None:
+        runner = CliRunner()
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmp_path = Path(tmpdir)
+            first = tmp_path / "first.png"
+            Image.new("RGB", (20, 10), color=(200, 10, 10)).save(first)
+            copy = tmp_path / "copy.png"
+            copy.write_bytes(first.read_bytes())
+            cache_dir = tmp_path / "cache"
+
+            with mock.patch.object(
+                TextractBackend, "extract_text", return_value="hello"
+            ) as engine:
+                outputs = [
+                    runner.invoke(
+                        app, ["extract-text", str(path), "--ocr-cache-dir", str(cache_dir)]
+                    )
+                    for path in (first, copy)
+                ]
+
+            self.assertEqual(engine.call_count, 1)
+            self.assertIn("OCR cache: 0 hit(s), 1 miss(es)", outputs[0].output)
+            self.assertIn("OCR cache: 1 hit(s), 0 miss(es)", outputs[1].output)
+            self.assertEqual((tmp_path / "copy.txt").read_text(encoding="utf-8"), "hello")
+
+    def test_no_ocr_cache_wins_over_cache_dir(self) -> None:
+        runner = CliRunner()
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmp_path = Path(tmpdir)
+            input_path = tmp_path / "scan.png"
+            Image.new("RGB", (20, 10)).save(input_path)
+            cache_dir = tmp_path / "cache"
+
+            with mock.patch.object(TextractBackend, "extract_text", return_value="hello"):
+                result = runner.invoke(
+                    app,
+                    ["extract-text", str(input_path), "--no-ocr-cache", "--ocr-cache-dir", str(cache_dir)],
+                )
+
+            self.assertEqual(result.exit_code, 0, result.output)
+            self.assertNotIn("OCR cache:", result.output)
+            self.assertFalse(cache_dir.exists())
+
+    def test_overwriting_an_entry_keeps_the_size_exact(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cache = OcrCache(Path(tmpdir), max_bytes=1000)
+            cache.put("aa01", "x" * 10)
+            for _ in range(5):
+                cache.put("bb02", "y" * 10)
+
+            self.assertEqual(cache._size, 20)
+            self.assertEqual(cache.get("aa01"), "x" * 10)
+
+    def test_image_hash_in_bands_matches_hashing_all_pixels_at_once(self) -> None:
+        image = Image.effect_noise((97, 61), 50).convert("RGB")
+        whole = hashlib.sha256(b"RGB:97x61:" + image.tobytes()).hexdigest()
+
+        for chunk_size in (1, 1000, 10**9):
+            with self.subTest(chunk_size=chunk_size), mock.patch(
+                "imgsh.core.ocr_cache.HASH_CHUNK_SIZE", chunk_size
+            ):
+                self.assertEqual(image_sha256(image), whole)
+
+    def test_put_evicts_least_recently_used_entries(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cache = OcrCache(Path(tmpdir), max_bytes=25)
+            cache.put("aa01", "x" * 10)
+            cache.put("bb02", "y" * 10)
+            old = cache._entry_path("aa01")
+            os.utime(old, ns=(0, 0))
+            os.utime(cache._entry_path("bb02"), ns=(10**9, 10**9))
+            cache.put("cc03", "z" * 10)
+
+            self.assertIsNone(cache.get("aa01"))
+            self.assertEqual(cache.get("bb02"), "y" * 10)
+            self.assertEqual(cache.get("cc03"), "z" * 10)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import sys
+import threading
+import types
+import unittest
+from unittest import mock
+
+from PIL import Image
+
+from imgsh.core.errors import ImgshError
+from imgsh.core.ocr_engine import (
+    OCRBackend,
+    TesserocrBackend,
+    available_backends,
+    get_backend,
+    register_backend,
+)
+
+
+class FakeTessBaseAPI:
+    created: list[FakeTessBaseAPI] = []
+
+    def __init__(self, lang: str) -> None:
+        self.lang = lang
+        self.image = None
+        FakeTessBaseAPI.created.append(self)
+
+    def SetImage(self, image: Image.Image) -> None:
+        self.image = image
+
+    def GetUTF8Text(self) -> str:
+        return f"{self.lang}:{self.image.width}"
+
+
+class OcrEngineTests(unittest.TestCase):
+    def test_registry_lists_and_rejects_engines(self) -> None:
+        self.assertIn("textract", available_backends())
+        self.assertIn("tesserocr", available_backends())
+        self.assertIs(get_backend("textract"), get_backend("textract"))
+        with self.assertRaises(ImgshError):
+            get_backend("nope")
+
+    def test_incomplete_backend_is_rejected_at_registration(self) -> None:
+        class Incomplete(OCRBackend):
+            name = "incomplete"
+
+        with self.assertRaisesRegex(ImgshError, "does not implement: extract_text"):
+            register_backend(Incomplete.name, Incomplete)
+        self.assertNotIn("incomplete", available_backends())
+
+    def test_tesserocr_reuses_one_engine_per_thread_and_language(self) -> None:
+        FakeTessBaseAPI.created = []
+        fake_module = types.SimpleNamespace(PyTessBaseAPI=FakeTessBaseAPI)
+        with mock.patch.dict(sys.modules, {"tesserocr": fake_module}):
+            backend = TesserocrBackend()
+
+        texts = [
+            backend.extract_text_from_image(Image.new("L", (width, 4)), lang="en")
+            for width in (5, 6, 7)
+        ]
+        worker = threading.Thread(
+            target=backend.extract_text_from_image, args=(Image.new("L", (8, 4)), "en")
+        )
+        worker.start()
+        worker.join()
+
+        self.assertEqual(texts, ["eng:5", "eng:6", "eng:7"])
+        self.assertEqual(len(FakeTessBaseAPI.created), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
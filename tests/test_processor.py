@@ -0,0 +1,243 @@
+from __future__ import annotations
+
+import tempfile
+import unittest
+from pathlib import Path
+
+from PIL import Image, ImageChops, ImageStat
+
+from imgsh.core.errors import ImgshError
+from imgsh.core.processor import ImageProcessor
+
+
+class ProcessorTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.processor = ImageProcessor()
+
+    def test_renditions_write_every_size_and_format(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmp_path = Path(tmpdir)
+            input_path = tmp_path / "photo.png"
+            Image.new("RGB", (997, 601), color=(40, 80, 120)).save(input_path)
+
+            results = self.processor.renditions(
+                input_path=input_path,
+                out=tmp_path / "out",
+                sizes=[120, 480, 240],
+                formats=["webp", "jpg"],
+            )
+
+            self.assertEqual(
+                [result.output_path.name for result in results],
+                [
+                    "photo_480.webp",
+                    "photo_480.jpg",
+                    "photo_240.webp",
+                    "photo_240.jpg",
+                    "photo_120.webp",
+                    "photo_120.jpg",
+                ],
+            )
+            for result in results:
+                width = int(result.output_path.stem.rsplit("_", 1)[1])
+                direct = self.processor.resize(
+                    input_path=input_path,
+                    out=tmp_path / "direct" / result.output_path.name,
+                    width=width,
+                    height=None,
+                    keep_aspect=True,
+                    fit="contain",
+                )
+                with Image.open(result.output_path) as rendition, Image.open(
+                    direct.output_path
+                ) as expected:
+                    self.assertEqual(rendition.size, expected.size)
+
+    def test_draft_decode_matches_full_decode_for_rotated_crop(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmp_path = Path(tmpdir)
+            input_path = tmp_path / "rotated.jpg"
+            exif = Image.Exif()
+            exif[0x0112] = 6
+            source = Image.linear_gradient("L").resize((1600, 1200)).convert("RGB")
+            source.save(input_path, exif=exif.tobytes(), quality=95)
+
+            outputs = []
+            for draft in (True, False):
+                result = self.processor.resize(
+                    input_path=input_path,
+                    out=tmp_path / f"draft_{draft}.png",
+                    width=100,
+                    height=None,
+                    keep_aspect=True,
+                    fit="contain",
+                    crop_box=(100, 300, 800, 1000),
+                    draft=draft,
+                )
+                outputs.append(Image.open(result.output_path).convert("RGB"))
+
+            self.assertEqual(outputs[0].size, (100, 125))
+            self.assertEqual(outputs[0].size, outputs[1].size)
+            difference = ImageStat.Stat(ImageChops.difference(*outputs)).mean
+            self.assertLess(max(difference), 2.0)
+
+    def test_timings_record_stages_and_counts_only_when_requested(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmp_path = Path(tmpdir)
+            input_path = tmp_path / "photo.png"
+            Image.new("RGB", (200, 100), color=(10, 20, 30)).save(input_path)
+
+            plain = self.processor.resize(
+                input_path=input_path,
+                out=tmp_path / "plain.png",
+                width=50,
+                height=None,
+                keep_aspect=True,
+                fit="contain",
+            )
+            timed = self.processor.resize(
+                input_path=input_path,
+                out=tmp_path / "timed.png",
+                width=50,
+                height=None,
+                keep_aspect=True,
+                fit="contain",
+                crop_box=(0, 0, 100, 100),
+                timings=True,
+            )
+
+            self.assertIsNone(plain.timings)
+            self.assertEqual(
+                list(timed.timings.stages), ["open", "decode", "orient", "resize", "encode"]
+            )
+            self.assertEqual(timed.timings.counters["input_pixels"], 200 * 100)
+            self.assertEqual(timed.timings.counters["output_pixels"], 50 * 50)
+            self.assertEqual(timed.timings.counters["input_bytes"], input_path.stat().st_size)
+            self.assertEqual(
+                timed.timings.counters["output_bytes"], timed.output_path.stat().st_size
+            )
+
+    def test_identity_convert_and_resize_copy_the_file(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmp_path = Path(tmpdir)
+            input_path = tmp_path / "photo.jpg"
+            Image.new("RGB", (64, 48), color=(200, 100, 50)).save(input_path, quality=70)
+
+            converted = self.processor.convert(
+                input_path=input_path, out=None, output_format="jpg", timings=True
+            )
+            resized = self.processor.resize(
+                input_path=input_path,
+                out=tmp_path / "same_width.jpg",
+                width=64,
+                height=None,
+                keep_aspect=True,
+                fit="contain",
+            )
+            requantized = self.processor.convert(
+                input_path=input_path, out=tmp_path / "q.jpg", output_format="jpg", quality=90
+            )
+
+            self.assertEqual(converted.output_path.read_bytes(), input_path.read_bytes())
+            self.assertEqual(list(converted.timings.stages), ["open", "copy"])
+            self.assertEqual(converted.size, (64, 48))
+            self.assertEqual(resized.output_path.read_bytes(), input_path.read_bytes())
+            self.assertNotEqual(requantized.output_path.read_bytes(), input_path.read_bytes())
+
+            # An EXIF rotation still has to be applied, so the file is re-encoded.
+            rotated_path = tmp_path / "rotated.jpg"
+            exif = Image.Exif()
+            exif[0x0112] = 6
+            Image.new("RGB", (64, 48)).save(rotated_path, exif=exif.tobytes())
+            rotated = self.processor.convert(
+                input_path=rotated_path, out=None, output_format="jpg", timings=True
+            )
+            self.assertIn("encode", rotated.timings.stages)
+            self.assertEqual(rotated.size, (48, 64))
+
+    def test_low_memory_matches_regular_path_for_every_orientation(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmp_path = Path(tmpdir)
+            source = Image.effect_mandelbrot((480, 320), (-2.0, -1.2, 0.8, 1.2), 60).convert("RGB")
+            for orientation in range(1, 9):
+                input_path = tmp_path / f"orientation_{orientation}.png"
+                exif = Image.Exif()
+                exif[0x0112] = orientation
+                source.save(input_path, exif=exif.tobytes())
+                for fit, width, height in (("contain", 90, None), ("cover", 80, 60)):
+                    outputs = []
+                    for low_memory in (False, True):
+                        result = self.processor.resize(
+                            input_path=input_path,
+                            out=tmp_path / f"{orientation}_{fit}_{low_memory}.png",
+                            width=width,
+                            height=height,
+                            keep_aspect=True,
+                            fit=fit,
+                            crop_box=(20, 30, 250, 200),
+                            low_memory=low_memory,
+                        )
+                        outputs.append(Image.open(result.output_path).convert("RGB"))
+                    with self.subTest(orientation=orientation, fit=fit):
+                        self.assertEqual(outputs[0].size, outputs[1].size)
+                        difference = ImageStat.Stat(ImageChops.difference(*outputs)).mean
+                        self.assertLess(max(difference), 1.0)
+
+                cropped = [
+                    self.processor.crop(
+                        input_path=input_path,
+                        out=tmp_path / f"{orientation}_crop_{low_memory}.png",
+                        x=15,
+                        y=25,
+                        width=100,
+                        height=70,
+                        low_memory=low_memory,
+                    ).output_path
+                    for low_memory in (False, True)
+                ]
+                with Image.open(cropped[0]) as regular, Image.open(cropped[1]) as low:
+                    self.assertIsNone(ImageChops.difference(regular, low).getbbox())
+
+    def test_memory_budget_rejects_before_decoding(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmp_path = Path(tmpdir)
+            input_path = tmp_path / "large.png"
+            Image.new("RGB", (2000, 1000)).save(input_path)
+
+            with self.assertRaisesRegex(ImgshError, "2.0 MP"):
+                self.processor.resize(
+                    input_path=input_path,
+                    out=tmp_path / "out.png",
+                    width=100,
+                    height=None,
+                    keep_aspect=True,
+                    fit="contain",
+                    max_pixels=1_000_000,
+                )
+            with self.assertRaisesRegex(ImgshError, "MB budget"):
+                self.processor.convert(
+                    input_path=input_path,
+                    out=tmp_path / "out.webp",
+                    output_format="webp",
+                    max_bytes=8 * 1024 * 1024,
+                )
+            self.assertFalse((tmp_path / "out.png").exists())
+
+            # A JPEG drafted down to fit the budget is accepted.
+            jpeg_path = tmp_path / "large.jpg"
+            Image.new("RGB", (2000, 1000)).save(jpeg_path)
+            result = self.processor.resize(
+                input_path=jpeg_path,
+                out=tmp_path / "small.jpg",
+                width=100,
+                height=None,
+                keep_aspect=True,
+                fit="contain",
+                low_memory=True,
+                max_pixels=1_000_000,
+            )
+            self.assertEqual(result.size, (100, 50))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import importlib.util
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from io import BytesIO
+from pathlib import Path
+from unittest import mock
+
+from PIL import Image, ImageFilter
+from typer.testing import CliRunner
+
+from imgsh.cli.main import app
+from imgsh.core.encode_engine import encode_for_ssim
+from imgsh.core.errors import ImgshError
+from imgsh.core.metadata import encode_image
+from imgsh.core.quality_metrics import luma, ssim
+
+HAS_NUMPY = importlib.util.find_spec("numpy") is not None
+
+
+@unittest.skipUnless(HAS_NUMPY, "needs numpy")
+class SsimTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.image = Image.effect_noise((300, 200), 50).convert("RGB")
+
+    def test_identical_images_score_one_and_blur_scores_lower(self) -> None:
+        reference = luma(self.image)
+        blurred = luma(self.image.filter(ImageFilter.GaussianBlur(2)))
+
+        self.assertAlmostEqual(ssim(reference, reference), 1.0)
+        self.assertLess(ssim(reference, blurred), 0.9)
+
+    def test_luma_is_downsampled_to_max_side(self) -> None:
+        self.assertEqual(luma(self.image, max_side=100).shape, (67, 100))
+
+    def test_search_picks_lowest_quality_meeting_target(self) -> None:
+        smooth = Image.linear_gradient("L").resize((300, 200)).convert("RGB")
+        reference = luma(self.image)
+
+        data, quality = encode_for_ssim(self.image, "JPEG", 0.95, None, None)
+        _, smooth_quality = encode_for_ssim(smooth, "JPEG", 0.95, None, None)
+        parallel = encode_for_ssim(self.image, "JPEG", 0.95, None, None, jobs=3)
+
+        with Image.open(BytesIO(data)) as decoded:
+            self.assertGreaterEqual(ssim(reference, luma(decoded)), 0.95)
+        self.assertLess(smooth_quality, quality)
+        self.assertLessEqual(quality, 90)
+        self.assertGreaterEqual(parallel[1], quality - 1)
+
+    def test_ceiling_is_used_when_target_is_out_of_reach(self) -> None:
+        for jobs in (1, 3):
+            with self.subTest(jobs=jobs), mock.patch(
+                "imgsh.core.encode_engine.encode_image", wraps=encode_image
+            ) as encode:
+                data, quality = encode_for_ssim(self.image, "WEBP", 1.0, 40, None, jobs=jobs)
+
+                self.assertEqual(quality, 40)
+                self.assertEqual(data, encode_image(self.image, "WEBP", 40, None))
+                self.assertEqual([call.args[2] for call in encode.call_args_list].count(40), 1)
+
+    def test_parallel_search_never_shares_an_image_between_threads(self) -> None:
+        busy: set[int] = set()
+        shared: list[int] = []
+        lock = threading.Lock()
+
+        def exclusive_encode(image: Image.Image, pillow_format: str, quality: int, exif: None) -> bytes:
+            with lock:
+                if id(image) in busy:
+                    shared.append(id(image))
+                busy.add(id(image))
+            try:
+                # Higher qualities take longer, so a round's stale encodes outlive its first result.
+                time.sleep(quality / 300)
+                return encode_image(image, pillow_format, quality, exif)
+            finally:
+                with lock:
+                    busy.discard(id(image))
+
+        with mock.patch("imgsh.core.encode_engine.encode_image", side_effect=exclusive_encode):
+            encode_for_ssim(self.image, "JPEG", 0.5, None, None, jobs=4)
+
+        self.assertEqual(shared, [])
+
+
+class TargetSsimCliTests(unittest.TestCase):
+    def test_missing_numpy_is_reported_before_processing(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            input_path = Path(tmpdir) / "photo.png"
+            Image.new("RGB", (40, 30)).save(input_path)
+
+            with mock.patch.dict(sys.modules, {"numpy": None}):
+                result = CliRunner().invoke(
+                    app, ["convert", str(input_path), "--format", "jpg", "--target-ssim", "0.98"]
+                )
+
+            self.assertEqual(result.exit_code, 1)
+            self.assertIn("needs NumPy", result.output)
+            self.assertFalse((Path(tmpdir) / "photo_converted.jpg").exists())
+
+    @unittest.skipUnless(HAS_NUMPY, "needs numpy")
+    def test_lossless_output_is_rejected_even_when_the_source_could_be_copied(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            input_path = Path(tmpdir) / "photo.png"
+            Image.new("RGB", (40, 30)).save(input_path)
+
+            for option in (["--target-ssim", "0.9"], ["--max-kb", "100"]):
+                with self.subTest(option=option):
+                    result = CliRunner().invoke(
+                        app, ["resize", str(input_path), "--width", "40", *option]
+                    )
+
+                    self.assertEqual(result.exit_code, 1, result.output)
+                    self.assertIn("requires a lossy output format", result.output)
+                    self.assertFalse((Path(tmpdir) / "photo_imgsh.png").exists())
+
+    def test_rejects_out_of_range_target(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            input_path = Path(tmpdir) / "photo.png"
+            Image.new("RGB", (40, 30)).save(input_path)
+
+            result = CliRunner().invoke(
+                app, ["convert", str(input_path), "--format", "jpg", "--target-ssim", "1.5"]
+            )
+
+            self.assertEqual(result.exit_code, 1)
+            self.assertIn("at most 1", result.output)
+
+    def test_metrics_raise_without_numpy(self) -> None:
+        with mock.patch.dict(sys.modules, {"numpy": None}):
+            with self.assertRaisesRegex(ImgshError, "needs NumPy"):
+                luma(Image.new("RGB", (4, 4)))
+
+if __name__ == "__main__":
+    unittest.main()
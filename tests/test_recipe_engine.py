@@ -0,0 +1,210 @@
+from __future__ import annotations
+
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from PIL import Image
+from typer.testing import CliRunner
+
+from imgsh.cli.main import app
+from imgsh.core.errors import ImgshError
+from imgsh.core.ocr_engine import TextractBackend
+from imgsh.core.recipe_engine import (
+    CropStep,
+    OutputStep,
+    ResizeStep,
+    load_recipe,
+    parse_recipe,
+    run_recipe,
+)
+
+TOML_RECIPE = """
+[[steps]]
+op = "crop"
+x = 10
+y = 0
+width = 80
+height = 60
+
+[[steps]]
+op = "resize"
+width = 40
+
+[[steps]]
+op = "strip-exif"
+
+[[steps]]
+op = "output"
+name = "{stem}_large"
+
+[[steps]]
+op = "ocr"
+
+[[steps]]
+op = "resize"
+width = 20
+
+[[steps]]
+op = "convert"
+format = "webp"
+quality = 70
+
+[[steps]]
+op = "output"
+name = "{stem}_small"
+"""
+
+
+class RecipeEngineTests(unittest.TestCase):
+    def test_toml_recipe_fuses_crop_and_appends_no_default_output(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            recipe_path = Path(tmpdir) / "recipe.toml"
+            recipe_path.write_text(TOML_RECIPE, encoding="utf-8")
+
+            steps = load_recipe(recipe_path).steps
+
+        self.assertIsInstance(steps[0], ResizeStep)
+        self.assertEqual(steps[0].crop_box, (10, 0, 80, 60))
+        self.assertFalse(any(isinstance(step, CropStep) for step in steps))
+        self.assertEqual(steps[-1], OutputStep(name="{stem}_small"))
+
+    def test_json_recipe_gets_default_output_and_rejects_bad_steps(self) -> None:
+        recipe = parse_recipe(json.loads('{"steps": [{"op": "resize", "width": 10}]}'))
+        self.assertEqual(recipe.steps[-1], OutputStep())
+
+        for data in [
+            {"steps": []},
+            {"steps": [{"op": "sharpen"}]},
+            {"steps": [{"op": "resize", "width": 10, "colour": "red"}]},
+            {"steps": [{"op": "crop", "x": 0, "y": 0}]},
+            {"steps": [{"op": "output"}, {"op": "resize", "width": 10}]},
+        ]:
+            with self.assertRaises(ImgshError, msg=data):
+                parse_recipe(data)
+
+    def test_run_decodes_once_and_writes_every_output(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmp_path = Path(tmpdir)
+            input_path = tmp_path / "photo.jpg"
+            Image.new("RGB", (100, 60), color=(200, 30, 30)).save(input_path)
+            recipe_path = tmp_path / "recipe.toml"
+            recipe_path.write_text(TOML_RECIPE, encoding="utf-8")
+
+            with mock.patch.object(
+                TextractBackend,
+                "extract_text_from_image",
+                autospec=True,
+                side_effect=lambda self, image, lang: f"text of {image.width}x{image.height}",
+            ), mock.patch.object(Image, "open", wraps=Image.open) as image_open:
+                results = run_recipe(
+                    load_recipe(recipe_path), input_path, out_dir=tmp_path / "out", timings=True
+                )
+
+            image_open.assert_called_once_with(input_path)
+
+            self.assertEqual(
+                [result.output_path.name for result in results],
+                ["photo_large.jpg", "photo_small.webp"],
+            )
+            self.assertEqual([result.size for result in results], [(40, 30), (20, 15)])
+            self.assertEqual(results[0].ocr_path.read_text(encoding="utf-8"), "text of 40x30")
+            with Image.open(results[1].output_path) as small:
+                self.assertEqual(small.format, "WEBP")
+            counters = results[0].timings.counters
+            self.assertEqual(counters["input_pixels"], 100 * 60)
+            self.assertEqual(counters["output_pixels"], 40 * 30 + 20 * 15)
+
+    def test_cli_runs_recipe_over_directory(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmp_path = Path(tmpdir)
+            for number in range(3):
+                path = tmp_path / "in" / ("nested" if number else "") / f"img{number}.png"
+                path.parent.mkdir(parents=True, exist_ok=True)
+                Image.new("RGB", (60, 40), color=(number * 40, 10, 10)).save(path)
+            recipe_path = tmp_path / "recipe.json"
+            recipe_path.write_text(
+                json.dumps(
+                    {
+                        "steps": [
+                            {"op": "resize", "width": 30},
+                            {"op": "output", "name": "{index}_{stem}", "format": "jpg"},
+                        ]
+                    }
+                ),
+                encoding="utf-8",
+            )
+
+            result = CliRunner().invoke(
+                app,
+                [
+                    "pipeline",
+                    str(recipe_path),
+                    str(tmp_path / "in"),
+                    "--out",
+                    str(tmp_path / "out"),
+                    "--recursive",
+                    "--jobs",
+                    "2",
+                ],
+            )
+
+            self.assertEqual(result.exit_code, 0, result.output)
+            self.assertIn("Processed: 3, Failed: 0", result.output)
+            outputs = sorted(
+                str(path.relative_to(tmp_path / "out")) for path in (tmp_path / "out").rglob("*.jpg")
+            )
+            self.assertEqual(outputs, ["1_img0.jpg", "nested/2_img1.jpg", "nested/3_img2.jpg"])
+
+    def test_run_enforces_pillow_limit_and_memory_budget(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmp_path = Path(tmpdir)
+            input_path = tmp_path / "photo.png"
+            Image.new("RGB", (60, 40)).save(input_path)
+            recipe_path = tmp_path / "recipe.json"
+            recipe_path.write_text(
+                json.dumps({"steps": [{"op": "resize", "width": 30}]}), encoding="utf-8"
+            )
+            recipe = load_recipe(recipe_path)
+
+            with mock.patch.object(Image, "MAX_IMAGE_PIXELS", 1000):
+                with self.assertRaisesRegex(ImgshError, "too large to process"):
+                    run_recipe(recipe, input_path, out_dir=tmp_path / "bomb")
+            result = CliRunner().invoke(
+                app,
+                ["pipeline", str(recipe_path), str(tmp_path), "--out", str(tmp_path / "out")]
+                + ["--max-megapixels", "0.001"],
+            )
+
+            self.assertEqual(result.exit_code, 1, result.output)
+            self.assertIn("MP budget", result.output)
+            self.assertIn("Processed: 0, Failed: 1", result.output)
+            self.assertFalse((tmp_path / "bomb").exists())
+            self.assertFalse((tmp_path / "out").exists())
+
+    def test_cli_fails_second_input_mapping_to_a_claimed_output(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmp_path = Path(tmpdir)
+            Image.new("RGB", (60, 40), color=(200, 10, 10)).save(tmp_path / "a.jpg")
+            Image.new("RGB", (60, 40), color=(10, 10, 200)).save(tmp_path / "a.png")
+            recipe_path = tmp_path / "recipe.json"
+            recipe_path.write_text(
+                json.dumps({"steps": [{"op": "resize", "width": 30}, {"op": "convert", "format": "webp"}]}),
+                encoding="utf-8",
+            )
+
+            result = CliRunner().invoke(
+                app, ["pipeline", str(recipe_path), str(tmp_path), "--jobs", "2"]
+            )
+
+            self.assertEqual(result.exit_code, 1, result.output)
+            self.assertIn("Processed: 1, Failed: 1", result.output)
+            self.assertIn(f"[fail] {tmp_path / 'a.png'}: Output already exists", result.output)
+            with Image.open(tmp_path / "a_pipeline.webp") as output:
+                self.assertGreater(output.convert("RGB").getpixel((0, 0))[0], 100)
+
+
+if __name__ == "__main__":
+    unittest.main()
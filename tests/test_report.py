@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import json
+import sys
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+from imgsh.core.processor import ProcessResult
+from imgsh.core.report import BatchReport
+
+
+class BatchReportTests(unittest.TestCase):
+    def test_concurrent_records_keep_lines_and_counts_intact(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmp_path = Path(tmpdir)
+            output_path = tmp_path / "out.png"
+            output_path.write_bytes(b"x" * 10)
+            report = BatchReport(tmp_path / "run.jsonl")
+            interval = sys.getswitchinterval()
+            sys.setswitchinterval(1e-6)
+            try:
+
+                def record(status: str) -> None:
+                    for number in range(200):
+                        report.record(
+                            tmp_path / f"{status}{number}.png",
+                            status,
+                            results=[ProcessResult(output_path=output_path)],
+                            elapsed=0.001,
+                        )
+
+                threads = [threading.Thread(target=record, args=(status,)) for status in ("ok", "skipped")]
+                for thread in threads:
+                    thread.start()
+                for thread in threads:
+                    thread.join()
+            finally:
+                sys.setswitchinterval(interval)
+            report.close()
+
+            records = [json.loads(line) for line in (tmp_path / "run.jsonl").read_text().splitlines()]
+            self.assertEqual(len(records), 401)
+            summary = records[-1]
+            self.assertEqual((summary["processed"], summary["skipped"]), (200, 200))
+            self.assertEqual(summary["output_bytes"], 4000)
+
+
+if __name__ == "__main__":
+    unittest.main()
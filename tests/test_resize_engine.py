@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import unittest
+from unittest import mock
+
+from PIL import Image, ImageChops, ImageOps
+
+from imgsh.core.resize_engine import (
+    resample_in_strips,
+    resample_to,
+    resize_image,
+    resolve_resample,
+)
+
+
+class ResizeEngineTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.image = Image.linear_gradient("L").resize((640, 360)).convert("RGB")
+
+    def test_cover_matches_imageops_fit(self) -> None:
+        resized = resize_image(self.image, width=200, height=200, keep_aspect=True, fit="cover")
+        expected = ImageOps.fit(self.image, (200, 200), method=Image.Resampling.LANCZOS)
+
+        self.assertEqual(resized.size, (200, 200))
+        self.assertIsNone(ImageChops.difference(resized, expected).getbbox())
+
+    def test_contain_with_reducing_gap_keeps_target_size(self) -> None:
+        resized = resize_image(
+            self.image,
+            width=100,
+            height=None,
+            keep_aspect=True,
+            fit="contain",
+            resample="auto",
+            reducing_gap=2.0,
+        )
+
+        self.assertEqual(resized.size, (100, 56))
+
+    def test_auto_resample_picks_filter_by_scale(self) -> None:
+        self.assertEqual(resolve_resample("auto", scale=2.0), (Image.Resampling.BICUBIC, None))
+        self.assertEqual(resolve_resample("auto", scale=0.8), (Image.Resampling.LANCZOS, None))
+        self.assertEqual(resolve_resample("auto", scale=0.2), (Image.Resampling.LANCZOS, 3.0))
+        self.assertEqual(resolve_resample("auto", scale=0.05), (Image.Resampling.BILINEAR, 2.0))
+        self.assertEqual(resolve_resample("box", scale=0.05), (Image.Resampling.BOX, None))
+
+    def test_fused_crop_matches_crop_then_resize(self) -> None:
+        box = (40, 30, 520, 330)
+        cropped = self.image.crop(box)
+        for fit, width, height in (("contain", 200, None), ("cover", 150, 150), ("exact", 90, 70)):
+            with self.subTest(fit=fit):
+                fused = resize_image(
+                    self.image, width=width, height=height, keep_aspect=True, fit=fit, box=box
+                )
+                expected = resize_image(
+                    cropped, width=width, height=height, keep_aspect=True, fit=fit
+                )
+                self.assertEqual(fused.size, expected.size)
+                # Only the border differs: the fused pass filters across the crop edge.
+                inner = (2, 2, fused.width - 2, fused.height - 2)
+                difference = ImageChops.difference(fused.crop(inner), expected.crop(inner))
+                self.assertLessEqual(max(high for _, high in difference.getextrema()), 1)
+
+    def test_strip_resample_matches_single_pass(self) -> None:
+        cases = [
+            ((300, 169), None, "lanczos", None),
+            ((120, 90), (10.5, 4.0, 600.0, 350.0), "auto", None),
+            ((71, 40), None, "bicubic", 2.0),
+        ]
+        # Force many strips: 640 px wide source -> 5 source rows per strip.
+        with mock.patch("imgsh.core.resize_engine.STRIP_SOURCE_PIXELS", 3200):
+            for size, box, resample, gap in cases:
+                with self.subTest(size=size, resample=resample, gap=gap):
+                    expected = resample_to(self.image, size, box, resample, gap)
+                    stripped = resample_in_strips(self.image, size, box, resample, gap)
+                    extrema = ImageChops.difference(stripped, expected).getextrema()
+                    # Strip boxes are fractional, so a boundary row may round differently.
+                    self.assertLessEqual(max(high for _, high in extrema), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import http.client
+import io
+import json
+import threading
+import unittest
+from unittest import mock
+
+from PIL import Image
+
+from imgsh.core.errors import ImgshError
+from imgsh.core.processor import ImageProcessor
+from imgsh.core.serve_engine import (
+    LruCache,
+    RenderParams,
+    ResizeService,
+    ServiceServer,
+    parse_render_params,
+    render_upload,
+)
+
+
+def _jpeg(size: tuple[int, int]) -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGB", size, color=(10, 200, 30)).save(buffer, format="JPEG")
+    return buffer.getvalue()
+
+
+class ServeEngineTests(unittest.TestCase):
+    def test_parse_render_params(self) -> None:
+        params, source = parse_render_params(
+            "width=200&crop=10,20,300,200&format=webp&strip_exif=1&keep_aspect=false"
+        )
+        self.assertEqual(
+            params,
+            RenderParams(
+                width=200,
+                crop_box=(10, 20, 300, 200),
+                output_format="webp",
+                preserve_exif=False,
+                keep_aspect=False,
+            ),
+        )
+        self.assertIsNone(source)
+        for query in ["width=abc", "crop=1,2,3", "format=gif", "fit=cover&width=5", "size=3"]:
+            with self.assertRaises(ImgshError, msg=query):
+                parse_render_params(query)
+
+    def test_lru_cache_evicts_least_recently_used_by_size(self) -> None:
+        cache = LruCache(max_bytes=10)
+        cache.put("a", "A", 4)
+        cache.put("b", "B", 4)
+        self.assertEqual(cache.get("a"), "A")
+        cache.put("c", "C", 4)
+        cache.put("huge", "H", 11)
+
+        self.assertIsNone(cache.get("b"))
+        self.assertIsNone(cache.get("huge"))
+        self.assertEqual((cache.get("a"), cache.get("c")), ("A", "C"))
+        self.assertEqual(cache.size, 8)
+
+    def test_server_renders_caches_and_applies_backpressure(self) -> None:
+        service = ResizeService(
+            jobs=1, max_pending=1, source_cache_bytes=1 << 20, output_cache_bytes=1 << 20
+        )
+        server = ServiceServer(("127.0.0.1", 0), service, max_upload_bytes=1 << 16)
+        thread = threading.Thread(target=server.serve_forever)
+        thread.start()
+        connection = http.client.HTTPConnection(*server.server_address[:2], timeout=30)
+
+        def post(query: str, body: bytes) -> tuple[http.client.HTTPResponse, bytes]:
+            connection.request("POST", f"/render?{query}", body=body)
+            response = connection.getresponse()
+            return response, response.read()
+
+        try:
+            data = _jpeg((400, 300))
+            response, body = post("width=100&format=png", data)
+            self.assertEqual(response.status, 200, body)
+            self.assertEqual(response.getheader("Content-Type"), "image/png")
+            self.assertEqual(response.getheader("X-Imgsh-Cache"), "miss")
+            with Image.open(io.BytesIO(body)) as rendered:
+                self.assertEqual((rendered.format, rendered.size), ("PNG", (100, 75)))
+
+            response, cached_body = post("width=100&format=png", data)
+            self.assertEqual(response.getheader("X-Imgsh-Cache"), "hit")
+            self.assertEqual(cached_body, body)
+
+            source = response.getheader("X-Imgsh-Source")
+            response, body = post(f"source={source}&crop=0,0,200,300&width=50", b"")
+            self.assertEqual(response.status, 200, body)
+            self.assertEqual(response.getheader("X-Imgsh-Size"), "50x75")
+
+            response, body = post("width=50", b"not an image")
+            self.assertEqual(response.status, 400)
+            self.assertIn(b"Could not decode", body)
+
+            connection.close()
+            with service.admit():
+                response, body = post("width=50", data)
+            self.assertEqual(response.status, 503)
+            self.assertEqual(response.getheader("Retry-After"), "1")
+
+            connection.close()
+            response, _ = post("width=50", b"x" * ((1 << 16) + 1))
+            self.assertEqual(response.status, 413)
+
+            connection.close()
+            connection.request("GET", "/health")
+            stats = json.loads(connection.getresponse().read())
+            self.assertEqual(stats["rejected"], 1)
+            self.assertEqual(stats["output_cache"]["hits"], 1)
+        finally:
+            connection.close()
+            server.shutdown()
+            server.server_close()
+            thread.join()
+            service.close()
+
+    def test_render_upload_reports_decoder_errors_as_bad_uploads(self) -> None:
+        for error in (ValueError("tile cannot extend outside image"), SyntaxError("broken PNG file")):
+            with self.subTest(error=error), mock.patch.object(
+                ImageProcessor, "resize_bytes", side_effect=error
+            ):
+                with self.assertRaisesRegex(ImgshError, "Could not decode the uploaded image"):
+                    render_upload(b"garbage", RenderParams(width=10), None, None)
+
+    def test_server_answers_500_when_a_render_fails_unexpectedly(self) -> None:
+        # The pool forks while the patch is active, so its worker fails too.
+        with mock.patch.object(ImageProcessor, "resize_bytes", side_effect=RuntimeError("boom")):
+            service = ResizeService(jobs=1)
+        server = ServiceServer(("127.0.0.1", 0), service, max_upload_bytes=1 << 16)
+        thread = threading.Thread(target=server.serve_forever)
+        thread.start()
+        connection = http.client.HTTPConnection(*server.server_address[:2], timeout=30)
+        try:
+            connection.request("POST", "/render?width=50", body=_jpeg((40, 30)))
+            response = connection.getresponse()
+
+            self.assertEqual(response.status, 500)
+            self.assertIn(b"boom", response.read())
+        finally:
+            connection.close()
+            server.shutdown()
+            server.server_close()
+            thread.join()
+            service.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import io
+import struct
+import tempfile
+import threading
+import time
+import unittest
+import zlib
+from pathlib import Path
+
+from PIL import Image
+
+from imgsh.core.batch_engine import BatchOutcome
+from imgsh.core.manifest import BatchManifest
+from imgsh.core.watch_engine import SettleTracker, _load_inotify, watch_folder
+
+RESIZE_OPTIONS = {
+    "width": 10,
+    "height": None,
+    "keep_aspect": True,
+    "fit": "contain",
+    "output_format": None,
+    "quality": None,
+    "preserve_exif": True,
+    "overwrite": False,
+}
+
+
+def _broken_png() -> bytes:
+    """A PNG whose second IDAT chunk has a garbage type: Pillow raises SyntaxError on load."""
+
+    def chunk(kind: bytes, payload: bytes) -> bytes:
+        checksum = zlib.crc32(kind + payload)
+        return struct.pack(">I", len(payload)) + kind + payload + struct.pack(">I", checksum)
+
+    buffer = io.BytesIO()
+    Image.linear_gradient("L").convert("RGB").save(buffer, format="PNG")
+    data = buffer.getvalue()
+    header_end = 8 + 25  # signature, then the IHDR chunk
+    (length,) = struct.unpack(">I", data[header_end : header_end + 4])
+    pixels = data[header_end + 8 : header_end + 8 + length]
+    half = len(pixels) // 2
+    return (
+        data[:header_end]
+        + chunk(b"IDAT", pixels[:half])
+        + chunk(b"###(", pixels[half:])
+        + chunk(b"IEND", b"")
+    )
+
+
+def _wait_for(condition, timeout: float = 10.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("timed out waiting for the watcher")
+        time.sleep(0.02)
+
+
+class WatchEngineTests(unittest.TestCase):
+    def test_settle_tracker_waits_for_unchanged_file(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "upload.jpg"
+            path.write_bytes(b"part")
+            tracker = SettleTracker(settle=2.0)
+            tracker.touch(path, now=100.0)
+
+            self.assertEqual(tracker.ready(now=101.0), [])
+            path.write_bytes(b"partial upload")
+            self.assertEqual(tracker.ready(now=102.5), [])
+            self.assertEqual(tracker.next_deadline(), 104.5)
+            self.assertEqual(tracker.ready(now=104.5), [path])
+            self.assertIsNone(tracker.next_deadline())
+
+            tracker.touch(path, now=110.0)
+            path.unlink()
+            self.assertEqual(tracker.ready(now=120.0), [])
+            self.assertIsNone(tracker.next_deadline())
+
+    def _run(self, input_dir: Path, out_dir: Path, polling: bool, jobs: int, action) -> tuple:
+        outcomes: list[BatchOutcome] = []
+        skipped: list[Path] = []
+        manifest = BatchManifest(out_dir / ".manifest.jsonl")
+        stop = threading.Event()
+
+        def output_paths(input_path: Path) -> tuple[Path, list[Path]]:
+            output_path = out_dir / input_path.relative_to(input_dir).parent / input_path.name
+            return output_path, [output_path]
+
+        thread = threading.Thread(
+            target=watch_folder,
+            kwargs={
+                "input_dir": input_dir,
+                "output_paths": output_paths,
+                "on_outcome": outcomes.append,
+                "options": RESIZE_OPTIONS,
+                "stop": stop,
+                "recursive": True,
+                "jobs": jobs,
+                "settle": 0.1,
+                "poll_interval": 0.05,
+                "polling": polling,
+                "manifest": manifest,
+                "exclude": [out_dir],
+                "on_skip": skipped.append,
+            },
+        )
+        thread.start()
+        try:
+            action(outcomes, skipped)
+        finally:
+            stop.set()
+            thread.join(timeout=10)
+            manifest.close()
+        self.assertFalse(thread.is_alive())
+        return outcomes, skipped
+
+    def test_processes_existing_and_new_files_and_skips_them_after_restart(self) -> None:
+        modes = [(True, 1), (True, 2)]
+        if _load_inotify() is not None:
+            modes += [(False, 1), (False, 2)]
+        for polling, jobs in modes:
+            with self.subTest(polling=polling, jobs=jobs), tempfile.TemporaryDirectory() as tmpdir:
+                input_dir = Path(tmpdir) / "in"
+                (input_dir / "nested").mkdir(parents=True)
+                # Outputs inside the watched tree must not be picked up as new inputs.
+                out_dir = input_dir / "out"
+                Image.new("RGB", (40, 20)).save(input_dir / "existing.png")
+
+                def drop_files(outcomes, skipped) -> None:
+                    _wait_for(lambda: len(outcomes) == 1)
+                    Image.new("RGB", (40, 20)).save(input_dir / "nested" / "new.png")
+                    (input_dir / "notes.txt").write_text("ignored", encoding="utf-8")
+                    _wait_for(lambda: len(outcomes) == 2)
+                    time.sleep(0.3)
+
+                outcomes, skipped = self._run(input_dir, out_dir, polling, jobs, drop_files)
+                self.assertEqual([outcome.error for outcome in outcomes], [None, None])
+                self.assertEqual(
+                    sorted(outcome.item.input_path.name for outcome in outcomes),
+                    ["existing.png", "new.png"],
+                )
+                with Image.open(out_dir / "nested" / "new.png") as resized:
+                    self.assertEqual(resized.size, (10, 5))
+
+                def wait_for_skips(outcomes, skipped) -> None:
+                    _wait_for(lambda: len(skipped) == 2)
+
+                outcomes, skipped = self._run(input_dir, out_dir, polling, jobs, wait_for_skips)
+                self.assertEqual(outcomes, [])
+
+    def test_corrupt_upload_fails_and_watching_continues(self) -> None:
+        for jobs in (1, 2):
+            with self.subTest(jobs=jobs), tempfile.TemporaryDirectory() as tmpdir:
+                input_dir = Path(tmpdir) / "in"
+                input_dir.mkdir()
+                out_dir = Path(tmpdir) / "out"
+
+                def drop_files(outcomes, skipped) -> None:
+                    (input_dir / "bad.jpg").write_bytes(b"not really a jpeg")
+                    _wait_for(lambda: len(outcomes) == 1)
+                    (input_dir / "broken.png").write_bytes(_broken_png())
+                    _wait_for(lambda: len(outcomes) == 2)
+                    Image.new("RGB", (40, 20)).save(input_dir / "good.png")
+                    _wait_for(lambda: len(outcomes) == 3)
+
+                outcomes, _ = self._run(input_dir, out_dir, True, jobs, drop_files)
+                self.assertEqual(outcomes[0].item.input_path.name, "bad.jpg")
+                self.assertIn("cannot identify image file", outcomes[0].error)
+                self.assertEqual(outcomes[1].item.input_path.name, "broken.png")
+                self.assertIn("broken PNG file", outcomes[1].error)
+                self.assertEqual(outcomes[2].item.input_path.name, "good.png")
+                self.assertIsNone(outcomes[2].error)
+                self.assertTrue((out_dir / "good.png").exists())
+
+
+if __name__ == "__main__":
+    unittest.main()